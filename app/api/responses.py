@@ -0,0 +1,14 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.utils.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    A JSON response rendered with orjson (when available) that serializes Job records directly.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,44 +1,115 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException
-from typing import Annotated
+from fastapi import APIRouter, BackgroundTasks, File, Header, Query, UploadFile, HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Annotated, List, Optional
 
-from app.graph.workflow import GraphBuilder
-from app.state.job_state import JobState
-from app.models.schemas import JobSearchRequest
+from app.api.responses import FastJSONResponse
+from app.core.config import settings
+from app.core.profiling import is_profiled
+from app.graph.registry import get_graph_registry
+from app.graph.streaming import (
+    aformat_ndjson,
+    aformat_sse,
+    astream_graph_events,
+    format_ndjson,
+    format_sse,
+    stream_graph_events,
+)
+from app.state.job_state import JobState, public_state
+from app.models.schemas import JobSearchRequest, RunSubmittedResponse
+from app.services.batch import BatchInputError, expand_uploads, process_resume_batch
+from app.services.run_manager import FAILED, SUCCEEDED, QueueFullError, get_run_manager
+from app.tools.job_fetcher import prefetch_next_page
 
 router = APIRouter()
 
 
+def _validate_pdf(file: UploadFile):
+    if file.content_type != "application/pdf":
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid file type. Please upload a PDF document."
+        )
+
+
+async def _read_pdf(file: UploadFile) -> bytes:
+    """
+    Validates and reads an uploaded PDF, rejecting it with 413 if it exceeds MAX_UPLOAD_BYTES.
+    """
+    _validate_pdf(file)
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"The PDF exceeds the maximum upload size of {settings.MAX_UPLOAD_BYTES} bytes."
+    )
+    if file.size is not None and file.size > settings.MAX_UPLOAD_BYTES:
+        raise too_large
+    pdf_bytes = await file.read()
+    if len(pdf_bytes) > settings.MAX_UPLOAD_BYTES:
+        raise too_large
+    return pdf_bytes
+
+
+def _build_search_state(request: JobSearchRequest) -> JobState:
+    # Calculate the start index for pagination from the page number and size
+    start_index = (request.page - 1) * request.size
+    return JobState(
+        skills=request.skills,
+        start=start_index,
+        job_count=request.size,
+        posted_hours=request.posted_hours
+    )
+
+
+def _use_thread_path() -> bool:
+    # Profiled requests always take the thread path: the profiler cannot sample the shared event loop
+    return settings.GRAPH_EXECUTION == "thread" or is_profiled()
+
+
+async def _run_graph(workflow, initial_state: JobState) -> dict:
+    """
+    Runs a compiled graph to completion without blocking the event loop (see settings.GRAPH_EXECUTION).
+    """
+    if _use_thread_path():
+        return await run_in_threadpool(workflow.invoke, initial_state)
+    return await workflow.ainvoke(initial_state)
+
+
+def _streaming_response(workflow, initial_state: JobState, accept: Optional[str]) -> StreamingResponse:
+    """
+    Streams graph events as Server-Sent Events when requested, and as NDJSON otherwise.
+    """
+    sse = bool(accept and "text/event-stream" in accept)
+    if _use_thread_path():
+        # Starlette iterates synchronous generators in its threadpool
+        events = stream_graph_events(workflow, initial_state)
+        body = format_sse(events) if sse else format_ndjson(events)
+    else:
+        events = astream_graph_events(workflow, initial_state)
+        body = aformat_sse(events) if sse else aformat_ndjson(events)
+    return StreamingResponse(body, media_type="text/event-stream" if sse else "application/x-ndjson")
+
+
 @router.post("/upload-resume/")
 async def upload_resume_and_find_jobs(file: Annotated[UploadFile, File(description="The PDF resume file to process.")]):
     """
     Accepts a PDF resume, runs it through the job-finding workflow,
     and returns the final state with matched jobs.
     """
-    if file.content_type != "application/pdf":
-        raise HTTPException(
-            status_code=400,
-            detail="Invalid file type. Please upload a PDF document."
-        )
+    pdf_bytes = await _read_pdf(file)
 
     try:
-        pdf_bytes = await file.read()
-
-        # 1. Initialize the graph builder and compile the workflow
-        graph_builder = GraphBuilder()
-        workflow = graph_builder.build_job_finder_graph()
+        # 1. Get the workflow compiled once at startup
+        workflow = get_graph_registry().job_finder_graph
 
         # 2. Set up the initial state for the graph
         # The graph starts with bytes and will fill in the other fields.
         initial_state = JobState(file_bytes=pdf_bytes)
 
-        # 3. Invoke the workflow and get the final result
-        final_state = workflow.invoke(initial_state)
-
-        # 4. Create a serializable response, excluding the raw file bytes
-        # The final state is a dict, so we just remove the key
-        final_state.pop('file_bytes', None)
+        # 3. Run the workflow without blocking the event loop and get the final result
+        final_state = await _run_graph(workflow, initial_state)
 
-        return final_state
+        # 4. Create a serializable response, excluding the raw file bytes and other internal fields
+        return FastJSONResponse(public_state(final_state))
 
     except ValueError as e:
         # Catches errors from PDF processing or other validation
@@ -50,32 +121,151 @@ async def upload_resume_and_find_jobs(file: Annotated[UploadFile, File(descripti
 
 
 @router.post("/search/")
-async def direct_job_search(request: JobSearchRequest):
+async def direct_job_search(request: JobSearchRequest, background_tasks: BackgroundTasks):
     """
     Accepts a list of skills and other parameters to directly search for jobs.
+    Once the response is sent, the next page is prefetched in the background.
     """
     try:
-        # Calculate the start index for pagination from the page number and size
-        start_index = (request.page - 1) * request.size
-
-        # 1. Initialize the graph builder and compile the direct search workflow
-        graph_builder = GraphBuilder()
-        workflow = graph_builder.build_direct_search_graph()
+        # 1. Get the direct search workflow compiled once at startup
+        workflow = get_graph_registry().direct_search_graph
 
         # 2. Set up the initial state for the graph from the request
-        initial_state = JobState(
-            skills=request.skills,
-            start=start_index,
-            job_count=request.size,
-            posted_hours=request.posted_hours
-        )
+        initial_state = _build_search_state(request)
 
-        # 3. Invoke the workflow and get the final result
-        final_state = workflow.invoke(initial_state)
+        # 3. Run the workflow without blocking the event loop and get the final result
+        final_state = await _run_graph(workflow, initial_state)
 
-        return final_state
+        # 4. Warm the next page once this response has been sent
+        background_tasks.add_task(
+            prefetch_next_page, request.skills, request.size, initial_state.start, request.posted_hours
+        )
+
+        return FastJSONResponse(public_state(final_state))
 
     except Exception as e:
         # General error handler for unexpected issues
         print(f"An unexpected error occurred: {e}") # For debugging
         raise HTTPException(status_code=500, detail="An unexpected error occurred on the server.")
+
+
+@router.post("/upload-resume/stream")
+async def upload_resume_and_stream_jobs(
+    file: Annotated[UploadFile, File(description="The PDF resume file to process.")],
+    accept: Annotated[Optional[str], Header()] = None,
+):
+    """
+    Streaming variant of /upload-resume/: sends node progress, the extracted skills,
+    each job as it arrives and the summary tokens, followed by the final state.
+    """
+    pdf_bytes = await _read_pdf(file)
+    workflow = get_graph_registry().job_finder_graph
+    return _streaming_response(workflow, JobState(file_bytes=pdf_bytes), accept)
+
+
+@router.post("/search/stream")
+async def direct_job_search_stream(request: JobSearchRequest, accept: Annotated[Optional[str], Header()] = None):
+    """
+    Streaming variant of /search/: sends node progress, each job as it arrives
+    and the summary tokens, followed by the final state.
+    """
+    workflow = get_graph_registry().direct_search_graph
+    return _streaming_response(workflow, _build_search_state(request), accept)
+
+
+async def _read_batch_upload(file: UploadFile) -> bytes:
+    """
+    Reads one file of a batch upload, rejecting it with 413 if it exceeds BATCH_MAX_ARCHIVE_BYTES.
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"'{file.filename}' exceeds the maximum batch upload size of {settings.BATCH_MAX_ARCHIVE_BYTES} bytes."
+    )
+    if file.size is not None and file.size > settings.BATCH_MAX_ARCHIVE_BYTES:
+        raise too_large
+    data = await file.read()
+    if len(data) > settings.BATCH_MAX_ARCHIVE_BYTES:
+        raise too_large
+    return data
+
+
+@router.post("/batch/resumes")
+async def process_resume_batch_stream(
+    files: Annotated[List[UploadFile], File(description="PDF resumes and/or zip archives of PDF resumes.")],
+    size: Annotated[int, Query(gt=0, description="The number of jobs fetched per distinct search.")] = 10,
+    posted_hours: Annotated[int, Query(gt=0, description="The time window in hours for job postings.")] = 12,
+):
+    """
+    Processes many resumes at once and streams NDJSON events: each resume's skills,
+    the skill-set groups, then each resume's jobs and summary as its group's search finishes.
+    Resumes with the same skill set share one search.
+    """
+    uploads = [(file.filename or f"upload-{i}", await _read_batch_upload(file)) for i, file in enumerate(files)]
+    try:
+        # Unzipping can take a while for large archives; keep it off the event loop
+        resumes = await run_in_threadpool(expand_uploads, uploads)
+    except BatchInputError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    events = process_resume_batch(resumes, job_count=size, posted_hours=posted_hours)
+    return StreamingResponse(aformat_ndjson(events), media_type="application/x-ndjson")
+
+
+def _submit_run(workflow, initial_state: JobState, kind: str) -> RunSubmittedResponse:
+    try:
+        run_id = get_run_manager().submit(workflow, initial_state, kind)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return RunSubmittedResponse(run_id=run_id, status="queued")
+
+
+@router.post("/runs/upload-resume", status_code=202, response_model=RunSubmittedResponse)
+async def submit_resume_run(file: Annotated[UploadFile, File(description="The PDF resume file to process.")]):
+    """
+    Queues a resume run and returns its run ID immediately.
+    Poll /runs/{run_id} for status and /runs/{run_id}/result for the final state.
+    """
+    pdf_bytes = await _read_pdf(file)
+    return _submit_run(get_graph_registry().job_finder_graph, JobState(file_bytes=pdf_bytes), "upload-resume")
+
+
+@router.post("/runs/search", status_code=202, response_model=RunSubmittedResponse)
+async def submit_search_run(request: JobSearchRequest):
+    """
+    Queues a direct search run and returns its run ID immediately.
+    """
+    return _submit_run(get_graph_registry().direct_search_graph, _build_search_state(request), "search")
+
+
+@router.get("/runs/stats")
+async def run_queue_stats():
+    """
+    Returns the worker pool size, queue depth and average queue wait time.
+    """
+    return get_run_manager().stats()
+
+
+@router.get("/runs/{run_id}")
+async def get_run_status(run_id: str):
+    """
+    Returns the status and timings of a submitted run, without its result.
+    """
+    record = get_run_manager().get(run_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Run not found or its result has expired.")
+    record.pop("result", None)
+    return record
+
+
+@router.get("/runs/{run_id}/result")
+async def get_run_result(run_id: str):
+    """
+    Returns the final state of a finished run, or 202 while it is still queued or running.
+    """
+    record = get_run_manager().get(run_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Run not found or its result has expired.")
+    if record["status"] == SUCCEEDED:
+        return FastJSONResponse(record["result"])
+    if record["status"] == FAILED:
+        raise HTTPException(status_code=record["error_status_code"], detail=record["error"])
+    return JSONResponse(status_code=202, content={"run_id": run_id, "status": record["status"]})
@@ -0,0 +1,93 @@
+"""
+Command-line batch processing of resumes, without a running server.
+
+Takes PDFs, zip archives of PDFs and directories (their *.pdf and *.zip files),
+runs them through the same batch pipeline as POST /batch/resumes and writes one
+NDJSON event per line to stdout or a file. Logs go to stderr.
+
+Usage:
+    python -m app.batch_cli resumes.zip more/*.pdf [--size 10] [--posted-hours 12]
+        [--skill-mode llm|local|fallback|prefilter] [--output results.ndjson]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+from app.core.logger import get_logger
+from app.core.tracing import trace_context
+from app.services.batch import BatchInputError, expand_uploads, process_resume_batch
+from app.services.http_client import close_async_client
+from app.services.pdf_processer import shutdown_pdf_pool
+from app.utils.serialization import dumps
+
+logger = get_logger(__name__)
+
+
+def collect_files(paths: List[str]) -> List[Tuple[str, bytes]]:
+    """
+    Reads the given files, expanding directories to the PDFs and zip archives directly inside them.
+    """
+    files = []
+    for raw_path in paths:
+        path = Path(raw_path)
+        if path.is_dir():
+            children = sorted(child for child in path.iterdir() if child.suffix.lower() in (".pdf", ".zip"))
+        else:
+            children = [path]
+        for child in children:
+            files.append((child.name, child.read_bytes()))
+    return files
+
+
+def _log_to_stderr():
+    # get_logger() writes to stdout, which carries the NDJSON events here
+    for logger_ in list(logging.Logger.manager.loggerDict.values()):
+        for handler in getattr(logger_, "handlers", ()):
+            if isinstance(handler, logging.StreamHandler) and handler.stream is sys.stdout:
+                handler.setStream(sys.stderr)
+
+
+async def run(args) -> int:
+    resumes = expand_uploads(collect_files(args.paths))
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    failed = 0
+    try:
+        with trace_context():
+            async for event in process_resume_batch(resumes, job_count=args.size, posted_hours=args.posted_hours,
+                                                    skill_mode=args.skill_mode):
+                output.write(dumps(event) + b"\n")
+                output.flush()
+                if event["event"] == "batch_done":
+                    failed = event["failed"]
+    finally:
+        if args.output:
+            output.close()
+        await close_async_client()
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="PDF files, zip archives or directories")
+    parser.add_argument("--size", type=int, default=10, help="jobs fetched per distinct search")
+    parser.add_argument("--posted-hours", type=int, default=12)
+    parser.add_argument("--skill-mode", choices=("llm", "local", "fallback", "prefilter"), default=None)
+    parser.add_argument("--output", default=None, help="write the NDJSON events here instead of stdout")
+    args = parser.parse_args()
+    _log_to_stderr()
+
+    try:
+        exit_code = asyncio.run(run(args))
+    except (BatchInputError, OSError) as e:
+        logger.error(f"Cannot process the batch: {e}")
+        exit_code = 2
+    finally:
+        shutdown_pdf_pool()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,168 @@
+from typing import Dict, List, Literal, Optional
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Settings(BaseSettings):
     GROQ_API_KEY: str
 
+    # Chat model: "groq", or "fake" for an offline stand-in with simulated token latency
+    LLM_PROVIDER: Literal["groq", "fake"] = "groq"
+    FAKE_LLM_FIRST_TOKEN_SECONDS: float = 0.2
+    FAKE_LLM_SECONDS_PER_TOKEN: float = 0.005
+
+    # LinkedIn host for the Voyager API; point it at benchmarks.fake_voyager to run offline
+    LINKEDIN_BASE_URL: str = "https://www.linkedin.com"
+
+    # Job detail fan-out: 1 worker keeps the original sequential behaviour
+    JOB_DETAIL_MAX_WORKERS: int = 8
+    JOB_DETAIL_TIMEOUT_SECONDS: float = 15.0
+
+    # Shared upstream HTTP client
+    HTTP_POOL_CONNECTIONS: int = 10
+    HTTP_POOL_MAXSIZE: int = 32
+    HTTP_TIMEOUT_SECONDS: float = 30.0
+    HTTP_MAX_RETRIES: int = 3
+    HTTP_BACKOFF_FACTOR: float = 0.5
+    HTTP_BACKOFF_JITTER: float = 0.5
+    # The longest a single retry waits, whether from backoff or an upstream's Retry-After;
+    # longer throttling is left to the circuit breaker
+    HTTP_BACKOFF_MAX_SECONDS: float = 5.0
+
+    # Upstream rate limits (requests/second and burst per endpoint), shared by every
+    # worker process through RATE_LIMIT_DB_PATH; endpoints not listed are unlimited
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_DB_PATH: str = ".cache/rate_limits.sqlite3"
+    RATE_LIMIT_RATES: Dict[str, float] = {"linkedin_search": 1.0, "linkedin_job_details": 5.0, "indeed": 1.0}
+    RATE_LIMIT_BURSTS: Dict[str, int] = {"linkedin_search": 3, "linkedin_job_details": 10, "indeed": 3}
+    RATE_LIMIT_MAX_WAIT_SECONDS: float = 10.0
+
+    # Circuit breaker: open after consecutive 429/5xx/connection failures and fail fast
+    CIRCUIT_BREAKER_ENABLED: bool = True
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_SECONDS: float = 30.0
+
+    # Persistent caches
+    CACHE_DB_PATH: str = ".cache/job_finder.sqlite3"
+    JOB_CACHE_ENABLED: bool = True
+    JOB_CACHE_TTL_SECONDS: float = 6 * 60 * 60
+    JOB_CACHE_MAX_ENTRIES: int = 5000
+
+    # Search results: served fresh, then stale while a background refresh runs
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_FRESH_SECONDS: float = 60.0
+    SEARCH_CACHE_STALE_SECONDS: float = 300.0
+    SEARCH_CACHE_MAX_ENTRIES: int = 1000
+
+    # Resume text (by PDF hash) and extracted skills (by normalized text hash)
+    RESUME_CACHE_ENABLED: bool = True
+    RESUME_CACHE_TTL_SECONDS: float = 7 * 24 * 60 * 60
+    RESUME_CACHE_MAX_ENTRIES: int = 2000
+
+    # Job summaries, keyed by the skills, the summarized job IDs, the prompt version and the
+    # model; a SUMMARY_CACHE_MIN_JACCARD below 1.0 also serves the summary of a cached job
+    # set that overlaps the requested one at least that much, for the same skills
+    SUMMARY_CACHE_ENABLED: bool = True
+    SUMMARY_CACHE_TTL_SECONDS: float = 30 * 60
+    SUMMARY_CACHE_MAX_ENTRIES: int = 1000
+    SUMMARY_CACHE_MIN_JACCARD: float = 1.0
+    SUMMARY_CACHE_NEAR_CANDIDATES: int = 20
+
+    # How the HTTP routes run the graphs: "async" awaits ainvoke()/astream() on the event
+    # loop; "thread" runs the synchronous graph in the threadpool, one thread per request
+    GRAPH_EXECUTION: Literal["async", "thread"] = "async"
+
+    # Batch resume processing: resumes per request, archive size, and how many PDFs,
+    # skill-extraction LLM calls and distinct searches run at once
+    BATCH_MAX_RESUMES: int = 500
+    BATCH_MAX_ARCHIVE_BYTES: int = 200 * 1024 * 1024
+    BATCH_PDF_CONCURRENCY: int = 4
+    BATCH_LLM_CONCURRENCY: int = 8
+    BATCH_SEARCH_CONCURRENCY: int = 4
+
+    # Submit/poll runs: worker pool, queue bound, and how long and how many run records
+    # are kept in CACHE_DB_PATH, where every worker process can find them
+    RUN_WORKERS: int = 4
+    RUN_QUEUE_SIZE: int = 100
+    RUN_RESULT_TTL_SECONDS: float = 15 * 60
+    RUN_STORE_MAX_ENTRIES: int = 2000
+
+    # Background prefetch of the next search page
+    PREFETCH_ENABLED: bool = True
+    PREFETCH_TTL_SECONDS: float = 120.0
+    PREFETCH_MAX_PENDING: int = 2
+    PREFETCH_DETAIL_WORKERS: int = 2
+    PREFETCH_MAX_JOBS: int = 25
+    # Prefetches only run while every rate-limited endpoint's bucket holds more than this
+    # fraction of its burst, which stays reserved for foreground requests
+    PREFETCH_RATE_LIMIT_RESERVE: float = 0.5
+
+    # PDF extraction: process pool (0 parses in-process), page-range split and upload limits
+    PDF_PROCESS_WORKERS: int = 2
+    # "forkserver" or "spawn"; "fork" would copy the app's threads' held locks into workers
+    PDF_PROCESS_START_METHOD: str = "forkserver"
+    PDF_PARALLEL_MIN_PAGES: int = 8
+    PDF_EXTRACTION_TIMEOUT_SECONDS: float = 30.0
+    MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024
+    MAX_PDF_PAGES: int = 50
+
+    # Skill extraction: "llm", "local" (taxonomy only), "fallback" (local when the LLM
+    # fails or times out) or "prefilter" (local candidates shrink the LLM prompt)
+    SKILL_EXTRACTION_MODE: Literal["llm", "local", "fallback", "prefilter"] = "llm"
+    SKILL_LLM_TIMEOUT_SECONDS: float = 20.0
+    # Threads for "fallback" mode LLM calls; a call that times out keeps its thread until it returns
+    SKILL_LLM_WORKERS: int = 4
+    SKILL_LOCAL_TOP_K: int = 5
+    SKILL_PREFILTER_MAX_CHARS: int = 2000
+
+    # BM25 ranking of fetched jobs; only the top RANK_TOP_K reach the summarization prompt
+    RANKING_ENABLED: bool = True
+    RANK_TOP_K: int = 5
+    RANK_TITLE_WEIGHT: float = 2.0
+    RANK_BM25_K1: float = 1.5
+    RANK_BM25_B: float = 0.75
+
+    # Prompt token budgets (counted with tiktoken when installed, estimated otherwise)
+    PROMPT_BUDGET_ENABLED: bool = True
+    SKILL_PROMPT_MAX_TOKENS: int = 3000
+    SUMMARY_PROMPT_MAX_TOKENS: int = 2500
+    SUMMARY_SNIPPET_MIN_TOKENS: int = 40
+
+    # Summarization: "single" puts the top RANK_TOP_K jobs in one prompt; "map_reduce" assesses
+    # every job in chunks of SUMMARY_MAP_CHUNK_SIZE in parallel graph branches (at most
+    # SUMMARY_MAP_CONCURRENCY at once), then merges the assessments into the summary
+    SUMMARY_MODE: Literal["single", "map_reduce"] = "single"
+    SUMMARY_MAP_CHUNK_SIZE: int = 5
+    SUMMARY_MAP_CONCURRENCY: int = 4
+
+    # Search fan-out: one search per group of skills, merged and deduplicated by job ID.
+    # "rank" orders by reciprocal-rank fusion, "recency" by listedAt once details arrive.
+    SEARCH_FANOUT_ENABLED: bool = False
+    SEARCH_FANOUT_GROUP_SIZE: int = 1
+    SEARCH_FANOUT_MAX_WORKERS: int = 4
+    SEARCH_FANOUT_ORDER: Literal["rank", "recency"] = "rank"
+    SEARCH_FANOUT_RRF_K: int = 60
+
+    # Job providers queried in parallel ("linkedin", "indeed", "fake"), with a per-provider
+    # timeout and concurrency limit and an overall deadline for the whole fan-out
+    JOB_PROVIDERS: List[str] = ["linkedin"]
+    PROVIDER_TIMEOUTS: Dict[str, float] = {"linkedin": 60.0, "indeed": 15.0, "fake": 5.0}
+    PROVIDER_MAX_CONCURRENCY: Dict[str, int] = {"linkedin": 4, "indeed": 4, "fake": 16}
+    PROVIDER_DEADLINE_SECONDS: float = 60.0
+    FAKE_PROVIDER_LATENCY_SECONDS: float = 0.05
+
+    # Opt-in sampling profiler. A request is profiled when it sends "X-Profile: 1" (or
+    # ?profile=1) together with X-Admin-Token matching PROFILING_ADMIN_TOKEN, or at random
+    # for PROFILING_SAMPLE_RATE of requests. Only the newest PROFILING_MAX_PROFILES are kept.
+    PROFILING_ADMIN_TOKEN: Optional[str] = None
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_SECONDS: float = 0.005
+    PROFILING_DIR: str = ".cache/profiles"
+    PROFILING_MAX_PROFILES: int = 50
+    PROFILING_TRACEMALLOC: bool = True
+
     model_config = SettingsConfigDict(
         env_file=".env",
         extra="allow"   # <-- allow extra environment variables
     )
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
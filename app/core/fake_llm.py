@@ -0,0 +1,108 @@
+"""
+An offline stand-in for the Groq chat model, for benchmarks and local development.
+
+Set LLM_PROVIDER=fake to use it. Replies have the shape the graph's nodes
+parse (a Python list of skills, or a <thinking> block followed by a summary)
+and are delayed like a remote model: a time to first token plus a fixed time
+per generated token. The async methods wait with asyncio.sleep, so concurrent
+calls overlap on one event loop the way network-bound calls to a real model do.
+"""
+import asyncio
+import re
+import time
+from typing import Any, AsyncIterator, Iterator, List, Optional
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from app.services.skill_extractor import extract_skills_locally
+from app.utils.prompt_budget import count_tokens
+
+# The skill prompts end with numbered instructions that include an example list
+_SKILL_INSTRUCTIONS_RE = re.compile(r"\n\s*1\. Identify the top 5 technical skills", re.IGNORECASE)
+_JOB_TITLE_RE = re.compile(r"^\s*-\s*Title:\s*(.+)$", re.MULTILINE)
+_TOKEN_RE = re.compile(r"\S+\s*")
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    A chat model that answers locally after a simulated generation delay.
+
+    Attributes:
+        model_name: Reported like a real model name, so caches keyed by model keep working.
+        first_token_seconds: The delay before the first token.
+        seconds_per_token: The delay for every generated token.
+        summary_words: The approximate length of a generated summary.
+    """
+    model_name: str = "fake-chat"
+    first_token_seconds: float = 0.2
+    seconds_per_token: float = 0.005
+    summary_words: int = 120
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        prompt = "\n".join(str(message.content) for message in messages)
+        instructions = _SKILL_INSTRUCTIONS_RE.search(prompt)
+        if instructions:
+            skills = extract_skills_locally(prompt[:instructions.start()]).to_skill_list()
+            return f"Here are the skills: {skills!r}"
+
+        titles = _JOB_TITLE_RE.findall(prompt)
+        best = titles[0] if titles else "the first role"
+        thinking = (
+            f"The candidate's skills overlap most with {best}. "
+            f"{len(titles)} jobs were considered and ranked by how many required skills match."
+        )
+        filler = ("The role matches the candidate's core skills and experience level. " * self.summary_words)
+        summary = " ".join(filler.split()[:self.summary_words])
+        return f"<thinking>{thinking}</thinking>\nThe best match is {best}. {summary}"
+
+    def _usage(self, messages: List[BaseMessage], reply: str) -> dict:
+        input_tokens = sum(count_tokens(str(message.content)) for message in messages)
+        output_tokens = len(_TOKEN_RE.findall(reply))
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens}
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        reply = self._reply(messages)
+        usage = self._usage(messages, reply)
+        time.sleep(self.first_token_seconds + self.seconds_per_token * usage["output_tokens"])
+        message = AIMessage(content=reply, usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        reply = self._reply(messages)
+        time.sleep(self.first_token_seconds)
+        for token in _TOKEN_RE.findall(reply):
+            time.sleep(self.seconds_per_token)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager is not None:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        reply = self._reply(messages)
+        usage = self._usage(messages, reply)
+        await asyncio.sleep(self.first_token_seconds + self.seconds_per_token * usage["output_tokens"])
+        message = AIMessage(content=reply, usage_metadata=usage)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                       run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+                       **kwargs: Any) -> AsyncIterator[ChatGenerationChunk]:
+        reply = self._reply(messages)
+        await asyncio.sleep(self.first_token_seconds)
+        for token in _TOKEN_RE.findall(reply):
+            await asyncio.sleep(self.seconds_per_token)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager is not None:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
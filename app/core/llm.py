@@ -1,9 +1,30 @@
+from functools import lru_cache
+
 from langchain_groq import ChatGroq
 from app.core.config import settings
+from app.core.fake_llm import FakeChatModel
+from app.core.tracing import get_llm_callback_handler
+
 
+@lru_cache(maxsize=1)
 def get_llm():
+    """
+    Returns the process-wide chat model client.
+
+    The client is thread-safe and keeps its own HTTP connection pool, so it is
+    created once and shared by every graph and request. With LLM_PROVIDER=fake
+    an offline stand-in with simulated token latency is returned instead. Every
+    call is timed, with its token counts and prompt size, by the metrics callback.
+    """
+    if settings.LLM_PROVIDER == "fake":
+        return FakeChatModel(
+            first_token_seconds=settings.FAKE_LLM_FIRST_TOKEN_SECONDS,
+            seconds_per_token=settings.FAKE_LLM_SECONDS_PER_TOKEN,
+            callbacks=[get_llm_callback_handler()],
+        )
     return ChatGroq(
         api_key=settings.GROQ_API_KEY,
         model="deepseek-r1-distill-llama-70b",  # you can change model
-        temperature=0.7
-    )
\ No newline at end of file
+        temperature=0.7,
+        callbacks=[get_llm_callback_handler()],
+    )
@@ -1,13 +1,27 @@
 import logging
 import sys
 
+from app.core.tracing import current_trace_id
+
+
+class TraceIdFilter(logging.Filter):
+    """
+    Adds the current request's trace ID (or "-") to every log record as `trace_id`.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.trace_id = current_trace_id() or "-"
+        return True
+
+
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
 
     if not logger.handlers:
         handler = logging.StreamHandler(sys.stdout)
-        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - [%(trace_id)s] %(message)s")
         handler.setFormatter(formatter)
+        handler.addFilter(TraceIdFilter())
         logger.addHandler(handler)
         logger.setLevel(logging.INFO)
-    return logger
\ No newline at end of file
+    return logger
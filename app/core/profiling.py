@@ -0,0 +1,297 @@
+"""
+Opt-in sampling profiler for individual HTTP requests.
+
+A request is profiled when an admin asks for it, with "X-Profile: 1" or
+"?profile=1" plus a matching X-Admin-Token header, or at random for
+settings.PROFILING_SAMPLE_RATE of requests. While the request runs, a
+background thread samples the Python stacks of the threads doing work for the
+request's trace: graph nodes and anything submitted through
+submit_with_context() or run_in_thread(). The event loop thread is shared by every
+request and is never sampled, so a profiled request runs its graph on the thread
+path (as with GRAPH_EXECUTION="thread") even when the default "async" execution
+is configured; see is_profiled(). Its timings therefore reflect threaded rather
+than async execution, and batch uploads, which always run on the event loop, show
+only their worker threads. Two files are written to settings.PROFILING_DIR, named
+by the time and trace ID:
+
+- `<id>.collapsed`: the sampled stacks in collapsed ("folded") format, ready for
+  flamegraph.pl, speedscope or inferno;
+- `<id>.report.txt`: the request details and sample counts, plus, when
+  PROFILING_TRACEMALLOC is on, the tracemalloc peak and the largest allocation sites.
+
+Only the newest settings.PROFILING_MAX_PROFILES profiles are kept. PDF pages
+extracted in the process pool run in other processes and are not sampled;
+set PDF_PROCESS_WORKERS=0 to see PyMuPDF in the profile. The tracemalloc figures
+are process-wide, so concurrent requests add to them.
+"""
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from app.core.tracing import Trace, current_trace
+
+logger = get_logger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+PROFILE_ID_HEADER = "X-Profile-ID"
+TOP_ALLOCATIONS = 25
+_TRUE_VALUES = ("1", "true", "yes", "on")
+
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+# False when tracemalloc was already running (e.g. PYTHONTRACEMALLOC), so it is left running
+_tracemalloc_owned = False
+_retention_lock = threading.Lock()
+_STDLIB_DIR = os.path.dirname(os.__file__) + os.sep
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    # Library frames relative to site-packages or the stdlib, project frames relative to the working directory
+    marker = "site-packages" + os.sep
+    if marker in filename:
+        return filename.split(marker, 1)[1]
+    if filename.startswith(_STDLIB_DIR):
+        return filename[len(_STDLIB_DIR):]
+    cwd = os.getcwd() + os.sep
+    return filename[len(cwd):] if filename.startswith(cwd) else filename
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _start_tracemalloc():
+    global _tracemalloc_users, _tracemalloc_owned
+    with _tracemalloc_lock:
+        if _tracemalloc_users == 0:
+            _tracemalloc_owned = not tracemalloc.is_tracing()
+            if _tracemalloc_owned:
+                tracemalloc.start()
+        _tracemalloc_users += 1
+        tracemalloc.reset_peak()
+
+
+def _stop_tracemalloc():
+    global _tracemalloc_users
+    with _tracemalloc_lock:
+        _tracemalloc_users -= 1
+        if _tracemalloc_users == 0 and _tracemalloc_owned:
+            tracemalloc.stop()
+
+
+class RequestProfiler:
+    """
+    Samples the stacks of a trace's active threads at a fixed interval.
+
+    Args:
+        trace: The request's trace; its active threads are the ones sampled.
+        interval_seconds: The time between samples.
+        track_memory: Whether to record tracemalloc statistics as well.
+    """
+
+    def __init__(self, trace: Trace, interval_seconds: float, track_memory: bool):
+        self.trace = trace
+        self.interval_seconds = max(0.001, interval_seconds)
+        self.track_memory = track_memory
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self.memory_lines: List[str] = []
+        self._thread_names: Dict[int, str] = {}
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self.started = 0.0
+        self.elapsed = 0.0
+
+    def _thread_name(self, ident: int) -> str:
+        name = self._thread_names.get(ident)
+        if name is None:
+            self._thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            name = self._thread_names.get(ident, f"thread-{ident}")
+        return name
+
+    def _sample(self):
+        idents = self.trace.thread_idents()
+        if not idents:
+            self.idle_samples += 1
+            return
+        frames = sys._current_frames()
+        self.samples += 1
+        for ident in idents:
+            frame = frames.get(ident)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                labels.append(self._thread_name(ident))
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval_seconds):
+            self._sample()
+
+    def start(self):
+        if self.track_memory:
+            _start_tracemalloc()
+        self.started = time.perf_counter()
+        self._sampler.start()
+
+    def stop(self):
+        self._stop.set()
+        self._sampler.join()
+        self.elapsed = time.perf_counter() - self.started
+        if not self.track_memory:
+            return
+        try:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+            ))
+            self.memory_lines = [
+                f"traced memory: current={current / 1e6:.2f} MB peak={peak / 1e6:.2f} MB (process-wide)",
+                f"top {TOP_ALLOCATIONS} allocation sites still held at the end of the request:",
+                *(f"  {stat}" for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]),
+            ]
+        finally:
+            _stop_tracemalloc()
+
+    def write(self, directory: Path, profile_id: str, details: Dict[str, object]) -> Path:
+        """
+        Writes the collapsed stacks and the report, then prunes old profiles.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        collapsed = directory / f"{profile_id}.collapsed"
+        collapsed.write_text(
+            "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common()), encoding="utf-8"
+        )
+        report = [f"{key}: {value}" for key, value in details.items()]
+        report += [
+            f"duration: {self.elapsed * 1000:.1f} ms",
+            f"interval: {self.interval_seconds * 1000:.1f} ms",
+            f"samples: {self.samples} (idle: {self.idle_samples})",
+            f"threads sampled: {len({stack.split(';', 1)[0] for stack in self.stacks})}",
+            "",
+            *self.memory_lines,
+        ]
+        (directory / f"{profile_id}.report.txt").write_text("\n".join(report) + "\n", encoding="utf-8")
+        enforce_retention(directory, settings.PROFILING_MAX_PROFILES)
+        return collapsed
+
+
+def enforce_retention(directory: Path, keep: int):
+    """
+    Deletes all but the newest `keep` profiles (each profile is a group of files sharing an ID).
+    """
+    with _retention_lock:
+        newest: Dict[str, float] = {}
+        files: Dict[str, List[Path]] = {}
+        for path in directory.iterdir():
+            profile_id = path.name.split(".", 1)[0]
+            files.setdefault(profile_id, []).append(path)
+            try:
+                newest[profile_id] = max(newest.get(profile_id, 0.0), path.stat().st_mtime)
+            except FileNotFoundError:
+                continue
+        expired = sorted(newest, key=newest.get, reverse=True)[max(0, keep):]
+        for profile_id in expired:
+            for path in files[profile_id]:
+                path.unlink(missing_ok=True)
+
+
+def is_profiled() -> bool:
+    """
+    Returns whether the current request is being profiled, and so must keep its work off the event loop.
+    """
+    trace = current_trace()
+    return trace is not None and trace.profiled
+
+
+def profile_trigger(scope) -> Optional[str]:
+    """
+    Returns "admin" or "sampled" if the request should be profiled, and None otherwise.
+    """
+    if scope["path"] == "/metrics":
+        return None
+    headers = {name.decode("latin-1").lower(): value.decode("latin-1") for name, value in scope.get("headers") or ()}
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    requested = (
+        headers.get(PROFILE_HEADER.lower(), "").lower() in _TRUE_VALUES
+        or query.get("profile", [""])[0].lower() in _TRUE_VALUES
+    )
+    if requested:
+        token = headers.get(ADMIN_TOKEN_HEADER.lower(), "")
+        admin_token = settings.PROFILING_ADMIN_TOKEN
+        if admin_token and hmac.compare_digest(token.encode(), admin_token.encode()):
+            return "admin"
+        metrics.inc("profiles_rejected_total")
+    if settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the requests selected by profile_trigger(). Must run inside TraceMiddleware.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        trigger = profile_trigger(scope) if scope["type"] == "http" else None
+        trace = current_trace()
+        if trigger is None or trace is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{trace.trace_id}"
+        status = {"code": 500}
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message["headers"] = list(message.get("headers", ())) + [
+                    (PROFILE_ID_HEADER.lower().encode(), profile_id.encode())
+                ]
+            await send(message)
+
+        trace.profiled = True
+        profiler = RequestProfiler(trace, settings.PROFILING_INTERVAL_SECONDS, settings.PROFILING_TRACEMALLOC)
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            await run_in_threadpool(profiler.stop)
+            details = {
+                "profile": profile_id,
+                "trace_id": trace.trace_id,
+                "request": f"{scope['method']} {scope['path']}",
+                "status": status["code"],
+                "trigger": trigger,
+            }
+            try:
+                path = await run_in_threadpool(profiler.write, Path(settings.PROFILING_DIR), profile_id, details)
+                metrics.inc("profiles_written_total", trigger=trigger)
+                logger.info(f"Wrote profile {path} ({profiler.samples} samples, trigger={trigger}).")
+            except OSError as e:
+                logger.error(f"Could not write profile {profile_id}: {e}")
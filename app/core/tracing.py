@@ -0,0 +1,279 @@
+"""
+Per-request trace IDs and span timings.
+
+Each HTTP request (or background run) gets a trace ID that is stored in a
+context variable, added to every log record and returned in the X-Trace-ID
+response header. Code inside the request wraps its expensive steps in
+`span()`. Each span is recorded in a Prometheus histogram and in the request's
+trace. When the request ends, the trace is logged as one summary line, so a
+slow request shows where its time went.
+
+Thread pools do not inherit context variables, so work submitted to them goes
+through `submit_with_context()` to keep the trace; coroutines hand blocking
+work to `run_in_thread()`.
+"""
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from app.core.metrics import metrics
+
+# Not get_logger(): app.core.logger imports this module for the trace ID
+logger = logging.getLogger(__name__)
+
+TRACE_HEADER = "X-Trace-ID"
+# Caps the spans kept per trace, so a long background run cannot grow without bound
+MAX_SPANS_PER_TRACE = 1000
+
+TOKEN_BUCKETS = (16, 64, 256, 512, 1000, 2000, 4000, 8000, 16000, 32000)
+BYTE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Trace:
+    """
+    The spans recorded while handling one request.
+    """
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.started = time.perf_counter()
+        self.spans: List[Tuple[str, float, dict]] = []
+        self.dropped = 0
+        # Threads currently doing work for this trace, by thread ident (read by the profiler)
+        self.active_threads: Dict[int, int] = {}
+        self._threads_lock = threading.Lock()
+        # Set by the profiling middleware; the routes then run the graph on a worker thread
+        self.profiled = False
+
+    @contextmanager
+    def thread_active(self):
+        """
+        Marks the calling thread as working for this trace for the enclosed block.
+        """
+        ident = threading.get_ident()
+        with self._threads_lock:
+            self.active_threads[ident] = self.active_threads.get(ident, 0) + 1
+        try:
+            yield
+        finally:
+            with self._threads_lock:
+                if self.active_threads.get(ident, 0) <= 1:
+                    self.active_threads.pop(ident, None)
+                else:
+                    self.active_threads[ident] -= 1
+
+    def thread_idents(self) -> List[int]:
+        with self._threads_lock:
+            return list(self.active_threads)
+
+    def add(self, name: str, seconds: float, attributes: dict):
+        # list.append is atomic, so worker threads can record spans concurrently
+        if len(self.spans) < MAX_SPANS_PER_TRACE:
+            self.spans.append((name, seconds, attributes))
+        else:
+            self.dropped += 1
+
+    def summary(self) -> str:
+        """
+        Returns a one-line breakdown: total wall time, then the summed time and call count per span name.
+        """
+        totals: Dict[str, List[float]] = {}
+        for name, seconds, _ in list(self.spans):
+            total = totals.setdefault(name, [0.0, 0])
+            total[0] += seconds
+            total[1] += 1
+        parts = [f"total={(time.perf_counter() - self.started) * 1000:.0f}ms"]
+        for name, (seconds, count) in sorted(totals.items(), key=lambda item: -item[1][0]):
+            parts.append(f"{name}={seconds * 1000:.0f}ms" + (f"/{count}" if count > 1 else ""))
+        if self.dropped:
+            parts.append(f"dropped={self.dropped}")
+        return " ".join(parts)
+
+
+_current_trace: contextvars.ContextVar[Optional[Trace]] = contextvars.ContextVar("current_trace", default=None)
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.trace_id if trace is not None else None
+
+
+@contextmanager
+def trace_context(trace_id: Optional[str] = None) -> Iterator[Trace]:
+    """
+    Starts a trace for the enclosed work, reusing `trace_id` when given (e.g. from a request header).
+    """
+    trace = Trace(trace_id or new_trace_id())
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+def record_span(name: str, seconds: float, **attributes):
+    """
+    Adds a finished span to the current trace, if there is one.
+    """
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(name, seconds, attributes)
+    if logger.isEnabledFor(logging.DEBUG):
+        details = " ".join(f"{key}={value}" for key, value in attributes.items())
+        logger.debug(f"span {name} {seconds * 1000:.1f}ms {details}".rstrip())
+
+
+@contextmanager
+def span(name: str, metric: Optional[str] = None, buckets: Optional[Iterable[float]] = None,
+         mark_thread: bool = True, **labels) -> Iterator[dict]:
+    """
+    Times the enclosed block as a span.
+
+    Args:
+        name: The span name shown in the trace summary, e.g. "node:summarize_results".
+        metric: Optional histogram that also receives the duration in seconds.
+        buckets: Optional histogram buckets for `metric`.
+        mark_thread: Whether the calling thread counts as working for the trace while
+            the block runs. Pass False on the event loop, which every request shares.
+        **labels: The histogram labels.
+
+    Yields:
+        A dict the block can fill with attributes (sizes, counts) that are logged with the span.
+    """
+    attributes: dict = {}
+    trace = _current_trace.get()
+    started = time.perf_counter()
+    try:
+        if trace is not None and mark_thread:
+            with trace.thread_active():
+                yield attributes
+        else:
+            yield attributes
+    finally:
+        seconds = time.perf_counter() - started
+        if metric:
+            metrics.observe(metric, seconds, buckets=buckets, **labels)
+        record_span(name, seconds, **attributes)
+
+
+def _run_in_trace(fn: Callable, *args, **kwargs):
+    trace = _current_trace.get()
+    if trace is None:
+        return fn(*args, **kwargs)
+    with trace.thread_active():
+        return fn(*args, **kwargs)
+
+
+def submit_with_context(executor, fn: Callable, *args, **kwargs):
+    """
+    Submits `fn` to an executor so that it runs with a copy of the caller's context (trace, graph config).
+    """
+    return executor.submit(contextvars.copy_context().run, _run_in_trace, fn, *args, **kwargs)
+
+
+async def run_in_thread(fn: Callable, *args, **kwargs):
+    """
+    Runs blocking `fn` in the default thread pool from a coroutine, keeping the trace
+    (asyncio.to_thread copies the context) and marking the worker thread for the profiler.
+    """
+    return await asyncio.to_thread(_run_in_trace, fn, *args, **kwargs)
+
+
+class LLMMetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Records the duration, token counts and prompt size of every chat model call.
+    """
+    # Run in the caller's context for async calls too, so spans land in the request's trace
+    run_inline = True
+
+    def __init__(self):
+        self._calls: Dict[UUID, Tuple[float, str, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _model_name(serialized: Optional[dict], kwargs: dict) -> str:
+        metadata = kwargs.get("metadata") or {}
+        params = kwargs.get("invocation_params") or {}
+        return (
+            metadata.get("ls_model_name")
+            or params.get("model_name")
+            or params.get("model")
+            or ((serialized or {}).get("id") or ["unknown"])[-1]
+        )
+
+    def _start(self, run_id: UUID, model: str, prompt_bytes: int):
+        with self._lock:
+            self._calls[run_id] = (time.perf_counter(), model, prompt_bytes)
+
+    def on_chat_model_start(self, serialized: Dict[str, Any], messages: List[List[Any]], *, run_id: UUID,
+                            **kwargs: Any):
+        prompt_bytes = sum(len(str(message.content).encode()) for batch in messages for message in batch)
+        self._start(run_id, self._model_name(serialized, kwargs), prompt_bytes)
+
+    def on_llm_start(self, serialized: Dict[str, Any], prompts: List[str], *, run_id: UUID, **kwargs: Any):
+        self._start(run_id, self._model_name(serialized, kwargs), sum(len(prompt.encode()) for prompt in prompts))
+
+    def _finish(self, run_id: UUID, outcome: str) -> Optional[Tuple[float, str, int]]:
+        with self._lock:
+            call = self._calls.pop(run_id, None)
+        if call is None:
+            return None
+        started, model, prompt_bytes = call
+        seconds = time.perf_counter() - started
+        metrics.observe("llm_call_seconds", seconds, model=model)
+        metrics.observe("llm_prompt_bytes", prompt_bytes, buckets=BYTE_BUCKETS, model=model)
+        metrics.inc("llm_calls_total", model=model, outcome=outcome)
+        return seconds, model, prompt_bytes
+
+    @staticmethod
+    def _token_usage(response: LLMResult) -> Tuple[Optional[int], Optional[int]]:
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    return usage.get("input_tokens"), usage.get("output_tokens")
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        return usage.get("prompt_tokens"), usage.get("completion_tokens")
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any):
+        call = self._finish(run_id, "ok")
+        if call is None:
+            return
+        seconds, model, prompt_bytes = call
+        input_tokens, output_tokens = self._token_usage(response)
+        attributes = {"model": model, "prompt_bytes": prompt_bytes}
+        for direction, tokens in (("input", input_tokens), ("output", output_tokens)):
+            if tokens is not None:
+                metrics.observe("llm_tokens", tokens, buckets=TOKEN_BUCKETS, model=model, direction=direction)
+                metrics.inc("llm_tokens_total", tokens, model=model, direction=direction)
+                attributes[f"{direction}_tokens"] = tokens
+        record_span("llm", seconds, **attributes)
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any):
+        call = self._finish(run_id, "error")
+        if call is not None:
+            record_span("llm", call[0], model=call[1], error=type(error).__name__)
+
+
+_llm_callback_handler = LLMMetricsCallbackHandler()
+
+
+def get_llm_callback_handler() -> LLMMetricsCallbackHandler:
+    return _llm_callback_handler
@@ -0,0 +1,48 @@
+"""
+Process-level registry of compiled graphs.
+
+Compiling a StateGraph and constructing the LLM client are both done once per
+process (at app startup) instead of on every request. Compiled graphs keep no
+per-run state, so the same instances are safe to invoke from concurrent requests.
+"""
+import threading
+from typing import Optional
+
+from app.core.logger import get_logger
+from app.graph.workflow import GraphBuilder
+
+logger = get_logger(__name__)
+
+
+class GraphRegistry:
+    def __init__(self, llm=None):
+        builder = GraphBuilder(llm)
+        self.llm = builder.llm
+        self.job_finder_graph = builder.build_job_finder_graph()
+        self.direct_search_graph = builder.build_direct_search_graph()
+
+
+_registry: Optional[GraphRegistry] = None
+_lock = threading.RLock()
+
+
+def init_graph_registry(llm=None) -> GraphRegistry:
+    """
+    Compiles every graph and stores them in the process-wide registry.
+    """
+    global _registry
+    with _lock:
+        _registry = GraphRegistry(llm)
+    logger.info("Compiled job finder graphs.")
+    return _registry
+
+
+def get_graph_registry() -> GraphRegistry:
+    """
+    Returns the process-wide registry, compiling the graphs on first use if startup did not.
+    """
+    if _registry is None:
+        with _lock:
+            if _registry is None:
+                init_graph_registry()
+    return _registry
@@ -0,0 +1,120 @@
+"""
+Turns a LangGraph run into a stream of JSON-serializable progress events.
+"""
+import time
+from typing import AsyncIterator, Iterator, Optional
+
+from app.core.logger import get_logger
+from app.state.job_state import JobState, public_state
+from app.utils.serialization import dumps
+
+logger = get_logger(__name__)
+
+# Only the summary's tokens are streamed; other LLM calls are internal steps
+TOKEN_STREAM_NODES = {"summarize_results"}
+
+
+STREAM_MODES = ["tasks", "custom", "messages", "values"]
+
+
+class _EventTranslator:
+    """
+    Turns (mode, chunk) pairs from a LangGraph stream into events, keeping the node start times and the final state.
+    """
+
+    def __init__(self):
+        self.started_at = {}
+        self.final_state = None
+
+    def translate(self, mode: str, chunk) -> Optional[dict]:
+        if mode == "tasks":
+            if "result" in chunk or "error" in chunk:
+                elapsed = time.perf_counter() - self.started_at.pop(chunk["id"], time.perf_counter())
+                event = {"event": "node_finish", "node": chunk["name"], "duration_ms": round(elapsed * 1000, 1)}
+                if chunk.get("error"):
+                    event["error"] = str(chunk["error"])
+                return event
+            self.started_at[chunk["id"]] = time.perf_counter()
+            return {"event": "node_start", "node": chunk["name"]}
+        if mode == "custom":
+            return chunk
+        if mode == "messages":
+            message, metadata = chunk
+            if metadata.get("langgraph_node") in TOKEN_STREAM_NODES and message.content:
+                return {"event": "token", "node": metadata["langgraph_node"], "content": message.content}
+        elif mode == "values":
+            self.final_state = chunk
+        return None
+
+    def result(self) -> dict:
+        final_state = self.final_state
+        if isinstance(final_state, JobState):
+            final_state = dict(final_state)
+        return {"event": "result", "state": public_state(final_state or {})}
+
+
+def _error_event(e: Exception) -> dict:
+    if isinstance(e, ValueError):
+        return {"event": "error", "status_code": 422, "detail": str(e)}
+    logger.error(f"An unexpected error occurred while streaming the workflow: {e}")
+    return {"event": "error", "status_code": 500, "detail": "An unexpected error occurred on the server."}
+
+
+def stream_graph_events(workflow, initial_state: JobState) -> Iterator[dict]:
+    """
+    Runs a compiled graph and yields events as they happen.
+
+    Event types:
+        node_start / node_finish: a graph node started or finished (with its duration).
+        skills: the skills extracted from the resume.
+        job: one job, as soon as its details arrive.
+        token: a chunk of the summary as the LLM produces it.
+        result: the final state, excluding the raw file bytes.
+        error: the run failed; no further events follow.
+    """
+    translator = _EventTranslator()
+    try:
+        for mode, chunk in workflow.stream(initial_state, stream_mode=STREAM_MODES):
+            event = translator.translate(mode, chunk)
+            if event is not None:
+                yield event
+    except Exception as e:
+        yield _error_event(e)
+        return
+    yield translator.result()
+
+
+async def astream_graph_events(workflow, initial_state: JobState) -> AsyncIterator[dict]:
+    """
+    Async counterpart of stream_graph_events(), running the graph with astream() on the event loop.
+    """
+    translator = _EventTranslator()
+    try:
+        async for mode, chunk in workflow.astream(initial_state, stream_mode=STREAM_MODES):
+            event = translator.translate(mode, chunk)
+            if event is not None:
+                yield event
+    except Exception as e:
+        yield _error_event(e)
+        return
+    yield translator.result()
+
+
+def format_ndjson(events: Iterator[dict]) -> Iterator[bytes]:
+    for event in events:
+        yield dumps(event) + b"\n"
+
+
+def format_sse(events: Iterator[dict]) -> Iterator[bytes]:
+    for event in events:
+        yield b"event: " + event["event"].encode("utf-8") + b"\ndata: " + dumps(event) + b"\n\n"
+
+
+async def aformat_ndjson(events: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    async for event in events:
+        yield dumps(event) + b"\n"
+
+
+async def aformat_sse(events: AsyncIterator[dict]) -> AsyncIterator[bytes]:
+    async for event in events:
+        yield b"event: " + event["event"].encode("utf-8") + b"\ndata: " + dumps(event) + b"\n\n"
@@ -1,51 +1,134 @@
+from functools import wraps
+
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, END
 
 from app.nodes.extract_skills import TextConvertorNode
 from app.nodes.fetch_matched_skills import FetchMatchedJobsNode
-from app.nodes.summarize_results import SummarizationNode
+from app.nodes.rank_jobs import RankJobsNode
+from app.nodes.summarize_results import MapReduceSummarizationNode, SummarizationNode
+from app.core.config import settings
 from app.core.llm import get_llm
-from app.state.job_state import JobState
+from app.core.tracing import span
+from app.state.job_state import JobChunk, JobState
+
+
+def _timed_node(name: str, node):
+    """
+    Wraps a node function so every execution is recorded as a "node:<name>" span.
+    """
+    @wraps(node)
+    def timed(state):
+        with span(f"node:{name}", "graph_node_seconds", node=name):
+            return node(state)
+    return timed
+
+
+def _atimed_node(name: str, anode):
+    """
+    Async counterpart of _timed_node(). The event loop is shared by every request,
+    so its thread is not marked as working for this trace.
+    """
+    @wraps(anode)
+    async def timed(state):
+        with span(f"node:{name}", "graph_node_seconds", mark_thread=False, node=name):
+            return await anode(state)
+    return timed
+
+
+def _add_node(workflow: StateGraph, name: str, node, anode=None, input_schema=None):
+    """
+    Adds a timed node. With `anode`, ainvoke()/astream() await it instead of running `node` in a thread.
+    `input_schema` is for nodes that receive a Send() payload instead of the graph state.
+    """
+    if anode is None:
+        workflow.add_node(name, _timed_node(name, node), input_schema=input_schema)
+    else:
+        workflow.add_node(name, RunnableLambda(_timed_node(name, node), afunc=_atimed_node(name, anode), name=name),
+                          input_schema=input_schema)
 
 
 class GraphBuilder:
-    def __init__(self):
-        pass
+    def __init__(self, llm=None, skill_mode: str = None, summary_mode: str = None):
+        self.llm = llm or get_llm()
+        # One of "llm", "local", "fallback" or "prefilter"; defaults to settings.SKILL_EXTRACTION_MODE
+        self.skill_mode = skill_mode
+        # "single" or "map_reduce"; defaults to settings.SUMMARY_MODE
+        self.summary_mode = summary_mode or settings.SUMMARY_MODE
+
+    def _add_summarize(self, workflow: StateGraph) -> str:
+        """
+        Adds the summarization nodes ending in summarize_results -> END, and returns the node that starts them.
+
+        In "map_reduce" mode: plan_summary -> assess_jobs (one branch per chunk of jobs) ->
+        summarize_results, skipping straight to END when plan_summary served a cached summary.
+        """
+        if self.summary_mode != "map_reduce":
+            summarization_node = SummarizationNode(self.llm)
+            _add_node(workflow, "summarize_results", summarization_node.summarize_results,
+                      summarization_node.asummarize_results)
+            workflow.add_edge("summarize_results", END)
+            return "summarize_results"
+
+        map_reduce_node = MapReduceSummarizationNode(self.llm)
+        _add_node(workflow, "plan_summary", map_reduce_node.plan_summary)
+        _add_node(workflow, "assess_jobs", map_reduce_node.assess_jobs, map_reduce_node.aassess_jobs,
+                  input_schema=JobChunk)
+        # Named like the single-prompt node, so its tokens are streamed the same way
+        _add_node(workflow, "summarize_results", map_reduce_node.reduce_summary, map_reduce_node.areduce_summary)
+        workflow.add_conditional_edges("plan_summary", map_reduce_node.route_chunks, ["assess_jobs", END])
+        workflow.add_edge("assess_jobs", "summarize_results")
+        workflow.add_edge("summarize_results", END)
+        return "plan_summary"
+
+    def _add_fetch_rank_summarize(self, workflow: StateGraph):
+        """
+        Adds fetch_and_process_jobs -> [rank_jobs] -> summarization -> END to a workflow.
+        """
+        fetch_matched_job_node = FetchMatchedJobsNode(self.llm)
+
+        _add_node(workflow, "fetch_and_process_jobs", fetch_matched_job_node.fetch_and_process_jobs_node,
+                  fetch_matched_job_node.afetch_and_process_jobs_node)
+        summarize_entry = self._add_summarize(workflow)
+        if settings.RANKING_ENABLED:
+            rank_jobs_node = RankJobsNode()
+            _add_node(workflow, "rank_jobs", rank_jobs_node.rank_jobs, rank_jobs_node.arank_jobs)
+            workflow.add_edge("fetch_and_process_jobs", "rank_jobs")
+            workflow.add_edge("rank_jobs", summarize_entry)
+        else:
+            workflow.add_edge("fetch_and_process_jobs", summarize_entry)
+
+    def _compile(self, workflow: StateGraph):
+        graph = workflow.compile()
+        if self.summary_mode == "map_reduce":
+            # LangGraph runs at most max_concurrency of a step's tasks at once, which caps the assess_jobs branches
+            graph = graph.with_config(max_concurrency=max(1, settings.SUMMARY_MAP_CONCURRENCY))
+        return graph
 
     def build_job_finder_graph(self):
-        llm = get_llm()
+        llm = self.llm
 
-        text_convertor_node = TextConvertorNode(llm)
-        fetch_matched_job_node = FetchMatchedJobsNode(llm)
-        summarization_node = SummarizationNode(llm)
+        text_convertor_node = TextConvertorNode(llm, skill_mode=self.skill_mode)
 
         workflow = StateGraph(JobState)  
-        workflow.add_node("byte_to_text", text_convertor_node.extract_text_from_pdf)
-        workflow.add_node("text_to_skill", text_convertor_node.extract_skills)
-        workflow.add_node("fetch_and_process_jobs", fetch_matched_job_node.fetch_and_process_jobs_node)
-        workflow.add_node("summarize_results", summarization_node.summarize_results)
+        _add_node(workflow, "byte_to_text", text_convertor_node.extract_text_from_pdf,
+                  text_convertor_node.aextract_text_from_pdf)
+        _add_node(workflow, "text_to_skill", text_convertor_node.extract_skills, text_convertor_node.aextract_skills)
+        self._add_fetch_rank_summarize(workflow)
 
         workflow.set_entry_point("byte_to_text")
         workflow.add_edge("byte_to_text", "text_to_skill")
         workflow.add_edge("text_to_skill", "fetch_and_process_jobs")
-        workflow.add_edge("fetch_and_process_jobs", "summarize_results")
-        workflow.add_edge("summarize_results", END)
 
-        return workflow.compile()
+        return self._compile(workflow)
 
     def build_direct_search_graph(self):
         """
         Builds a streamlined workflow that starts directly with fetching jobs.
         """
-        llm = get_llm()
-        fetch_matched_job_node = FetchMatchedJobsNode(llm)
-        summarization_node = SummarizationNode(llm)
-
         workflow = StateGraph(JobState)
-        workflow.add_node("fetch_and_process_jobs", fetch_matched_job_node.fetch_and_process_jobs_node)
-        workflow.add_node("summarize_results", summarization_node.summarize_results)
+        self._add_fetch_rank_summarize(workflow)
 
         workflow.set_entry_point("fetch_and_process_jobs")
-        workflow.add_edge("fetch_and_process_jobs", "summarize_results")
-        workflow.add_edge("summarize_results", END)
 
-        return workflow.compile()
+        return self._compile(workflow)
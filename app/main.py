@@ -1,6 +1,88 @@
+import time
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from app.api.routes import router
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from app.core.profiling import ProfilingMiddleware
+from app.core.tracing import TRACE_HEADER, trace_context
+from app.graph.registry import init_graph_registry
+from app.services.http_client import close_async_client, publish_pool_metrics
+from app.services.pdf_processer import init_pdf_pool, shutdown_pdf_pool
+from app.services.run_manager import init_run_manager, shutdown_run_manager
+
+logger = get_logger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the LLM client, compile the graphs and start the PDF workers once, before serving requests
+    init_graph_registry()
+    init_run_manager()
+    init_pdf_pool()
+    yield
+    await close_async_client()
+    shutdown_run_manager()
+    shutdown_pdf_pool()
+
+
+class TraceMiddleware:
+    """
+    Runs every HTTP request inside a trace and times it.
+
+    The trace ID is taken from the X-Trace-ID request header when present, returned
+    in the response header, and added to every log line written for the request.
+    Streaming bodies are produced inside the same call, so they stay in the trace.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or ())
+        incoming_id = headers.get(TRACE_HEADER.lower().encode(), b"").decode("latin-1")[:64] or None
+        status = {"code": 500}
+
+        with trace_context(incoming_id) as trace:
+            async def send_with_trace_id(message):
+                if message["type"] == "http.response.start":
+                    status["code"] = message["status"]
+                    message["headers"] = list(message.get("headers", ())) + [
+                        (TRACE_HEADER.lower().encode(), trace.trace_id.encode())
+                    ]
+                await send(message)
+
+            started = time.perf_counter()
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                # The router stores the matched route in the scope; label by its template to bound cardinality
+                route = getattr(scope.get("route"), "path", "unmatched")
+                metrics.observe("http_request_seconds", time.perf_counter() - started,
+                                method=scope["method"], route=route, status=str(status["code"]))
+                if route != "/metrics":
+                    logger.info(f"{scope['method']} {scope['path']} {status['code']} {trace.summary()}")
+
+
+app = FastAPI(title="Job Chatbot", lifespan=lifespan)
+
+app.include_router(router, prefix="", tags=["chat"])
+# The last middleware added runs outermost: profiling needs the request's trace
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(TraceMiddleware)
 
-app = FastAPI(title="Job Chatbot")
 
-app.include_router(router, prefix="", tags=["chat"])
\ No newline at end of file
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Exposes this process's counters, gauges and histograms for Prometheus to scrape.
+    """
+    # Pool figures live in the session's adapters; read them at scrape time
+    publish_pool_metrics()
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
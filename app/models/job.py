@@ -0,0 +1,83 @@
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+
+# Field name -> key used in API responses, caches and the Streamlit client
+LEGACY_KEYS = {
+    "job_id": "jobId",
+    "title": "title",
+    "formatted_job_location": "formattedJobLocation",
+    "work_remote_allowed": "workRemoteAllowed",
+    "listed_at": "listedAt",
+    "apply_url": "applyUrl",
+    "company_profile": "companyprofile",
+    "company_name": "company-name",
+    "company_universal_name": "companyUniversalName",
+    "localized_name": "localizedName",
+    "job_info": "jobInfo",
+    "linkedin_url": "linkedin_url",
+    "relevance_score": "relevanceScore",
+    "source": "source",
+}
+
+# Values repeated across many jobs; interning them keeps one copy per process
+_INTERNED_FIELDS = (
+    "formatted_job_location",
+    "localized_name",
+    "company_name",
+    "company_universal_name",
+    "company_profile",
+    "source",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    """
+    A compact, immutable record of one job posting.
+
+    Serializes to the same hyphenated/camelCase keys the API has always returned
+    (see LEGACY_KEYS), so clients are unaffected by the internal representation.
+    """
+    job_id: Optional[str] = None
+    title: Optional[str] = None
+    formatted_job_location: Optional[str] = None
+    work_remote_allowed: Optional[bool] = None
+    listed_at: Optional[int] = None
+    apply_url: Optional[str] = None
+    company_profile: Optional[str] = None
+    company_name: Optional[str] = None
+    company_universal_name: Optional[str] = None
+    localized_name: Optional[str] = None
+    job_info: Optional[str] = None
+    linkedin_url: Optional[str] = None
+    # Set by the ranking stage; None until the job has been scored
+    relevance_score: Optional[float] = None
+    # The provider the job came from, e.g. "linkedin" or "indeed"
+    source: Optional[str] = None
+
+    def __post_init__(self):
+        for name in _INTERNED_FIELDS:
+            value = getattr(self, name)
+            if isinstance(value, str):
+                object.__setattr__(self, name, sys.intern(value))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Job":
+        """
+        Builds a Job from a dictionary keyed by either the legacy keys or the field names.
+        """
+        values = {}
+        for name, legacy_key in LEGACY_KEYS.items():
+            if legacy_key in data:
+                values[name] = data[legacy_key]
+            elif name in data:
+                values[name] = data[name]
+        return cls(**values)
+
+    def to_dict(self) -> dict:
+        """
+        Returns the job keyed by the legacy API keys.
+        """
+        return {legacy_key: getattr(self, name) for name, legacy_key in LEGACY_KEYS.items()}
@@ -18,4 +18,12 @@ class JobSearchRequest(BaseModel):
     experience: Optional[str] = Field(None, description="The desired years of experience (e.g., '3 years exp'). Currently not used in filtering.")
     page: int = Field(1, description="The page number for pagination.", gt=0)
     size: int = Field(10, description="The number of results per page.", gt=0)
-    posted_hours: int = Field(12, description="The time window in hours to filter job postings by.", gt=0)
\ No newline at end of file
+    posted_hours: int = Field(12, description="The time window in hours to filter job postings by.", gt=0)
+
+
+class RunSubmittedResponse(BaseModel):
+    """
+    Defines the response returned when a run is queued.
+    """
+    run_id: str = Field(..., description="The ID to poll for the run's status and result.")
+    status: str = Field(..., description="The run's status at submission time.")
@@ -1,46 +1,355 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Dict, List, Optional
+
+from app.core.config import settings
 from app.core.logger import get_logger
+from app.core.metrics import metrics
+from app.core.tracing import run_in_thread, submit_with_context
 from app.services.pdf_processer import process_pdf
+from app.services.resume_cache import (
+    cache_skills,
+    get_cached_skills,
+    get_resume_text_cache,
+    hash_bytes,
+    prompt_version,
+    skills_cache_key,
+)
+from app.services.skill_extractor import TAXONOMY_VERSION, SkillExtraction, extract_skills_locally
 from app.state.job_state import JobState
+from app.utils.prompt_budget import fit_resume
+from app.utils.stream import emit_event
+from langchain.prompts import ChatPromptTemplate
 import re
 import ast
 
 
 logger = get_logger(__name__)
 
+SKILL_EXTRACTION_SYSTEM_PROMPT = (
+    "You are an expert resume analyzer. "
+    "Your task is to extract the candidate’s strongest skills from their resume."
+)
+SKILL_EXTRACTION_USER_PROMPT = (
+    "From the following resume text:\n\n{raw_text}\n\n"
+    "1. Identify the top 5 technical skills.\n"
+    "2. Sort these skills by the candidate’s experience level (the most experienced skill first).\n"
+    "   If explicit experience is not mentioned, infer based on emphasis and context.\n"
+    "3. Extract the candidate’s **total overall professional experience**.\n"
+    "4. Return the result as a single Python list of strings, e.g.:\n"
+    "   ['Java', 'Spring Boot', 'Python', 'SQL', 'Microservices', '3 years exp']"
+)
+SKILL_EXTRACTION_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SKILL_EXTRACTION_SYSTEM_PROMPT),
+    ("user", SKILL_EXTRACTION_USER_PROMPT),
+])
+# Changes whenever the prompt text changes, invalidating cached skills
+SKILL_PROMPT_VERSION = prompt_version(SKILL_EXTRACTION_SYSTEM_PROMPT, SKILL_EXTRACTION_USER_PROMPT)
+
+# Used in "prefilter" mode: the local extractor's candidates and the lines that
+# mention them replace the full resume text
+SKILL_PREFILTER_USER_PROMPT = (
+    "Skills found in the candidate's resume, most prominent first: {candidates}\n"
+    "Estimated total experience: {experience}\n\n"
+    "Resume lines that mention these skills:\n\n{evidence}\n\n"
+    "1. Identify the top 5 technical skills.\n"
+    "2. Sort these skills by the candidate’s experience level (the most experienced skill first).\n"
+    "   If explicit experience is not mentioned, infer based on emphasis and context.\n"
+    "3. Extract the candidate’s **total overall professional experience**.\n"
+    "4. Return the result as a single Python list of strings, e.g.:\n"
+    "   ['Java', 'Spring Boot', 'Python', 'SQL', 'Microservices', '3 years exp']"
+)
+SKILL_PREFILTER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", SKILL_EXTRACTION_SYSTEM_PROMPT),
+    ("user", SKILL_PREFILTER_USER_PROMPT),
+])
+SKILL_PREFILTER_PROMPT_VERSION = prompt_version(
+    SKILL_EXTRACTION_SYSTEM_PROMPT, SKILL_PREFILTER_USER_PROMPT, TAXONOMY_VERSION
+)
+
+SKILL_EXTRACTION_MODES = ("llm", "local", "fallback", "prefilter")
+LOCAL_MODEL_NAME = "local-taxonomy"
+# How many local candidates the LLM chooses its top 5 from in "prefilter" mode
+PREFILTER_CANDIDATES = 15
+
+_llm_executor: Optional[ThreadPoolExecutor] = None
+_llm_executor_lock = threading.Lock()
+
+
+def _get_llm_executor() -> ThreadPoolExecutor:
+    """
+    Returns the pool that runs LLM calls which must finish within a timeout.
+
+    A timed-out call is abandoned, not cancelled: it keeps running in the background
+    and holds one of the settings.SKILL_LLM_WORKERS threads until the LLM responds.
+    While every thread is held, new calls queue and time out into the local fallback.
+    """
+    global _llm_executor
+    if _llm_executor is None:
+        with _llm_executor_lock:
+            if _llm_executor is None:
+                _llm_executor = ThreadPoolExecutor(max_workers=settings.SKILL_LLM_WORKERS,
+                                                   thread_name_prefix="skill-llm")
+    return _llm_executor
+
 
 class TextConvertorNode:
-    def __init__(self, llm):
+    def __init__(self, llm, skill_mode: str = None):
         self.llm = llm
+        self.skill_mode = skill_mode or settings.SKILL_EXTRACTION_MODE
+        if self.skill_mode not in SKILL_EXTRACTION_MODES:
+            raise ValueError(f"Unknown skill extraction mode: {self.skill_mode}")
+
+    @property
+    def model_name(self) -> str:
+        return getattr(self.llm, "model_name", None) or type(self.llm).__name__
 
     def extract_text_from_pdf(self, state: JobState) -> JobState:
         logger.info("--- Step: Extracting text from PDF ---")
-        text = process_pdf(state.file_bytes)
+        text = self.pdf_to_text(state.file_bytes)
         state.raw_text = text
         logger.info(f"Successfully extracted {len(text)} characters from PDF.")
         return state
 
+    @staticmethod
+    def pdf_to_text(file_bytes: bytes) -> str:
+        """
+        Returns a PDF's text, from the resume text cache when the same bytes were parsed before.
+
+        Raises:
+            ValueError: if the PDF is too large or cannot be parsed.
+        """
+        cache = get_resume_text_cache()
+        pdf_hash = hash_bytes(file_bytes) if cache else None
+        text = cache.get(pdf_hash) if cache else None
+        if text is not None:
+            logger.info("Resume text served from cache; skipping PDF parsing.")
+        else:
+            text = process_pdf(file_bytes)
+            if cache:
+                cache.set(pdf_hash, text)
+        return text
+
+    async def aextract_text_from_pdf(self, state: JobState) -> JobState:
+        """
+        Async variant of extract_text_from_pdf(); the cache and PyMuPDF run in a worker thread.
+        """
+        return await run_in_thread(self.extract_text_from_pdf, state)
+
+    def _cache_identity(self):
+        """
+        Returns the (prompt version, model name) pair that cached skills are keyed by in this mode.
+        """
+        if self.skill_mode == "local":
+            return TAXONOMY_VERSION, LOCAL_MODEL_NAME
+        if self.skill_mode == "prefilter":
+            return SKILL_PREFILTER_PROMPT_VERSION, self.model_name
+        return SKILL_PROMPT_VERSION, self.model_name
+
     def extract_skills(self, state: JobState) -> JobState:
-        logger.info("--- Step: Extracting skills from raw text ---")
+        logger.info(f"--- Step: Extracting skills from raw text ({self.skill_mode} mode) ---")
+        raw_text = state.raw_text
+
+        version, model_name = self._cache_identity()
+        if self._serve_cached(state, version, model_name):
+            return state
+
+        path = "llm"
+        if self.skill_mode == "local":
+            path = "local"
+            state.skills = self._extract_local(raw_text).to_skill_list()
+        elif self.skill_mode == "prefilter":
+            state.skills = self._extract_with_prefilter(raw_text)
+        elif self.skill_mode == "fallback":
+            try:
+                future = submit_with_context(_get_llm_executor(), self._extract_with_llm, self._full_prompt(raw_text))
+                state.skills = future.result(timeout=settings.SKILL_LLM_TIMEOUT_SECONDS)
+            except FuturesTimeoutError:
+                logger.warning("Skill extraction LLM call timed out; using the local extractor.")
+                path = "local_fallback"
+            except Exception as e:
+                logger.warning(f"Skill extraction LLM call failed ({e}); using the local extractor.")
+                path = "local_fallback"
+            if path == "local_fallback":
+                state.skills = self._extract_local(raw_text).to_skill_list()
+        else:
+            state.skills = self._extract_with_llm(self._full_prompt(raw_text))
+
+        self._finish(state, version, model_name, path)
+        return state
+
+    async def aextract_skills(self, state: JobState) -> JobState:
+        """
+        Async variant of extract_skills(): LLM calls are awaited on the event loop, while
+        the skill cache and the local extractor run in a worker thread.
+        """
+        logger.info(f"--- Step: Extracting skills from raw text ({self.skill_mode} mode) ---")
         raw_text = state.raw_text
 
-        from langchain.prompts import ChatPromptTemplate
-
-        prompt = ChatPromptTemplate.from_messages([
-            ("system",
-             "You are an expert resume analyzer. "
-             "Your task is to extract the candidate’s strongest skills from their resume."),
-            ("user",
-             "From the following resume text:\n\n{raw_text}\n\n"
-             "1. Identify the top 5 technical skills.\n"
-             "2. Sort these skills by the candidate’s experience level (the most experienced skill first).\n"
-             "   If explicit experience is not mentioned, infer based on emphasis and context.\n"
-             "3. Extract the candidate’s **total overall professional experience**.\n"
-             "4. Return the result as a single Python list of strings, e.g.:\n"
-             "   ['Java', 'Spring Boot', 'Python', 'SQL', 'Microservices', '3 years exp']")
-        ])
-
-        response = self.llm.invoke(prompt.format(raw_text=raw_text))
-        response_content = response.content
+        version, model_name = self._cache_identity()
+        if await run_in_thread(self._serve_cached, state, version, model_name):
+            return state
+
+        path = "llm"
+        if self.skill_mode == "local":
+            path = "local"
+            state.skills = (await run_in_thread(self._extract_local, raw_text)).to_skill_list()
+        elif self.skill_mode == "prefilter":
+            prompt = await run_in_thread(self._prefilter_prompt, raw_text)
+            state.skills = await self._aextract_with_llm(prompt or self._full_prompt(raw_text))
+        elif self.skill_mode == "fallback":
+            try:
+                state.skills = await asyncio.wait_for(self._aextract_with_llm(self._full_prompt(raw_text)),
+                                                      timeout=settings.SKILL_LLM_TIMEOUT_SECONDS)
+            except asyncio.TimeoutError:
+                logger.warning("Skill extraction LLM call timed out; using the local extractor.")
+                path = "local_fallback"
+            except Exception as e:
+                logger.warning(f"Skill extraction LLM call failed ({e}); using the local extractor.")
+                path = "local_fallback"
+            if path == "local_fallback":
+                state.skills = (await run_in_thread(self._extract_local, raw_text)).to_skill_list()
+        else:
+            state.skills = await self._aextract_with_llm(self._full_prompt(raw_text))
+
+        await run_in_thread(self._finish, state, version, model_name, path)
+        return state
+
+    async def aextract_skills_batch(self, raw_texts: List[str]) -> List[Optional[List[str]]]:
+        """
+        Extracts the skills of many resumes, sending all their LLM prompts in one abatch() call.
+
+        Cached resumes are not sent, and resumes with the same normalized text share
+        one prompt. In "fallback" mode a failed prompt falls back to the local
+        extractor for that resume only; in the other LLM modes its skills are None.
+
+        Args:
+            raw_texts: The resume texts.
+
+        Returns:
+            The skills of each resume, in input order.
+        """
+        version, model_name = self._cache_identity()
+        cached = await run_in_thread(lambda: [get_cached_skills(text, version, model_name) for text in raw_texts])
+        results: List[Optional[List[str]]] = list(cached)
+        metrics.inc("skill_extractions_total", sum(1 for skills in cached if skills is not None),
+                    mode=self.skill_mode, path="cache")
+
+        # One extraction per distinct resume text among the cache misses
+        pending: Dict[str, List[int]] = {}
+        for i, (text, skills) in enumerate(zip(raw_texts, cached)):
+            if skills is None:
+                pending.setdefault(skills_cache_key(text, version, model_name), []).append(i)
+        if not pending:
+            return results
+        texts = [raw_texts[indices[0]] for indices in pending.values()]
+
+        if self.skill_mode == "local":
+            extracted = await run_in_thread(lambda: [self._extract_local(text).to_skill_list() for text in texts])
+            paths = ["local"] * len(texts)
+        else:
+            if self.skill_mode == "prefilter":
+                prompts = await run_in_thread(
+                    lambda: [self._prefilter_prompt(text) or self._full_prompt(text) for text in texts]
+                )
+            else:
+                prompts = [self._full_prompt(text) for text in texts]
+            logger.info(f"Sending {len(prompts)} skill extraction prompts as one batch.")
+            responses = await self.llm.abatch(
+                prompts, config={"max_concurrency": settings.BATCH_LLM_CONCURRENCY}, return_exceptions=True
+            )
+            extracted, paths = [], []
+            for text, response in zip(texts, responses):
+                if not isinstance(response, Exception):
+                    extracted.append(self._parse_skills(response.content))
+                    paths.append("llm")
+                elif self.skill_mode == "fallback":
+                    logger.warning(f"Skill extraction LLM call failed ({response}); using the local extractor.")
+                    extracted.append(await run_in_thread(lambda: self._extract_local(text).to_skill_list()))
+                    paths.append("local_fallback")
+                else:
+                    logger.error(f"Skill extraction LLM call failed: {response}")
+                    extracted.append(None)
+                    paths.append("error")
+
+        to_cache = []
+        for indices, text, skills, path in zip(pending.values(), texts, extracted, paths):
+            metrics.inc("skill_extractions_total", len(indices), mode=self.skill_mode, path=path)
+            for i in indices:
+                results[i] = skills
+            # A fallback result is not what the LLM would have said, so do not cache it under the LLM's key
+            if path in ("llm", "local"):
+                to_cache.append((text, skills))
+        await run_in_thread(lambda: [cache_skills(text, version, model_name, skills) for text, skills in to_cache])
+        return results
+
+    def _serve_cached(self, state: JobState, version: str, model_name: str) -> bool:
+        """
+        Fills in the skills from the cache, returning False on a miss.
+        """
+        cached_skills = get_cached_skills(state.raw_text, version, model_name)
+        if cached_skills is None:
+            return False
+        state.skills = cached_skills
+        logger.info(f"Skills served from cache; skipping extraction: {cached_skills}")
+        metrics.inc("skill_extractions_total", mode=self.skill_mode, path="cache")
+        emit_event("skills", skills=state.skills)
+        return True
+
+    def _finish(self, state: JobState, version: str, model_name: str, path: str):
+        metrics.inc("skill_extractions_total", mode=self.skill_mode, path=path)
+        # A fallback result is not what the LLM would have said, so do not cache it under the LLM's key
+        if path != "local_fallback":
+            cache_skills(state.raw_text, version, model_name, state.skills)
+        emit_event("skills", skills=state.skills)
+
+    def _full_prompt(self, raw_text: str) -> str:
+        if settings.PROMPT_BUDGET_ENABLED:
+            raw_text = fit_resume(raw_text, settings.SKILL_PROMPT_MAX_TOKENS)
+        return SKILL_EXTRACTION_PROMPT.format(raw_text=raw_text)
+
+    def _extract_local(self, raw_text: str) -> SkillExtraction:
+        extraction = extract_skills_locally(raw_text, top_k=settings.SKILL_LOCAL_TOP_K)
+        logger.info(f"Local extractor found skills: {extraction.to_skill_list()}")
+        return extraction
+
+    def _extract_with_prefilter(self, raw_text: str) -> List[str]:
+        """
+        Sends the LLM only the local candidates and the lines that mention them.
+        Falls back to the full prompt when the taxonomy finds nothing.
+        """
+        prompt = self._prefilter_prompt(raw_text)
+        return self._extract_with_llm(prompt or self._full_prompt(raw_text))
+
+    def _prefilter_prompt(self, raw_text: str) -> Optional[str]:
+        """
+        Builds the prefiltered prompt, or returns None when the local extractor finds no candidates.
+        """
+        extraction = extract_skills_locally(raw_text, top_k=PREFILTER_CANDIDATES)
+        if not extraction.skills:
+            logger.info("Local extractor found no candidates; sending the full resume to the LLM.")
+            return None
+
+        evidence = "\n".join(extraction.evidence)[:settings.SKILL_PREFILTER_MAX_CHARS]
+        prompt = SKILL_PREFILTER_PROMPT.format(
+            candidates=", ".join(extraction.skills),
+            experience=extraction.experience_label() or "not stated",
+            evidence=evidence,
+        )
+        logger.info(f"Prefiltered skill prompt to {len(prompt)} characters from {len(raw_text)} of resume text.")
+        return prompt
+
+    def _extract_with_llm(self, prompt: str) -> List[str]:
+        response = self.llm.invoke(prompt)
+        return self._parse_skills(response.content)
+
+    async def _aextract_with_llm(self, prompt: str) -> List[str]:
+        response = await self.llm.ainvoke(prompt)
+        return self._parse_skills(response.content)
+
+    @staticmethod
+    def _parse_skills(response_content: str) -> List[str]:
         logger.info(f"Raw LLM response for skills: {response_content}")
 
         # Find the list within the string using regex
@@ -52,17 +361,16 @@ class TextConvertorNode:
                 skills_list = ast.literal_eval(list_str)
                 # Ensure all items are strings and remove duplicates
                 unique_skills = sorted(list(set(map(str, skills_list))))
-                state.skills = unique_skills
                 logger.info(f"Successfully parsed skills: {unique_skills}")
+                return unique_skills
             except (ValueError, SyntaxError) as e:
                 logger.error(f"Failed to parse skills list from LLM response: {e}")
-                state.skills = []
+                return []
         else:
             logger.warning("Could not find a list in the LLM response. Attempting to parse lines.")
             # Fallback: try to parse the content line by line if no list is found
             lines = [line.strip().replace(',', '').replace('"', '').replace("'", '') for line in response_content.split('\n')]
             skills_list = [line for line in lines if line and not line.startswith('<') and not line.startswith('[') and not line.startswith(']')]
-            state.skills = sorted(list(set(skills_list)))
-            logger.info(f"Fallback parsing extracted skills: {state.skills}")
-
-        return state
+            skills = sorted(list(set(skills_list)))
+            logger.info(f"Fallback parsing extracted skills: {skills}")
+            return skills
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from app.core.logger import get_logger
 from app.tools.job_fetcher import fetch_and_process_jobs
 from app.state.job_state import JobState
@@ -14,6 +16,36 @@ class FetchMatchedJobsNode:
         A graph node that fetches and processes job details using the job_fetcher tool.
         """
         logger.info("--- Step: Fetching and processing jobs ---")
+        tool_input = self._tool_input(state)
+        if tool_input is None:
+            state.jobs = []
+            return state
+
+        # Call the consolidated tool to get the final job list
+        detailed_jobs = fetch_and_process_jobs.invoke(tool_input)
+        state.jobs = detailed_jobs
+
+        logger.info(f"Finished job fetching process. Found {len(detailed_jobs)} detailed jobs.")
+        return state
+
+    async def afetch_and_process_jobs_node(self, state: JobState) -> JobState:
+        """
+        Async variant of fetch_and_process_jobs_node(); the upstream requests run on the event loop.
+        """
+        logger.info("--- Step: Fetching and processing jobs ---")
+        tool_input = self._tool_input(state)
+        if tool_input is None:
+            state.jobs = []
+            return state
+
+        detailed_jobs = await fetch_and_process_jobs.ainvoke(tool_input)
+        state.jobs = detailed_jobs
+
+        logger.info(f"Finished job fetching process. Found {len(detailed_jobs)} detailed jobs.")
+        return state
+
+    @staticmethod
+    def _tool_input(state: JobState) -> Optional[dict]:
         skills = state.skills
         start_index = state.start
         posted_hours = state.posted_hours
@@ -21,18 +53,11 @@ class FetchMatchedJobsNode:
 
         if not skills:
             logger.warning("No skills found in state, skipping job fetch.")
-            state.jobs = []
-            return state
+            return None
 
-        # Call the consolidated tool to get the final job list
-        tool_input = {
+        return {
             "skills": skills,
             "job_count": job_count,
             "start": start_index,
             "posted_hours": posted_hours
         }
-        detailed_jobs = fetch_and_process_jobs.invoke(tool_input)
-        state.jobs = detailed_jobs
-
-        logger.info(f"Finished job fetching process. Found {len(detailed_jobs)} detailed jobs.")
-        return state
@@ -0,0 +1,38 @@
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.tracing import run_in_thread
+from app.services.ranking import rank_jobs
+from app.state.job_state import JobState
+from app.utils.stream import emit_event
+
+logger = get_logger(__name__)
+
+
+class RankJobsNode:
+    async def arank_jobs(self, state: JobState) -> JobState:
+        """
+        Async variant of rank_jobs(); the scoring is CPU-bound, so it runs in a worker thread.
+        """
+        return await run_in_thread(self.rank_jobs, state)
+
+    def rank_jobs(self, state: JobState) -> JobState:
+        """
+        Scores the fetched jobs against the skills and orders them by relevance.
+        The full ranked list stays in the state; summarization only reads the top RANK_TOP_K.
+        """
+        logger.info("--- Step: Ranking jobs ---")
+        if not state.jobs:
+            logger.info("No jobs to rank, skipping.")
+            return state
+
+        state.jobs = rank_jobs(state.skills or [], state.jobs)
+        emit_event(
+            "ranking",
+            jobs=[{"jobId": job.job_id, "relevanceScore": job.relevance_score} for job in state.jobs],
+            top_k=settings.RANK_TOP_K,
+        )
+        logger.info(
+            f"Ranked {len(state.jobs)} jobs; top scores: "
+            f"{[job.relevance_score for job in state.jobs[:settings.RANK_TOP_K]]}"
+        )
+        return state
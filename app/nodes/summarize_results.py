@@ -1,63 +1,210 @@
 import re
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
 from app.core.logger import get_logger
-from app.state.job_state import JobState
+from app.core.tracing import run_in_thread
+from app.models.job import Job
+from app.services.resume_cache import prompt_version
+from app.services.summary_cache import cache_assessment, cache_summary, get_cached_assessment, get_cached_summary
+from app.state.job_state import JobChunk, JobState
+from app.utils.prompt_budget import count_tokens, dedupe_jobs, fit_job_descriptions, record_savings
 from langchain.prompts import ChatPromptTemplate
+from langgraph.graph import END
+from langgraph.types import Send
 
 logger = get_logger(__name__)
 
+SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system",
+     "You are an expert career advisor. Your task is to analyze a list of job opportunities "
+     "based on a candidate's skills. First, think step-by-step about which jobs are the best fit and why. "
+     "Enclose this reasoning in <thinking> and </thinking> tags. "
+     "After your reasoning, provide a brief, encouraging summary for the candidate that highlights the top 2-3 most relevant jobs. "
+     "For each recommended job, include its title, company, linkedin_url and a direct link to the job posting, using provided details."
+     "Address the candidate directly in the final summary."
+     ),
+    ("user",
+     "Here are my skills: {skills}\n\n"
+     "And here are the job listings you found for me:\n"
+     "{job_details}\n\n"
+     "Please provide your thinking process and then the final summary."
+     )
+])
+SUMMARY_PROMPT_VERSION = prompt_version(*(message.prompt.template for message in SUMMARY_PROMPT.messages))
+
+# Map-reduce summarization: each branch assesses a chunk of jobs, then the assessments are merged
+FIT_ASSESSMENT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system",
+     "You are an expert career advisor. Assess how well each of the following jobs fits a candidate's skills. "
+     "For each job, write two or three sentences starting with its title, company and linkedin_url, "
+     "then rate the fit as strong, partial or weak and name the matching and the missing skills. "
+     "Do not add an introduction or a conclusion."
+     ),
+    ("user",
+     "Here are my skills: {skills}\n\n"
+     "Assess these job listings:\n"
+     "{job_details}"
+     )
+])
+REDUCE_PROMPT = ChatPromptTemplate.from_messages([
+    ("system",
+     "You are an expert career advisor. You are given fit assessments of job opportunities against a "
+     "candidate's skills, written in parts. First, think step-by-step about which jobs are the best fit and why. "
+     "Enclose this reasoning in <thinking> and </thinking> tags. "
+     "After your reasoning, provide a brief, encouraging summary for the candidate that highlights the top 2-3 most relevant jobs. "
+     "For each recommended job, include its title, company and linkedin_url, using the assessments. "
+     "Address the candidate directly in the final summary."
+     ),
+    ("user",
+     "Here are my skills: {skills}\n\n"
+     "And here are the assessments of the {job_count} job listings you found for me:\n"
+     "{assessments}\n\n"
+     "Please provide your thinking process and then the final summary."
+     )
+])
+FIT_ASSESSMENT_PROMPT_VERSION = prompt_version(*(message.prompt.template for message in FIT_ASSESSMENT_PROMPT.messages))
+MAP_REDUCE_PROMPT_VERSION = prompt_version(
+    FIT_ASSESSMENT_PROMPT_VERSION, *(message.prompt.template for message in REDUCE_PROMPT.messages)
+)
+
 
 class SummarizationNode:
     def __init__(self, llm):
         self.llm = llm
 
+    @property
+    def model_name(self) -> str:
+        return getattr(self.llm, "model_name", None) or type(self.llm).__name__
+
     def summarize_results(self, state: JobState) -> JobState:
         """
         Analyzes the fetched jobs against the user's skills and generates a summary.
+
+        A cached summary for the same skills and jobs is served without calling the LLM.
         """
         logger.info("--- Step: Summarizing job results ---")
-        skills = state.skills
+        jobs, prompt_inputs = self._prepare(state)
+        if prompt_inputs is None:
+            return state
+
+        chain = SUMMARY_PROMPT | self.llm
+        self._apply_response(state, chain.invoke(prompt_inputs).content)
+        self._cache(state, jobs)
+        return state
+
+    async def asummarize_results(self, state: JobState) -> JobState:
+        """
+        Async variant of summarize_results(); the cache lookup and the prompt budgeting run in a worker thread
+        and the LLM call is awaited.
+        """
+        logger.info("--- Step: Summarizing job results ---")
+        jobs, prompt_inputs = await run_in_thread(self._prepare, state)
+        if prompt_inputs is None:
+            return state
+
+        chain = SUMMARY_PROMPT | self.llm
+        self._apply_response(state, (await chain.ainvoke(prompt_inputs)).content)
+        await run_in_thread(self._cache, state, jobs)
+        return state
+
+    def _prepare(self, state: JobState) -> Tuple[List[Job], Optional[dict]]:
+        """
+        Returns the jobs to summarize and the prompt variables, or no prompt variables when
+        the state needs no LLM call: there are no jobs, or a cached summary was applied.
+        """
+        jobs = self._select_jobs(state, settings.RANK_TOP_K)
+        if not jobs or self._serve_cached(state, jobs, SUMMARY_PROMPT_VERSION):
+            return jobs, None
+        return jobs, self._prompt_inputs(state.skills, jobs)
+
+    def _serve_cached(self, state: JobState, jobs: List[Job], version: str) -> bool:
+        """
+        Applies a cached summary of the jobs to the state, returning whether there was one.
+        """
+        job_ids = self._job_ids(jobs)
+        cached = None if job_ids is None else get_cached_summary(state.skills, job_ids, version, self.model_name)
+        if cached is None:
+            return False
+        logger.info(f"Serving a cached summary of {len(jobs)} jobs.")
+        state.summary = cached["summary"]
+        state.thought_process = cached["thought_process"]
+        return True
+
+    def _cache(self, state: JobState, jobs: List[Job], version: str = SUMMARY_PROMPT_VERSION):
+        job_ids = self._job_ids(jobs)
+        if job_ids is not None:
+            cache_summary(state.skills, job_ids, version, self.model_name, state.summary, state.thought_process)
+
+    @staticmethod
+    def _job_ids(jobs: List[Job]) -> Optional[List[str]]:
+        # A job without an ID cannot be told apart from others, so such a set is not cached
+        job_ids = [job.job_id for job in jobs]
+        return None if None in job_ids else job_ids
+
+    @staticmethod
+    def _select_jobs(state: JobState, top_k: Optional[int]) -> List[Job]:
+        """
+        Returns the jobs the summary covers, at most `top_k` of them when they are ranked,
+        or sets the "no jobs" summary and returns an empty list.
+        """
         jobs = state.jobs
 
         if not jobs:
             logger.info("No jobs to summarize, skipping.")
             state.summary = "No jobs were found matching your skills."
-            return state
+            return []
+
+        if settings.PROMPT_BUDGET_ENABLED:
+            # Reposts and repeated IDs would otherwise take slots and budget from distinct jobs
+            jobs = dedupe_jobs(jobs)
 
+        # Ranked jobs are already ordered by relevance, so only the best few need the LLM
+        if top_k is not None and jobs[0].relevance_score is not None:
+            jobs = jobs[:settings.RANK_TOP_K]
+            logger.info(f"Summarizing the top {len(jobs)} of {len(state.jobs)} ranked jobs.")
+        return jobs
+
+    @staticmethod
+    def _prompt_inputs(skills: List[str], jobs: List[Job]) -> dict:
+        """
+        Builds the prompt variables for the given jobs.
+        """
         # Create a simplified text representation of the jobs for the LLM
-        job_details_for_prompt = []
-        for job in jobs:
-            details = (
-                f"- Title: {job.get('title')}\n"
-                f"  Company: {job.get('company-name')}\n"
-                f"  Location: {job.get('formattedJobLocation')}\n"
-                f"  LinkedIn URL: {job.get('linkedin_url')}\n"
-                f"  Description Snippet: {job.get('jobInfo', '')[:200]}...\n"
+        def job_header(job):
+            return (
+                f"- Title: {job.title}\n"
+                f"  Company: {job.company_name}\n"
+                f"  Location: {job.formatted_job_location}\n"
+                f"  LinkedIn URL: {job.linkedin_url}\n"
+            )
+
+        if settings.PROMPT_BUDGET_ENABLED:
+            # Share the budget left after the fixed per-job fields between the descriptions
+            headers = [job_header(job) for job in jobs]
+            header_tokens = sum(count_tokens(header) for header in headers)
+            snippets = fit_job_descriptions(
+                jobs,
+                settings.SUMMARY_PROMPT_MAX_TOKENS - header_tokens,
+                settings.SUMMARY_SNIPPET_MIN_TOKENS,
             )
-            job_details_for_prompt.append(details)
-
-        prompt = ChatPromptTemplate.from_messages([
-            ("system",
-             "You are an expert career advisor. Your task is to analyze a list of job opportunities "
-             "based on a candidate's skills. First, think step-by-step about which jobs are the best fit and why. "
-             "Enclose this reasoning in <thinking> and </thinking> tags. "
-             "After your reasoning, provide a brief, encouraging summary for the candidate that highlights the top 2-3 most relevant jobs. "
-             "For each recommended job, include its title, company, linkedin_url and a direct link to the job posting, using provided details."
-             "Address the candidate directly in the final summary."
-             ),
-            ("user",
-             "Here are my skills: {skills}\n\n"
-             "And here are the job listings you found for me:\n"
-             "{job_details}\n\n"
-             "Please provide your thinking process and then the final summary."
-             )
-        ])
-
-        chain = prompt | self.llm
-        response_content = chain.invoke({
+            before = header_tokens + sum(count_tokens(job.job_info or "") for job in jobs)
+            record_savings("summarize_results", before, header_tokens + sum(count_tokens(s) for s in snippets))
+        else:
+            headers = [job_header(job) for job in jobs]
+            snippets = [f"{(job.job_info or '')[:200]}..." for job in jobs]
+
+        job_details_for_prompt = [
+            f"{header}  Description Snippet: {snippet}\n" for header, snippet in zip(headers, snippets)
+        ]
+
+        return {
             "skills": ", ".join(skills),
             "job_details": "\n".join(job_details_for_prompt)
-        }).content
+        }
 
+    @staticmethod
+    def _apply_response(state: JobState, response_content: str):
         # Parse the thinking block and the summary
         thinking_match = re.search(r'<thinking>(.*?)</thinking>', response_content, re.DOTALL)
         thought_process = thinking_match.group(1).strip() if thinking_match else ""
@@ -70,4 +217,130 @@ class SummarizationNode:
         logger.info(f"Generated thought process: {thought_process}")
         logger.info(f"Generated summary: {summary}")
 
-        return state
+
+class MapReduceSummarizationNode(SummarizationNode):
+    """
+    Summarizes large job lists in parallel: plan_summary() selects the jobs, route_chunks()
+    sends each chunk of settings.SUMMARY_MAP_CHUNK_SIZE jobs to its own assess_jobs() branch,
+    and reduce_summary() merges the branches' fit assessments into the summary.
+
+    Every job that survives deduplication is assessed, not only the top
+    settings.RANK_TOP_K, and no prompt holds more than one chunk of descriptions.
+    Each branch's assessment is cached by the chunk's job IDs and the skills.
+    """
+
+    @property
+    def summary_version(self) -> str:
+        # The chunk size changes what every branch sees, so it is part of the summary's identity
+        return f"{MAP_REDUCE_PROMPT_VERSION}-{settings.SUMMARY_MAP_CHUNK_SIZE}"
+
+    def plan_summary(self, state: JobState) -> dict:
+        """
+        Applies the "no jobs" summary or a cached summary; otherwise leaves the state for route_chunks().
+        """
+        logger.info("--- Step: Planning the job summary ---")
+        jobs = self._select_jobs(state, None)
+        if jobs:
+            self._serve_cached(state, jobs, self.summary_version)
+        return self._summary_update(state)
+
+    def route_chunks(self, state: JobState):
+        """
+        Sends one assess_jobs branch per chunk of jobs, or ends the run when plan_summary() set the summary.
+        """
+        if state.summary is not None:
+            return END
+        jobs = self._select_jobs(state, None)
+        size = max(1, settings.SUMMARY_MAP_CHUNK_SIZE)
+        chunks = [jobs[i:i + size] for i in range(0, len(jobs), size)]
+        logger.info(f"Assessing {len(jobs)} jobs in {len(chunks)} parallel chunks.")
+        return [
+            Send("assess_jobs", JobChunk(chunk=number, skills=state.skills, jobs=chunk))
+            for number, chunk in enumerate(chunks)
+        ]
+
+    def assess_jobs(self, chunk: JobChunk) -> dict:
+        """
+        Assesses one chunk of jobs against the skills (the map step).
+        """
+        assessment, prompt_inputs = self._cached_assessment(chunk)
+        if assessment is None:
+            chain = FIT_ASSESSMENT_PROMPT | self.llm
+            assessment = self._strip_thinking(chain.invoke(prompt_inputs).content)
+            self._cache_assessment(chunk, assessment)
+        return self._assessment_update(chunk, assessment)
+
+    async def aassess_jobs(self, chunk: JobChunk) -> dict:
+        """
+        Async variant of assess_jobs().
+        """
+        assessment, prompt_inputs = await run_in_thread(self._cached_assessment, chunk)
+        if assessment is None:
+            chain = FIT_ASSESSMENT_PROMPT | self.llm
+            assessment = self._strip_thinking((await chain.ainvoke(prompt_inputs)).content)
+            await run_in_thread(self._cache_assessment, chunk, assessment)
+        return self._assessment_update(chunk, assessment)
+
+    def reduce_summary(self, state: JobState) -> dict:
+        """
+        Merges the fit assessments into the summary and thought process (the reduce step).
+        """
+        logger.info("--- Step: Summarizing job results ---")
+        chain = REDUCE_PROMPT | self.llm
+        self._apply_response(state, chain.invoke(self._reduce_inputs(state)).content)
+        self._cache(state, self._select_jobs(state, None), self.summary_version)
+        return self._summary_update(state)
+
+    async def areduce_summary(self, state: JobState) -> dict:
+        """
+        Async variant of reduce_summary().
+        """
+        logger.info("--- Step: Summarizing job results ---")
+        chain = REDUCE_PROMPT | self.llm
+        self._apply_response(state, (await chain.ainvoke(self._reduce_inputs(state))).content)
+        await run_in_thread(self._cache, state, self._select_jobs(state, None), self.summary_version)
+        return self._summary_update(state)
+
+    def _cached_assessment(self, chunk: JobChunk) -> Tuple[Optional[str], Optional[dict]]:
+        """
+        Returns the cached assessment of the chunk, or None and the prompt variables to assess it with.
+        """
+        job_ids = self._job_ids(chunk.jobs)
+        if job_ids is not None:
+            cached = get_cached_assessment(chunk.skills, job_ids, FIT_ASSESSMENT_PROMPT_VERSION, self.model_name)
+            if cached is not None:
+                return cached, None
+        return None, self._prompt_inputs(chunk.skills, chunk.jobs)
+
+    def _cache_assessment(self, chunk: JobChunk, assessment: str):
+        job_ids = self._job_ids(chunk.jobs)
+        if job_ids is not None:
+            cache_assessment(chunk.skills, job_ids, FIT_ASSESSMENT_PROMPT_VERSION, self.model_name, assessment)
+
+    @staticmethod
+    def _assessment_update(chunk: JobChunk, assessment: str) -> dict:
+        # Appended to the state's fit_assessments by its reducer
+        return {"fit_assessments": [{
+            "chunk": chunk.chunk,
+            "job_ids": [job.job_id for job in chunk.jobs],
+            "assessment": assessment,
+        }]}
+
+    @staticmethod
+    def _reduce_inputs(state: JobState) -> dict:
+        # Branches finish in any order; keep the ranking order of the chunks
+        assessments = sorted(state.fit_assessments, key=lambda item: item["chunk"])
+        return {
+            "skills": ", ".join(state.skills),
+            "job_count": sum(len(item["job_ids"]) for item in assessments),
+            "assessments": "\n\n".join(item["assessment"] for item in assessments),
+        }
+
+    @staticmethod
+    def _summary_update(state: JobState) -> dict:
+        # Returning the whole state would append the fit assessments to themselves again
+        return {"summary": state.summary, "thought_process": state.thought_process}
+
+    @staticmethod
+    def _strip_thinking(content: str) -> str:
+        return re.sub(r'<thinking>.*?</thinking>', '', content, flags=re.DOTALL).strip()
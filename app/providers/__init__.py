@@ -0,0 +1,16 @@
+from app.providers.base import JobProvider
+from app.providers.fake import FakeJobProvider
+from app.providers.indeed import IndeedProvider
+from app.providers.linkedin import LinkedInProvider
+from app.providers.registry import asearch_providers, get_providers, register_provider, search_providers
+
+__all__ = [
+    "asearch_providers",
+    "JobProvider",
+    "FakeJobProvider",
+    "IndeedProvider",
+    "LinkedInProvider",
+    "get_providers",
+    "register_provider",
+    "search_providers",
+]
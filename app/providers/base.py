@@ -0,0 +1,77 @@
+"""
+The interface every job source implements.
+"""
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, List, Optional
+
+from app.core.tracing import run_in_thread
+from app.models.job import Job
+
+
+class JobProvider(ABC):
+    """
+    A source of job postings.
+
+    Providers return Job records with `source` set to their name. Each provider
+    has its own timeout and a limit on how many of its searches may run at once
+    in this process, so one slow source cannot take over the worker threads.
+
+    Attributes:
+        name: The provider's name, used in settings, metrics and Job.source.
+        timeout_seconds: How long a search may take before its results are dropped.
+        max_concurrency: The maximum number of concurrent searches.
+        streams_jobs: True if the provider publishes "job" stream events itself as
+            each job arrives; otherwise its jobs are published when its search returns.
+    """
+    name: str = ""
+    streams_jobs: bool = False
+
+    def __init__(self, timeout_seconds: float, max_concurrency: int):
+        self.timeout_seconds = timeout_seconds
+        self.max_concurrency = max(1, max_concurrency)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+
+    def acquire_slot(self, timeout: float) -> bool:
+        return self._slots.acquire(timeout=max(0.0, timeout))
+
+    async def aacquire_slot(self, timeout: float) -> bool:
+        # Polls instead of blocking, so the event loop keeps running and a cancelled wait holds no slot
+        deadline = time.monotonic() + max(0.0, timeout)
+        while not self._slots.acquire(blocking=False):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.01)
+        return True
+
+    def release_slot(self):
+        self._slots.release()
+
+    @abstractmethod
+    def search(self, skills: List[str], count: int, start: int, posted_hours: int,
+               should_stop: Optional[Callable[[], bool]] = None, background: bool = False) -> List[Job]:
+        """
+        Returns up to `count` jobs matching the skills.
+
+        Args:
+            skills: The skills to search for.
+            count: The page size.
+            start: The offset of the page.
+            posted_hours: Only return jobs posted within this many hours.
+            should_stop: Optional callable; once it returns True the provider should
+                return what it has as soon as possible.
+            background: True for speculative work such as prefetching, which should
+                use a smaller share of upstream capacity.
+        """
+
+    async def asearch(self, skills: List[str], count: int, start: int, posted_hours: int,
+                      should_stop: Optional[Callable[[], bool]] = None, background: bool = False) -> List[Job]:
+        """
+        Async variant of search(), used from the event loop.
+
+        The default runs search() in a worker thread; providers with an async client override it.
+        """
+        return await run_in_thread(self.search, skills, count, start, posted_hours,
+                                   should_stop=should_stop, background=background)
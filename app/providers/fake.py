@@ -0,0 +1,99 @@
+"""
+An in-process provider that makes up jobs, for offline tests and benchmarks.
+"""
+import asyncio
+import hashlib
+import random
+import time
+from typing import Callable, List, Optional
+
+from app.models.job import Job
+from app.providers.base import JobProvider
+from app.services.skill_extractor import is_experience_label
+
+_COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Pied Piper")
+_LOCATIONS = ("Bengaluru, India", "Remote", "London, UK", "Berlin, Germany", "New York, NY")
+_SENIORITY = ("Junior", "", "Senior", "Staff", "Lead")
+
+
+def _posted_window_ms(posted_hours: int) -> int:
+    return max(1, posted_hours) * 60 * 60 * 1000
+
+
+class FakeJobProvider(JobProvider):
+    """
+    Returns deterministic, made-up jobs after a configurable delay.
+
+    The same query always yields the same jobs. Descriptions mention the
+    searched skills, so ranking and summarization see realistic text.
+
+    Args:
+        latency_seconds: How long each search sleeps before returning.
+        jitter_seconds: Extra random delay, up to this much, added to each search.
+        failure_rate: The fraction of searches that raise an error.
+        name: The provider name reported in Job.source; lets several fakes run side by side.
+    """
+    name = "fake"
+
+    def __init__(self, timeout_seconds: float, max_concurrency: int, latency_seconds: float = 0.05,
+                 jitter_seconds: float = 0.0, failure_rate: float = 0.0, name: str = None):
+        super().__init__(timeout_seconds, max_concurrency)
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.failure_rate = failure_rate
+        if name:
+            self.name = name
+
+    def search(self, skills: List[str], count: int, start: int, posted_hours: int,
+               should_stop: Optional[Callable[[], bool]] = None, background: bool = False) -> List[Job]:
+        delay = self.latency_seconds + random.uniform(0, self.jitter_seconds)
+        deadline = time.monotonic() + delay
+        # Sleep in short steps so a cancelled search gives its thread back quickly
+        while time.monotonic() < deadline:
+            if should_stop is not None and should_stop():
+                return []
+            time.sleep(min(0.01, max(0.0, deadline - time.monotonic())))
+        return self._make_jobs(skills, count, start, posted_hours)
+
+    async def asearch(self, skills: List[str], count: int, start: int, posted_hours: int,
+                      should_stop: Optional[Callable[[], bool]] = None, background: bool = False) -> List[Job]:
+        # A cancelled task is interrupted at the sleep, so there is no need to poll should_stop
+        await asyncio.sleep(self.latency_seconds + random.uniform(0, self.jitter_seconds))
+        if should_stop is not None and should_stop():
+            return []
+        return self._make_jobs(skills, count, start, posted_hours)
+
+    def _make_jobs(self, skills: List[str], count: int, start: int, posted_hours: int) -> List[Job]:
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise RuntimeError(f"{self.name} provider failed (simulated)")
+
+        searchable = [skill for skill in skills if not is_experience_label(skill)] or ["Software"]
+        now_ms = int(time.time() * 1000)
+        jobs = []
+        for position in range(start, start + count):
+            primary = searchable[position % len(searchable)]
+            secondary = searchable[(position + 1) % len(searchable)]
+            digest = hashlib.sha256(f"{self.name}:{','.join(searchable)}:{position}".encode()).hexdigest()
+            seniority = _SENIORITY[int(digest[:2], 16) % len(_SENIORITY)]
+            company = _COMPANIES[int(digest[2:4], 16) % len(_COMPANIES)]
+            job_id = str(int(digest[4:14], 16))
+            location = _LOCATIONS[int(digest[14:16], 16) % len(_LOCATIONS)]
+            jobs.append(Job(
+                job_id=job_id,
+                title=f"{seniority} {primary} Engineer".strip(),
+                formatted_job_location=location,
+                work_remote_allowed=int(digest[16:18], 16) % 2 == 0,
+                listed_at=now_ms - (int(digest[18:22], 16) % _posted_window_ms(posted_hours)),
+                apply_url=f"https://jobs.example.com/{self.name}/{job_id}",
+                company_name=company,
+                company_universal_name=company.lower().replace(" ", "-"),
+                localized_name="Remote" if location == "Remote" else "On-site",
+                job_info=(
+                    f"{company} is hiring a {seniority} {primary} engineer to build and operate backend services. "
+                    f"You will work with {primary} and {secondary} every day, review code and mentor teammates. "
+                    f"Experience with {', '.join(searchable)} is a plus."
+                ),
+                linkedin_url=None,
+                source=self.name,
+            ))
+        return jobs
@@ -0,0 +1,66 @@
+"""
+Indeed job provider: one search per skill, run concurrently.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from app.core.logger import get_logger
+from app.core.tracing import submit_with_context
+from app.models.job import Job
+from app.providers.base import JobProvider
+from app.services.scraper import get_indeed_jobs
+from app.services.skill_extractor import is_experience_label
+
+logger = get_logger(__name__)
+
+
+def card_to_job(card: dict) -> Job:
+    return Job(
+        job_id=card.get("job_key"),
+        title=card.get("title"),
+        company_name=card.get("company"),
+        formatted_job_location=card.get("location"),
+        apply_url=card.get("url"),
+        source="indeed",
+    )
+
+
+class IndeedProvider(JobProvider):
+    """
+    Searches Indeed once per skill and merges the cards, deduplicated by job key.
+
+    Indeed has no offset-based API here and search cards carry no description,
+    so `start` is ignored and only titles and companies are available for ranking.
+    """
+    name = "indeed"
+
+    def search(self, skills: List[str], count: int, start: int, posted_hours: int,
+               should_stop: Optional[Callable[[], bool]] = None, background: bool = False) -> List[Job]:
+        searchable = [skill for skill in skills if skill.strip() and not is_experience_label(skill)]
+        if not searchable:
+            return []
+
+        per_skill = max(1, -(-count // len(searchable)))
+        workers = 1 if background else min(self.max_concurrency, len(searchable))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="indeed")
+        try:
+            futures = [
+                submit_with_context(executor, get_indeed_jobs, skill, per_skill, self.timeout_seconds) for skill in searchable
+            ]
+            cards = []
+            for future in futures:
+                if should_stop is not None and should_stop():
+                    break
+                cards.extend(future.result())
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        jobs = []
+        seen = set()
+        for card in cards:
+            key = card.get("job_key") or (card.get("title"), card.get("company"))
+            if key in seen:
+                continue
+            seen.add(key)
+            jobs.append(card_to_job(card))
+        return jobs[:count]
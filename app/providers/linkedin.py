@@ -0,0 +1,503 @@
+"""
+LinkedIn job provider: Voyager search, per-skill fan-out and concurrent detail fetches.
+
+Every step has a thread-based version and an async one (prefixed with "a") for
+code running on the event loop; both share the caches and the bookkeeping.
+"""
+import asyncio
+import contextvars
+import heapq
+import math
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed
+from typing import Callable, List, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from app.core.tracing import submit_with_context
+from app.models.job import Job
+from app.providers.base import JobProvider
+from app.services.job_cache import get_job_detail_cache
+from app.services.linkdin_scraper import (
+    aget_linkedin_job_details,
+    aget_linkedin_jobs,
+    get_linkedin_jobs,
+    parse_job_data,
+    parse_job_id_from_urls,
+    get_linkedin_job_details,
+    parse_job_json_response,
+)
+from app.services.search_cache import get_search_cache, search_cache_key
+from app.services.skill_extractor import is_experience_label
+from app.utils.stream import emit_event
+
+logger = get_logger(__name__)
+
+# Set by share_job_details(): job ID -> the task fetching its details
+_shared_details: contextvars.ContextVar[Optional[Dict[str, asyncio.Future]]] = contextvars.ContextVar(
+    "shared_job_details", default=None
+)
+
+
+def _search_job_ids(skills: List[str], count: int, start: int, posted_hours: int) -> Optional[List[Tuple[str, str]]]:
+    """
+    Runs one LinkedIn search and returns (job_id, linkedin_url) tuples, or None on an API error.
+    """
+    return _parse_search(get_linkedin_jobs(skills, count=count, start=start, posted_hours=posted_hours))
+
+
+async def _asearch_job_ids(skills: List[str], count: int, start: int,
+                           posted_hours: int) -> Optional[List[Tuple[str, str]]]:
+    return _parse_search(await aget_linkedin_jobs(skills, count=count, start=start, posted_hours=posted_hours))
+
+
+def _parse_search(raw_jobs: dict) -> Optional[List[Tuple[str, str]]]:
+    if not raw_jobs or "error" in raw_jobs:
+        logger.error("Failed to fetch initial job listings from LinkedIn.")
+        return None
+    job_urls = parse_job_data(raw_jobs)
+    return parse_job_id_from_urls(job_urls)
+
+
+def search_job_ids(skills: List[str], count: int, start: int, posted_hours: int) -> Optional[List[Tuple[str, str]]]:
+    """
+    Returns the (job_id, linkedin_url) tuples for a search, served from the search cache when possible.
+
+    Hot queries are answered from cache while fresh, and while stale they are
+    answered from cache and refreshed in the background. Failed searches are not cached.
+    """
+    cache = get_search_cache()
+    if cache is None:
+        return _search_job_ids(skills, count, start, posted_hours)
+
+    key = search_cache_key(skills, posted_hours, start, count)
+    return cache.get_or_load(key, lambda: _search_job_ids(skills, count, start, posted_hours))
+
+
+async def asearch_job_ids(skills: List[str], count: int, start: int,
+                          posted_hours: int) -> Optional[List[Tuple[str, str]]]:
+    """
+    Async counterpart of search_job_ids(); stale entries are still refreshed by the cache's threads.
+    """
+    cache = get_search_cache()
+    if cache is None:
+        return await _asearch_job_ids(skills, count, start, posted_hours)
+
+    key = search_cache_key(skills, posted_hours, start, count)
+    return await cache.aget_or_load(
+        key,
+        lambda: _asearch_job_ids(skills, count, start, posted_hours),
+        lambda: _search_job_ids(skills, count, start, posted_hours),
+    )
+
+
+def skill_groups(skills: List[str], group_size: int) -> List[List[str]]:
+    """
+    Splits the searchable skills into groups of `group_size`, one search per group.
+    Experience entries such as "3 years exp" are left out.
+    """
+    searchable = [skill for skill in skills if skill.strip() and not is_experience_label(skill)]
+    group_size = max(1, group_size)
+    return [searchable[i:i + group_size] for i in range(0, len(searchable), group_size)]
+
+
+def merge_search_results(result_lists: List[List[Tuple[str, str]]], limit: int,
+                         rrf_k: int = 60) -> List[Tuple[str, str]]:
+    """
+    Merges several ranked result lists into one, deduplicated by job ID.
+
+    Each job scores sum(1 / (rrf_k + rank)) over the lists it appears in
+    (reciprocal-rank fusion), so jobs returned for several skills rise to the
+    top. The best `limit` are selected with a heap; ties keep first-seen order.
+    """
+    scores: Dict[str, float] = {}
+    first_seen: Dict[str, Tuple[int, str]] = {}
+    for results in result_lists:
+        for rank, (job_id, linkedin_url) in enumerate(results, start=1):
+            scores[job_id] = scores.get(job_id, 0.0) + 1.0 / (rrf_k + rank)
+            if job_id not in first_seen:
+                first_seen[job_id] = (len(first_seen), linkedin_url)
+
+    best = heapq.nsmallest(limit, scores, key=lambda job_id: (-scores[job_id], first_seen[job_id][0]))
+    return [(job_id, first_seen[job_id][1]) for job_id in best]
+
+
+def search_job_ids_fanout(skills: List[str], count: int, start: int,
+                          posted_hours: int) -> Optional[List[Tuple[str, str]]]:
+    """
+    Runs one search per skill group concurrently and merges the results.
+
+    Page `start` of the merged ranking depends on every group's results above it,
+    so each group is searched from the top for `start + count` results, and the
+    merged ranking is sliced to [start, start + count). Deep pages therefore cost
+    more per group, but a page continues the ranking of the pages before it
+    rather than merging each group's own page. A job ranked deeper in one group
+    can still lift a job near a page boundary, since each page fetches deeper
+    than the last. Every sub-search goes through the search cache. The page keeps at most `count`
+    unique job IDs, so detail fetches do not grow with the number of groups.
+
+    Returns:
+        The merged (job_id, linkedin_url) tuples, or None if every sub-search failed.
+    """
+    groups = skill_groups(skills, settings.SEARCH_FANOUT_GROUP_SIZE)
+    if len(groups) <= 1:
+        return search_job_ids(skills, count=count, start=start, posted_hours=posted_hours)
+
+    workers = min(settings.SEARCH_FANOUT_MAX_WORKERS, len(groups))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search-fanout") as executor:
+        futures = [
+            submit_with_context(executor, search_job_ids, group, start + count, 0, posted_hours) for group in groups
+        ]
+        result_lists = []
+        for group, future in zip(groups, futures):
+            try:
+                result_lists.append(future.result())
+            except Exception as e:
+                logger.error(f"Search for {group} failed: {e}")
+                result_lists.append(None)
+    return _merge_fanout(groups, result_lists, count, start)
+
+
+async def asearch_job_ids_fanout(skills: List[str], count: int, start: int,
+                                 posted_hours: int) -> Optional[List[Tuple[str, str]]]:
+    """
+    Async counterpart of search_job_ids_fanout(), with at most settings.SEARCH_FANOUT_MAX_WORKERS searches in flight.
+    """
+    groups = skill_groups(skills, settings.SEARCH_FANOUT_GROUP_SIZE)
+    if len(groups) <= 1:
+        return await asearch_job_ids(skills, count=count, start=start, posted_hours=posted_hours)
+
+    semaphore = asyncio.Semaphore(settings.SEARCH_FANOUT_MAX_WORKERS)
+
+    async def search(group: List[str]) -> Optional[List[Tuple[str, str]]]:
+        async with semaphore:
+            return await asearch_job_ids(group, count=start + count, start=0, posted_hours=posted_hours)
+
+    outcomes = await asyncio.gather(*(search(group) for group in groups), return_exceptions=True)
+    result_lists = []
+    for group, outcome in zip(groups, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Search for {group} failed: {outcome}")
+            outcome = None
+        result_lists.append(outcome)
+    return _merge_fanout(groups, result_lists, count, start)
+
+
+def _merge_fanout(groups: List[List[str]], outcomes: List[Optional[List[Tuple[str, str]]]],
+                  count: int, start: int) -> Optional[List[Tuple[str, str]]]:
+    result_lists = []
+    for results in outcomes:
+        metrics.inc("search_fanout_queries_total", outcome="ok" if results is not None else "error")
+        if results is not None:
+            result_lists.append(results)
+
+    if not result_lists:
+        return None
+
+    merged = merge_search_results(result_lists, start + count, settings.SEARCH_FANOUT_RRF_K)[start:]
+    hits = sum(len(results) for results in result_lists)
+    unique = len({job_id for results in result_lists for job_id, _ in results})
+    metrics.inc("search_fanout_duplicates_total", hits - unique)
+    logger.info(
+        f"Search fan-out over {len(groups)} skill groups: {hits} results, {unique} unique, kept {len(merged)}."
+    )
+    return merged
+
+
+def find_job_ids(skills: List[str], count: int, start: int, posted_hours: int) -> Optional[List[Tuple[str, str]]]:
+    """
+    Searches for job IDs with a single combined query, or per skill group when fan-out is enabled.
+    """
+    if settings.SEARCH_FANOUT_ENABLED:
+        return search_job_ids_fanout(skills, count=count, start=start, posted_hours=posted_hours)
+    return search_job_ids(skills, count=count, start=start, posted_hours=posted_hours)
+
+
+async def afind_job_ids(skills: List[str], count: int, start: int,
+                        posted_hours: int) -> Optional[List[Tuple[str, str]]]:
+    """
+    Async counterpart of find_job_ids().
+    """
+    if settings.SEARCH_FANOUT_ENABLED:
+        return await asearch_job_ids_fanout(skills, count=count, start=start, posted_hours=posted_hours)
+    return await asearch_job_ids(skills, count=count, start=start, posted_hours=posted_hours)
+
+
+def order_jobs(jobs: List[Job]) -> List[Job]:
+    """
+    Applies the configured fan-out ordering; "recency" puts the newest postings first.
+    """
+    if settings.SEARCH_FANOUT_ENABLED and settings.SEARCH_FANOUT_ORDER == "recency":
+        return sorted(jobs, key=lambda job: job.listed_at or 0, reverse=True)
+    return jobs
+
+
+def _parse_details(job_id: str, job_details_raw: dict) -> Optional[Job]:
+    if job_details_raw and "error" not in job_details_raw:
+        return parse_job_json_response(job_details_raw, job_id=job_id)
+    return None
+
+
+def _fetch_single_job(job_id: str, timeout: float,
+                      should_stop: Callable[[], bool] = None) -> Tuple[Optional[Job], Optional[float]]:
+    """
+    Fetches and parses the details of one job, returning the details and the elapsed seconds.
+    The elapsed time is None when the fetch was skipped because `should_stop` returned True.
+    """
+    if should_stop is not None and should_stop():
+        return None, None
+    started = time.perf_counter()
+    details = _parse_details(job_id, get_linkedin_job_details(job_id, timeout=timeout))
+    return details, time.perf_counter() - started
+
+
+async def _afetch_single_job(job_id: str, timeout: float,
+                             should_stop: Callable[[], bool] = None) -> Tuple[Optional[Job], Optional[float]]:
+    if should_stop is not None and should_stop():
+        return None, None
+    started = time.perf_counter()
+    details = _parse_details(job_id, await aget_linkedin_job_details(job_id, timeout=timeout))
+    return details, time.perf_counter() - started
+
+
+@contextmanager
+def share_job_details():
+    """
+    Within the block, concurrent afetch_job_details() calls (e.g. the searches of one
+    resume batch) request each job ID once and share the result.
+    """
+    token = _shared_details.set({})
+    try:
+        yield
+    finally:
+        _shared_details.reset(token)
+
+
+async def _afetch_shared_job(job_id: str, timeout: float,
+                             should_stop: Callable[[], bool] = None) -> Tuple[Optional[Job], Optional[float]]:
+    shared = _shared_details.get()
+    if shared is None:
+        return await _afetch_single_job(job_id, timeout, should_stop)
+    future = shared.get(job_id)
+    if future is None:
+        future = shared[job_id] = asyncio.ensure_future(_afetch_single_job(job_id, timeout, should_stop))
+    else:
+        metrics.inc("job_detail_shared_total")
+    # Shielded, so one caller timing out does not cancel the fetch for the others
+    return await asyncio.shield(future)
+
+
+class _DetailBatch:
+    """
+    The bookkeeping shared by fetch_job_details() and afetch_job_details().
+
+    Keeps the results in search order, publishes each job as a "job" stream event
+    as soon as its details are available, records the fetch metrics and collects
+    the newly fetched details for the job-detail cache.
+    """
+
+    def __init__(self, job_ids_and_urls: List[Tuple[str, str]], cached: Dict[str, dict]):
+        self.job_ids_and_urls = job_ids_and_urls
+        self.total = len(job_ids_and_urls)
+        self.results: List[Optional[Job]] = [None] * self.total
+        self.latencies: List[float] = []
+        self.fetched: Dict[str, dict] = {}
+        self.started = time.perf_counter()
+
+        # Serve cached jobs directly and only fetch the ones we have not seen recently
+        self.pending: List[Tuple[int, str]] = []
+        for i, (job_id, _) in enumerate(job_ids_and_urls):
+            if job_id in cached:
+                self.publish(i, Job.from_dict(cached[job_id]))
+            else:
+                self.pending.append((i, job_id))
+
+    def publish(self, index: int, details: Job):
+        # The LinkedIn URL belongs to this search, so it is attached outside the cache.
+        # Entries cached before jobs carried a source are LinkedIn jobs too.
+        job = replace(details, linkedin_url=self.job_ids_and_urls[index][1], source=details.source or "linkedin")
+        self.results[index] = job
+        emit_event("job", index=index, job=job.to_dict())
+
+    def record(self, index: int, job_id: str, details: Optional[Job], elapsed: Optional[float]):
+        if elapsed is None:
+            return
+        outcome = "ok" if details is not None else "error"
+        metrics.observe("job_detail_fetch_seconds", elapsed, outcome=outcome)
+        self.latencies.append(elapsed)
+        logger.info(
+            f"Fetched details for job {index + 1}/{self.total}: {job_id} in {elapsed * 1000:.0f} ms ({outcome})"
+        )
+        if details is None:
+            logger.warning(f"Could not fetch details for job ID: {job_id}")
+        else:
+            self.fetched[job_id] = details.to_dict()
+            self.publish(index, details)
+
+    def timed_out(self, job_id: str):
+        metrics.inc("job_detail_fetch_timeouts_total")
+        logger.warning(f"Timed out fetching details for job ID: {job_id}")
+
+    def jobs(self, max_workers: int) -> List[Job]:
+        if self.latencies:
+            self.latencies.sort()
+            logger.info(
+                f"Job detail latency over {len(self.latencies)} jobs with {max_workers} workers: "
+                f"p50={self.latencies[len(self.latencies) // 2] * 1000:.0f} ms, "
+                f"max={self.latencies[-1] * 1000:.0f} ms, "
+                f"wall={(time.perf_counter() - self.started) * 1000:.0f} ms"
+            )
+        return [job for job in self.results if job is not None]
+
+
+def fetch_job_details(job_ids_and_urls: List[Tuple[str, str]], max_workers: int = None,
+                      timeout: float = None, should_stop: Callable[[], bool] = None) -> List[Job]:
+    """
+    Fetches details for many jobs, concurrently when more than one worker is allowed.
+
+    Results keep the order of the search results. A job that fails or exceeds
+    its timeout is dropped without holding up the others. Jobs already in the
+    job-detail cache are served from it without an upstream request. Each job is
+    also published as a "job" stream event as soon as its details are available.
+
+    Args:
+        job_ids_and_urls: A list of (job_id, linkedin_url) tuples in search order.
+        max_workers: The maximum number of concurrent detail requests.
+            Defaults to settings.JOB_DETAIL_MAX_WORKERS; 1 fetches sequentially.
+        timeout: The timeout in seconds for each job. Defaults to settings.JOB_DETAIL_TIMEOUT_SECONDS.
+        should_stop: Optional callable checked before each request; jobs not yet
+            started are skipped once it returns True.
+
+    Returns:
+        A list of Job records, in search order.
+    """
+    max_workers = max_workers or settings.JOB_DETAIL_MAX_WORKERS
+    timeout = timeout or settings.JOB_DETAIL_TIMEOUT_SECONDS
+
+    cache = get_job_detail_cache()
+    cached = cache.get_many(job_id for job_id, _ in job_ids_and_urls) if cache else {}
+    batch = _DetailBatch(job_ids_and_urls, cached)
+    pending = batch.pending
+    if cache:
+        logger.info(f"Job detail cache: {len(cached)} hits, {len(pending)} misses.")
+
+    if max_workers <= 1 or len(pending) <= 1:
+        for i, job_id in pending:
+            details, elapsed = _fetch_single_job(job_id, timeout, should_stop)
+            batch.record(i, job_id, details, elapsed)
+    else:
+        workers = min(max_workers, len(pending))
+        # Every job gets its own timeout; the overall wait allows for the jobs queued behind the pool.
+        overall_timeout = timeout * math.ceil(len(pending) / workers)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job-details")
+        try:
+            futures = {
+                submit_with_context(executor, _fetch_single_job, job_id, timeout, should_stop): (i, job_id)
+                for i, job_id in pending
+            }
+            try:
+                # Handle each job as soon as it completes so progress can be streamed
+                for future in as_completed(futures, timeout=overall_timeout):
+                    i, job_id = futures.pop(future)
+                    try:
+                        details, elapsed = future.result()
+                    except Exception as e:
+                        logger.error(f"Unexpected error while fetching job ID {job_id}: {e}")
+                        details, elapsed = None, time.perf_counter() - batch.started
+                    batch.record(i, job_id, details, elapsed)
+            except FuturesTimeoutError:
+                for future, (i, job_id) in futures.items():
+                    future.cancel()
+                    batch.timed_out(job_id)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    if cache and batch.fetched:
+        cache.set_many(batch.fetched)
+    return batch.jobs(max_workers)
+
+
+async def afetch_job_details(job_ids_and_urls: List[Tuple[str, str]], max_concurrency: int = None,
+                             timeout: float = None, should_stop: Callable[[], bool] = None) -> List[Job]:
+    """
+    Async counterpart of fetch_job_details(): the detail requests run as tasks on
+    the event loop, at most `max_concurrency` at a time, each bounded by `timeout`.
+    The job-detail cache lives in SQLite, so it is read and written from a worker thread.
+    """
+    max_concurrency = max_concurrency or settings.JOB_DETAIL_MAX_WORKERS
+    timeout = timeout or settings.JOB_DETAIL_TIMEOUT_SECONDS
+
+    cache = get_job_detail_cache()
+    cached = await asyncio.to_thread(cache.get_many, [job_id for job_id, _ in job_ids_and_urls]) if cache else {}
+    batch = _DetailBatch(job_ids_and_urls, cached)
+    if cache:
+        logger.info(f"Job detail cache: {len(cached)} hits, {len(batch.pending)} misses.")
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def fetch(i: int, job_id: str):
+        async with semaphore:
+            try:
+                details, elapsed = await asyncio.wait_for(_afetch_shared_job(job_id, timeout, should_stop), timeout)
+            except asyncio.TimeoutError:
+                batch.timed_out(job_id)
+                return
+            except Exception as e:
+                logger.error(f"Unexpected error while fetching job ID {job_id}: {e}")
+                details, elapsed = None, time.perf_counter() - batch.started
+        batch.record(i, job_id, details, elapsed)
+
+    await asyncio.gather(*(fetch(i, job_id) for i, job_id in batch.pending))
+
+    if cache and batch.fetched:
+        await asyncio.to_thread(cache.set_many, batch.fetched)
+    return batch.jobs(max_concurrency)
+
+
+class LinkedInProvider(JobProvider):
+    """
+    Searches LinkedIn (one combined query, or one per skill group with fan-out) and fetches details concurrently.
+    """
+    name = "linkedin"
+    streams_jobs = True
+
+    def search(self, skills: List[str], count: int, start: int, posted_hours: int,
+               should_stop: Optional[Callable[[], bool]] = None, background: bool = False) -> List[Job]:
+        job_ids_and_urls = find_job_ids(skills, count=count, start=start, posted_hours=posted_hours)
+        if not job_ids_and_urls:
+            if job_ids_and_urls is not None:
+                logger.warning("No job IDs could be extracted from the search results.")
+            return []
+        logger.info(f"Successfully extracted {len(job_ids_and_urls)} job IDs.")
+        if should_stop is not None and should_stop():
+            return []
+
+        jobs = fetch_job_details(
+            job_ids_and_urls,
+            max_workers=settings.PREFETCH_DETAIL_WORKERS if background else None,
+            timeout=min(settings.JOB_DETAIL_TIMEOUT_SECONDS, self.timeout_seconds),
+            should_stop=should_stop,
+        )
+        return order_jobs(jobs)
+
+    async def asearch(self, skills: List[str], count: int, start: int, posted_hours: int,
+                      should_stop: Optional[Callable[[], bool]] = None, background: bool = False) -> List[Job]:
+        job_ids_and_urls = await afind_job_ids(skills, count=count, start=start, posted_hours=posted_hours)
+        if not job_ids_and_urls:
+            if job_ids_and_urls is not None:
+                logger.warning("No job IDs could be extracted from the search results.")
+            return []
+        logger.info(f"Successfully extracted {len(job_ids_and_urls)} job IDs.")
+        if should_stop is not None and should_stop():
+            return []
+
+        jobs = await afetch_job_details(
+            job_ids_and_urls,
+            max_concurrency=settings.PREFETCH_DETAIL_WORKERS if background else None,
+            timeout=min(settings.JOB_DETAIL_TIMEOUT_SECONDS, self.timeout_seconds),
+            should_stop=should_stop,
+        )
+        return order_jobs(jobs)
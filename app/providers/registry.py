@@ -0,0 +1,249 @@
+"""
+Process-wide provider instances and the concurrent multi-provider search.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from app.core.tracing import submit_with_context
+from app.models.job import Job
+from app.providers.base import JobProvider
+from app.providers.fake import FakeJobProvider
+from app.providers.indeed import IndeedProvider
+from app.providers.linkedin import LinkedInProvider
+from app.utils.stream import emit_event
+
+logger = get_logger(__name__)
+
+PROVIDER_CLASSES = {
+    LinkedInProvider.name: LinkedInProvider,
+    IndeedProvider.name: IndeedProvider,
+    FakeJobProvider.name: FakeJobProvider,
+}
+
+_providers: Dict[str, JobProvider] = {}
+_lock = threading.Lock()
+
+
+def build_provider(name: str) -> JobProvider:
+    """
+    Creates a provider from its settings.
+    """
+    provider_class = PROVIDER_CLASSES.get(name)
+    if provider_class is None:
+        raise ValueError(f"Unknown job provider: {name}")
+    kwargs = {
+        "timeout_seconds": settings.PROVIDER_TIMEOUTS.get(name, settings.PROVIDER_DEADLINE_SECONDS),
+        "max_concurrency": settings.PROVIDER_MAX_CONCURRENCY.get(name, 4),
+    }
+    if provider_class is FakeJobProvider:
+        kwargs["latency_seconds"] = settings.FAKE_PROVIDER_LATENCY_SECONDS
+    return provider_class(**kwargs)
+
+
+def register_provider(provider: JobProvider):
+    """
+    Installs a provider instance under its name, replacing any existing one (e.g. a tuned fake).
+    """
+    with _lock:
+        _providers[provider.name] = provider
+
+
+def get_providers(names: Optional[List[str]] = None) -> List[JobProvider]:
+    """
+    Returns the provider instances for `names` (default: settings.JOB_PROVIDERS), creating them on first use.
+    """
+    providers = []
+    for name in names or settings.JOB_PROVIDERS:
+        if name not in _providers:
+            with _lock:
+                if name not in _providers:
+                    _providers[name] = build_provider(name)
+        providers.append(_providers[name])
+    return providers
+
+
+def _run_provider(provider: JobProvider, skills: List[str], count: int, start: int, posted_hours: int,
+                  should_stop: Callable[[], bool], background: bool) -> Optional[List[Job]]:
+    """
+    Runs one provider's search inside its concurrency limit. Returns None if no slot freed up in time.
+    """
+    if not provider.acquire_slot(provider.timeout_seconds):
+        return None
+    try:
+        return provider.search(skills, count, start, posted_hours, should_stop=should_stop, background=background)
+    finally:
+        provider.release_slot()
+
+
+async def _arun_provider(provider: JobProvider, skills: List[str], count: int, start: int, posted_hours: int,
+                         should_stop: Callable[[], bool], background: bool) -> Optional[List[Job]]:
+    if not await provider.aacquire_slot(provider.timeout_seconds):
+        return None
+    try:
+        return await provider.asearch(skills, count, start, posted_hours, should_stop=should_stop,
+                                      background=background)
+    finally:
+        provider.release_slot()
+
+
+def _collect(provider: JobProvider, jobs: Optional[List[Job]], error: Optional[BaseException], elapsed: float,
+             results: Dict[str, List[Job]]):
+    """
+    Records one provider's outcome and publishes its jobs unless the provider streamed them itself.
+    """
+    if error is not None:
+        logger.error(f"Provider '{provider.name}' failed: {error}")
+        jobs, outcome = None, "error"
+    else:
+        outcome = "ok" if jobs is not None else "saturated"
+    metrics.inc("provider_requests_total", provider=provider.name, outcome=outcome)
+    metrics.observe("provider_search_seconds", elapsed, provider=provider.name)
+    if jobs is None:
+        return
+    logger.info(f"Provider '{provider.name}' returned {len(jobs)} jobs in {elapsed * 1000:.0f} ms.")
+    results[provider.name] = jobs
+    if not provider.streams_jobs:
+        for index, job in enumerate(jobs):
+            emit_event("job", index=index, job=job.to_dict())
+
+
+def _missed_deadline(provider: JobProvider):
+    metrics.inc("provider_requests_total", provider=provider.name, outcome="timeout")
+    logger.warning(f"Provider '{provider.name}' missed its deadline; continuing without it.")
+
+
+def _merge(providers: List[JobProvider], results: Dict[str, List[Job]]) -> List[Job]:
+    merged = []
+    seen = set()
+    for provider in providers:
+        for job in results.get(provider.name, ()):
+            key = (job.source or provider.name, job.job_id)
+            if job.job_id is not None and key in seen:
+                continue
+            seen.add(key)
+            merged.append(job)
+    return merged
+
+
+def search_providers(skills: List[str], count: int, start: int, posted_hours: int,
+                     providers: Optional[List[JobProvider]] = None, deadline_seconds: Optional[float] = None,
+                     should_stop: Optional[Callable[[], bool]] = None, background: bool = False) -> List[Job]:
+    """
+    Queries every provider in parallel and returns the jobs that arrived in time.
+
+    Each provider is bounded by its own timeout and by the overall deadline,
+    whichever comes first. A provider that fails or runs late is left out; the
+    others' results are still returned. When the call returns, providers still
+    running are asked to stop through their `should_stop` callable.
+
+    Args:
+        skills: The skills to search for.
+        count: The page size requested from each provider.
+        start: The page offset.
+        posted_hours: The posting-age window.
+        providers: The providers to query. Defaults to get_providers().
+        deadline_seconds: The overall deadline. Defaults to settings.PROVIDER_DEADLINE_SECONDS.
+        should_stop: Optional callable that cancels the whole search when it returns True.
+        background: Passed through to the providers for speculative work such as prefetching.
+
+    Returns:
+        The jobs of all providers that finished, in provider order, deduplicated by (source, job ID).
+    """
+    providers = providers if providers is not None else get_providers()
+    if not providers:
+        return []
+
+    stop = threading.Event()
+
+    def stopped() -> bool:
+        return stop.is_set() or (should_stop is not None and should_stop())
+
+    started = time.monotonic()
+    deadline = started + (deadline_seconds or settings.PROVIDER_DEADLINE_SECONDS)
+    results: Dict[str, List[Job]] = {}
+    executor = ThreadPoolExecutor(max_workers=len(providers), thread_name_prefix="providers")
+    try:
+        futures = {
+            submit_with_context(executor, _run_provider, provider, skills, count, start, posted_hours, stopped, background):
+                (provider, min(deadline, started + provider.timeout_seconds))
+            for provider in providers
+        }
+        pending = set(futures)
+        while pending:
+            now = time.monotonic()
+            for future in [future for future in pending if futures[future][1] <= now]:
+                pending.discard(future)
+                future.cancel()
+                _missed_deadline(futures[future][0])
+            if not pending:
+                break
+
+            next_deadline = min(futures[future][1] for future in pending)
+            done, pending = wait(pending, timeout=max(0.0, next_deadline - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                _collect(futures[future][0], None if error else future.result(), error,
+                         time.monotonic() - started, results)
+    finally:
+        # Ask any provider still running to wrap up; its late results are discarded
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return _merge(providers, results)
+
+
+async def asearch_providers(skills: List[str], count: int, start: int, posted_hours: int,
+                            providers: Optional[List[JobProvider]] = None, deadline_seconds: Optional[float] = None,
+                            should_stop: Optional[Callable[[], bool]] = None, background: bool = False) -> List[Job]:
+    """
+    Async counterpart of search_providers(): each provider's asearch() runs as a task
+    on the event loop, and a provider that misses its deadline is cancelled outright.
+    """
+    providers = providers if providers is not None else get_providers()
+    if not providers:
+        return []
+
+    stop = threading.Event()
+
+    def stopped() -> bool:
+        return stop.is_set() or (should_stop is not None and should_stop())
+
+    started = time.monotonic()
+    deadline = started + (deadline_seconds or settings.PROVIDER_DEADLINE_SECONDS)
+    results: Dict[str, List[Job]] = {}
+    tasks = {
+        asyncio.ensure_future(_arun_provider(provider, skills, count, start, posted_hours, stopped, background)):
+            (provider, min(deadline, started + provider.timeout_seconds))
+        for provider in providers
+    }
+    pending = set(tasks)
+    try:
+        while pending:
+            now = time.monotonic()
+            for task in [task for task in pending if tasks[task][1] <= now]:
+                pending.discard(task)
+                task.cancel()
+                _missed_deadline(tasks[task][0])
+            if not pending:
+                break
+
+            next_deadline = min(tasks[task][1] for task in pending)
+            done, pending = await asyncio.wait(pending, timeout=max(0.0, next_deadline - now),
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                error = task.exception()
+                _collect(tasks[task][0], None if error else task.result(), error,
+                         time.monotonic() - started, results)
+    finally:
+        # Threads running a provider's default asearch() cannot be cancelled; they see the stop flag
+        stop.set()
+        for task in pending:
+            task.cancel()
+
+    return _merge(providers, results)
@@ -0,0 +1,261 @@
+"""
+Batch processing of many resumes with shared searches.
+
+Resumes arrive as PDFs or zip archives of PDFs. Their text is extracted in
+parallel and their skills with one batched LLM call. Resumes are then grouped
+by canonical skill set (searchable skills, ignoring order, case and the
+experience entry), so each distinct search, ranking and summary runs once per
+group, and job details that several groups' searches return are fetched once.
+Results are yielded per resume as soon as its group finishes.
+"""
+import asyncio
+import io
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from app.core.tracing import run_in_thread
+from app.graph.registry import get_graph_registry
+from app.nodes.extract_skills import TextConvertorNode
+from app.providers.linkedin import share_job_details
+from app.services.skill_extractor import is_experience_label
+from app.state.job_state import JobState
+
+logger = get_logger(__name__)
+
+PDF_MAGIC = b"%PDF"
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+class BatchInputError(ValueError):
+    """
+    Raised when a batch upload is malformed or exceeds the batch limits.
+    """
+
+
+@dataclass
+class ResumeFile:
+    index: int
+    filename: str
+    data: bytes
+
+
+def _zip_entries(filename: str, data: bytes) -> List[Tuple[str, bytes]]:
+    """
+    Returns the PDFs inside a zip archive, checking sizes before decompressing anything.
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        raise BatchInputError(f"'{filename}' is not a valid zip archive.")
+    with archive:
+        entries = [
+            info for info in archive.infolist()
+            if not info.is_dir() and info.filename.lower().endswith(".pdf")
+            and not info.filename.startswith("__MACOSX/")
+        ]
+        total = sum(info.file_size for info in entries)
+        if total > settings.BATCH_MAX_ARCHIVE_BYTES:
+            raise BatchInputError(
+                f"'{filename}' expands to {total} bytes; the limit is {settings.BATCH_MAX_ARCHIVE_BYTES}."
+            )
+        for info in entries:
+            if info.file_size > settings.MAX_UPLOAD_BYTES:
+                raise BatchInputError(
+                    f"'{info.filename}' in '{filename}' exceeds the maximum upload size of "
+                    f"{settings.MAX_UPLOAD_BYTES} bytes."
+                )
+        return [(f"{filename}/{info.filename}", archive.read(info)) for info in entries]
+
+
+def expand_uploads(files: Iterable[Tuple[str, bytes]]) -> List[ResumeFile]:
+    """
+    Turns uploaded files into a flat list of resumes, unpacking zip archives.
+
+    Args:
+        files: (filename, content) pairs; each is a PDF or a zip archive of PDFs.
+
+    Returns:
+        The resumes, numbered in upload order.
+
+    Raises:
+        BatchInputError: if a file is neither a PDF nor a zip archive, is too large,
+            or the batch holds more than settings.BATCH_MAX_RESUMES resumes.
+    """
+    resumes: List[ResumeFile] = []
+    for filename, data in files:
+        if data.startswith(ZIP_MAGIC):
+            entries = _zip_entries(filename, data)
+        elif data.startswith(PDF_MAGIC):
+            if len(data) > settings.MAX_UPLOAD_BYTES:
+                raise BatchInputError(
+                    f"'{filename}' exceeds the maximum upload size of {settings.MAX_UPLOAD_BYTES} bytes."
+                )
+            entries = [(filename, data)]
+        else:
+            raise BatchInputError(f"'{filename}' is neither a PDF nor a zip archive.")
+        for name, content in entries:
+            resumes.append(ResumeFile(index=len(resumes), filename=name, data=content))
+            if len(resumes) > settings.BATCH_MAX_RESUMES:
+                raise BatchInputError(f"A batch may hold at most {settings.BATCH_MAX_RESUMES} resumes.")
+    if not resumes:
+        raise BatchInputError("The upload contains no PDF resumes.")
+    return resumes
+
+
+def search_skills(skills: List[str]) -> List[str]:
+    """
+    Returns the skills a search is run with: the experience entry and blanks are left out.
+    """
+    return [skill for skill in skills if skill.strip() and not is_experience_label(skill)]
+
+
+def canonical_skill_set(skills: List[str]) -> Tuple[str, ...]:
+    """
+    Returns the key resumes are grouped by; resumes with equal keys share one search.
+    """
+    return tuple(sorted({skill.strip().lower() for skill in search_skills(skills)}))
+
+
+async def _extract_texts(resumes: List[ResumeFile]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Extracts every resume's text, settings.BATCH_PDF_CONCURRENCY at a time, returning (text, error) pairs.
+    """
+    semaphore = asyncio.Semaphore(max(1, settings.BATCH_PDF_CONCURRENCY))
+
+    async def extract(resume: ResumeFile) -> Tuple[Optional[str], Optional[str]]:
+        async with semaphore:
+            try:
+                return await run_in_thread(TextConvertorNode.pdf_to_text, resume.data), None
+            except ValueError as e:
+                return None, str(e)
+
+    return await asyncio.gather(*(extract(resume) for resume in resumes))
+
+
+async def _run_search(workflow, number: int, skills: List[str], job_count: int, posted_hours: int,
+                      semaphore: asyncio.Semaphore) -> Tuple[int, Optional[dict], Optional[Exception]]:
+    """
+    Runs one group's search, returning (group number, final state, error).
+    """
+    async with semaphore:
+        try:
+            state = JobState(skills=skills, job_count=job_count, posted_hours=posted_hours)
+            return number, await workflow.ainvoke(state), None
+        except Exception as e:
+            return number, None, e
+
+
+async def process_resume_batch(resumes: List[ResumeFile], job_count: int = 10, posted_hours: int = 12,
+                               skill_mode: str = None) -> AsyncIterator[dict]:
+    """
+    Processes a batch of resumes and yields progress and results as events.
+
+    Event types:
+        batch_start: the number of resumes.
+        skills: one resume's extracted skills.
+        resume_error: one resume failed (unreadable PDF, failed extraction or search).
+        groups: the distinct skill sets and the resumes in each.
+        result: one resume's jobs, summary and thought process, from its group's search.
+        batch_done: counts and the total duration.
+
+    Args:
+        resumes: The resumes, e.g. from expand_uploads().
+        job_count: The number of jobs fetched per distinct search.
+        posted_hours: The posting-age window of the searches.
+        skill_mode: The skill extraction mode. Defaults to settings.SKILL_EXTRACTION_MODE.
+    """
+    started = time.perf_counter()
+    registry = get_graph_registry()
+    text_convertor = TextConvertorNode(registry.llm, skill_mode=skill_mode)
+    failed = 0
+    yield {"event": "batch_start", "resumes": len(resumes)}
+
+    # 1. Extract the text of every PDF in parallel
+    texts = await _extract_texts(resumes)
+    readable = []
+    for resume, (text, error) in zip(resumes, texts):
+        if error is not None:
+            failed += 1
+            yield {"event": "resume_error", "index": resume.index, "filename": resume.filename, "detail": error}
+        else:
+            readable.append((resume, text))
+
+    # 2. Extract the skills of all readable resumes with batched LLM calls
+    skill_lists = await text_convertor.aextract_skills_batch([text for _, text in readable]) if readable else []
+
+    # 3. Group the resumes by canonical skill set
+    groups: Dict[Tuple[str, ...], List[Tuple[ResumeFile, List[str]]]] = {}
+    for (resume, _), skills in zip(readable, skill_lists):
+        if not skills or not search_skills(skills):
+            failed += 1
+            yield {"event": "resume_error", "index": resume.index, "filename": resume.filename,
+                   "detail": "No searchable skills could be extracted from the resume."}
+            continue
+        yield {"event": "skills", "index": resume.index, "filename": resume.filename, "skills": skills}
+        groups.setdefault(canonical_skill_set(skills), []).append((resume, skills))
+
+    group_list = list(groups.values())
+    metrics.inc("batch_resumes_total", len(resumes))
+    metrics.inc("batch_searches_total", len(group_list))
+    logger.info(f"Batch of {len(resumes)} resumes: {len(readable)} readable, {len(group_list)} distinct searches.")
+    yield {
+        "event": "groups",
+        "groups": [
+            {"group": number, "skills": search_skills(members[0][1]),
+             "resumes": [resume.index for resume, _ in members]}
+            for number, members in enumerate(group_list)
+        ],
+    }
+
+    # 4. Run each distinct search once; groups' searches share job detail fetches
+    workflow = registry.direct_search_graph
+    semaphore = asyncio.Semaphore(max(1, settings.BATCH_SEARCH_CONCURRENCY))
+    with share_job_details():
+        tasks = [
+            asyncio.ensure_future(
+                _run_search(workflow, number, search_skills(members[0][1]), job_count, posted_hours, semaphore)
+            )
+            for number, members in enumerate(group_list)
+        ]
+        try:
+            # 5. Report every resume of a group as soon as its search finishes
+            for next_done in asyncio.as_completed(tasks):
+                number, final_state, error = await next_done
+                if error is not None:
+                    logger.error(f"Search for group {number} failed: {error}")
+                for resume, skills in group_list[number]:
+                    if error is not None:
+                        failed += 1
+                        yield {"event": "resume_error", "index": resume.index, "filename": resume.filename,
+                               "detail": "The job search for this resume failed."}
+                        continue
+                    yield {
+                        "event": "result",
+                        "index": resume.index,
+                        "filename": resume.filename,
+                        "group": number,
+                        "skills": skills,
+                        "jobs": final_state.get("jobs") or [],
+                        "summary": final_state.get("summary"),
+                        "thought_process": final_state.get("thought_process"),
+                    }
+        finally:
+            # The client may disconnect mid-stream; do not leave searches running
+            for task in tasks:
+                task.cancel()
+
+    elapsed = time.perf_counter() - started
+    metrics.observe("batch_seconds", elapsed)
+    yield {
+        "event": "batch_done",
+        "resumes": len(resumes),
+        "succeeded": len(resumes) - failed,
+        "failed": failed,
+        "searches": len(group_list),
+        "duration_ms": round(elapsed * 1000, 1),
+    }
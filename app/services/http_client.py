@@ -0,0 +1,470 @@
+"""
+Shared HTTP client for all upstream job sources.
+
+A single pooled `requests.Session` is reused across calls so that TCP/TLS
+connections are kept alive, 429/5xx responses are retried with jittered
+exponential backoff, and the per-endpoint header sets are built only once.
+Each endpoint also has a token-bucket rate limit and a circuit breaker that are
+shared by every worker process and consulted before every attempt, retries
+included, so throttling upstreams are not hammered.
+
+Code running on the event loop uses `aget()` instead, which goes through a
+pooled `httpx.AsyncClient` with the same retries, limits and metrics.
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+import weakref
+from functools import lru_cache
+from typing import Any, Dict, Optional, Union
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from app.core.tracing import BYTE_BUCKETS, record_span
+from app.utils.rate_limit import CircuitBreaker, CircuitOpenError, RateLimitTimeout, TokenBucket
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library decoder
+    orjson = None
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:  # h2 is optional; the async client falls back to HTTP/1.1
+    HTTP2_AVAILABLE = False
+
+logger = get_logger(__name__)
+
+_USER_AGENT = (
+    'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36'
+)
+
+# Static header templates for each upstream endpoint. Authentication headers
+# are merged in once per credential pair by get_headers().
+ENDPOINT_HEADERS = {
+    "linkedin_search": {
+        'accept': 'application/vnd.linkedin.normalized+json+2.1',
+        'accept-language': 'en-US,en;q=0.9',
+        'user-agent': _USER_AGENT,
+        'x-restli-protocol-version': '2.0.0',
+        'referer': 'https://www.linkedin.com/jobs/search/',
+        'sec-ch-ua': '"Not;A=Brand";v="99", "Google Chrome";v="139", "Chromium";v="139"',
+        'sec-ch-ua-mobile': '?0',
+        'sec-ch-ua-platform': '"macOS"',
+        'sec-fetch-dest': 'empty',
+        'sec-fetch-mode': 'cors',
+        'sec-fetch-site': 'same-origin',
+    },
+    "linkedin_job_details": {
+        'accept': 'application/vnd.linkedin.normalized+json+2.1',
+        'accept-language': 'en-US,en;q=0.9,hi;q=0.8',
+        'user-agent': _USER_AGENT,
+        'x-li-lang': 'en_US',
+        'x-restli-protocol-version': '2.0.0',
+    },
+    "indeed": {
+        'User-Agent': 'Mozilla/5.0',
+    },
+}
+
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# An httpx client is bound to the event loop it was first used on, so there is one per loop
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_limiters: Dict[str, Optional[TokenBucket]] = {}
+_breakers: Dict[str, Optional[CircuitBreaker]] = {}
+_guards_lock = threading.Lock()
+
+
+class UpstreamThrottledError(requests.exceptions.RequestException):
+    """
+    Raised without contacting the upstream, when its circuit is open or the rate-limit wait is too long.
+    Subclasses RequestException so existing handlers treat it like any other request failure.
+    """
+
+
+@lru_cache(maxsize=16)
+def get_headers(endpoint: str, cookie: str = None, csrf_token: str = None) -> dict:
+    """
+    Returns the pre-built header dictionary for an endpoint and credential pair.
+
+    The returned dictionary is shared between calls and must not be mutated.
+    """
+    headers = dict(ENDPOINT_HEADERS[endpoint])
+    if cookie:
+        headers['cookie'] = cookie
+    if csrf_token:
+        headers['csrf-token'] = csrf_token
+    return headers
+
+
+def _build_session() -> requests.Session:
+    # The adapter only retries connection failures; get() retries 429/5xx itself, so
+    # that each attempt goes through the endpoint's rate limit and circuit breaker
+    retry = Retry(
+        total=settings.HTTP_MAX_RETRIES,
+        backoff_factor=settings.HTTP_BACKOFF_FACTOR,
+        backoff_jitter=settings.HTTP_BACKOFF_JITTER,
+        backoff_max=settings.HTTP_BACKOFF_MAX_SECONDS,
+        status_forcelist=(),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Returns the process-wide pooled session, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Returns the pooled async client for the running event loop, creating it on first use.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        with _session_lock:
+            client = _async_clients.get(loop)
+            if client is None:
+                limits = httpx.Limits(
+                    max_connections=settings.HTTP_POOL_MAXSIZE,
+                    max_keepalive_connections=settings.HTTP_POOL_MAXSIZE,
+                )
+                # Transport-level retries only cover connection failures; status retries are done by aget()
+                transport = httpx.AsyncHTTPTransport(
+                    http2=HTTP2_AVAILABLE, limits=limits, retries=settings.HTTP_MAX_RETRIES
+                )
+                client = httpx.AsyncClient(transport=transport, timeout=settings.HTTP_TIMEOUT_SECONDS)
+                _async_clients[loop] = client
+    return client
+
+
+async def close_async_client():
+    """
+    Closes the running event loop's async client, if it has one.
+    """
+    with _session_lock:
+        client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+def get_rate_limiter(endpoint: str) -> Optional[TokenBucket]:
+    """
+    Returns the shared token bucket for an endpoint, or None if it is not rate limited.
+    """
+    if not settings.RATE_LIMIT_ENABLED or endpoint not in settings.RATE_LIMIT_RATES:
+        return None
+    if endpoint not in _limiters:
+        with _guards_lock:
+            if endpoint not in _limiters:
+                _limiters[endpoint] = TokenBucket(
+                    settings.RATE_LIMIT_DB_PATH,
+                    endpoint,
+                    rate=settings.RATE_LIMIT_RATES[endpoint],
+                    burst=settings.RATE_LIMIT_BURSTS.get(endpoint, 1),
+                )
+    return _limiters[endpoint]
+
+
+def get_circuit_breaker(endpoint: str) -> Optional[CircuitBreaker]:
+    """
+    Returns the shared circuit breaker for an endpoint, or None when breakers are disabled.
+    """
+    if not settings.CIRCUIT_BREAKER_ENABLED:
+        return None
+    if endpoint not in _breakers:
+        with _guards_lock:
+            if endpoint not in _breakers:
+                _breakers[endpoint] = CircuitBreaker(
+                    settings.RATE_LIMIT_DB_PATH,
+                    endpoint,
+                    failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                    reset_seconds=settings.CIRCUIT_RESET_SECONDS,
+                )
+    return _breakers[endpoint]
+
+
+def _retry_after_seconds(response: Union[requests.Response, httpx.Response]) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value else None
+    except ValueError:  # an HTTP date; the breaker's reset period applies instead
+        return None
+
+
+def _acquire(endpoint: str, breaker: Optional[CircuitBreaker]):
+    """
+    Fails fast if the endpoint's circuit is open, then waits for a rate-limit token.
+    """
+    try:
+        if breaker is not None:
+            breaker.before_call()
+        limiter = get_rate_limiter(endpoint)
+        if limiter is not None:
+            waited = limiter.acquire(max_wait=settings.RATE_LIMIT_MAX_WAIT_SECONDS)
+            metrics.observe("rate_limiter_wait_seconds", waited, endpoint=endpoint)
+            if waited:
+                record_span(f"rate_limit:{endpoint}", waited)
+    except CircuitOpenError as e:
+        metrics.inc("upstream_requests_total", endpoint=endpoint, status="circuit_open")
+        raise UpstreamThrottledError(str(e)) from e
+    except RateLimitTimeout as e:
+        metrics.inc("rate_limiter_rejections_total", endpoint=endpoint)
+        metrics.inc("upstream_requests_total", endpoint=endpoint, status="rate_limited")
+        raise UpstreamThrottledError(str(e)) from e
+
+
+def get(url: str, endpoint: str, headers: dict = None, params: dict = None,
+        timeout: float = None) -> requests.Response:
+    """
+    Performs a GET request through the shared session.
+
+    429/5xx responses are retried here rather than by the session's adapter, so
+    that every attempt takes its own rate-limit token and passes the circuit
+    breaker, and each failed attempt counts towards opening the circuit. A retry
+    the limiter or breaker refuses ends the call with the last response.
+
+    Args:
+        url: The full URL to request.
+        endpoint: The endpoint name, used for metrics and the default header template.
+        headers: The headers to send. Defaults to the endpoint's template.
+        params: Optional query parameters.
+        timeout: Optional timeout in seconds. Defaults to settings.HTTP_TIMEOUT_SECONDS.
+
+    Returns:
+        The `requests.Response`, after any retries have been exhausted.
+
+    Raises:
+        UpstreamThrottledError: if the endpoint's circuit is open or no rate-limit
+            token became available within settings.RATE_LIMIT_MAX_WAIT_SECONDS.
+    """
+    breaker = get_circuit_breaker(endpoint)
+    _acquire(endpoint, breaker)
+
+    session = get_session()
+    started = time.perf_counter()
+    status = "exception"
+    response_bytes = 0
+    try:
+        for attempt in range(settings.HTTP_MAX_RETRIES + 1):
+            if attempt:
+                try:
+                    _acquire(endpoint, breaker)
+                except UpstreamThrottledError:
+                    break
+            try:
+                response = session.get(
+                    url,
+                    headers=headers if headers is not None else get_headers(endpoint),
+                    params=params,
+                    timeout=timeout or settings.HTTP_TIMEOUT_SECONDS,
+                )
+            except requests.exceptions.RequestException:
+                if breaker is not None:
+                    breaker.record_failure()
+                raise
+            retries = getattr(response.raw, "retries", None)
+            if retries is not None and retries.history:
+                metrics.inc("upstream_retries_total", len(retries.history), endpoint=endpoint)
+            if response.status_code not in RETRY_STATUS_CODES:
+                if breaker is not None:
+                    breaker.record_success()
+                break
+            retry_after = _retry_after_seconds(response)
+            if breaker is not None:
+                breaker.record_failure(retry_after)
+            if attempt == settings.HTTP_MAX_RETRIES:
+                break
+            metrics.inc("upstream_retries_total", endpoint=endpoint)
+            time.sleep(_backoff_seconds(attempt, retry_after))
+        status = str(response.status_code)
+        response_bytes = len(response.content)
+        metrics.observe("upstream_response_bytes", response_bytes, buckets=BYTE_BUCKETS, endpoint=endpoint)
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.inc("upstream_requests_total", endpoint=endpoint, status=status)
+        metrics.observe("upstream_request_seconds", elapsed, endpoint=endpoint)
+        record_span(f"http:{endpoint}", elapsed, status=status, bytes=response_bytes)
+
+
+def _backoff_seconds(attempt: int, retry_after: Optional[float]) -> float:
+    """
+    Returns how long to wait before retrying a 429/5xx response.
+
+    Mirrors urllib3's Retry: Retry-After wins, otherwise exponential backoff with
+    jitter; either way the wait is capped at settings.HTTP_BACKOFF_MAX_SECONDS, and
+    longer throttling is left to the circuit breaker.
+    """
+    if retry_after is not None:
+        wait = retry_after
+    else:
+        backoff = settings.HTTP_BACKOFF_FACTOR * (2 ** attempt) if attempt else 0.0
+        wait = backoff + random.uniform(0, settings.HTTP_BACKOFF_JITTER)
+    return max(0.0, min(wait, settings.HTTP_BACKOFF_MAX_SECONDS))
+
+
+async def aget(url: str, endpoint: str, headers: dict = None, params: dict = None,
+               timeout: float = None) -> httpx.Response:
+    """
+    Performs a GET request through the event loop's shared async client.
+
+    Behaves like get(): 429/5xx responses are retried with jittered exponential
+    backoff, and every attempt takes a rate-limit token and passes the circuit
+    breaker. The limiter and breaker keep their state in SQLite, so they are
+    consulted from a worker thread.
+
+    Args:
+        url: The full URL to request.
+        endpoint: The endpoint name, used for metrics and the default header template.
+        headers: The headers to send. Defaults to the endpoint's template.
+        params: Optional query parameters.
+        timeout: Optional timeout in seconds. Defaults to settings.HTTP_TIMEOUT_SECONDS.
+
+    Returns:
+        The `httpx.Response`, after any retries have been exhausted.
+
+    Raises:
+        UpstreamThrottledError: if the endpoint's circuit is open or no rate-limit
+            token became available within settings.RATE_LIMIT_MAX_WAIT_SECONDS.
+        httpx.HTTPError: if the request could not be completed.
+    """
+    breaker = get_circuit_breaker(endpoint)
+    guarded = breaker is not None or get_rate_limiter(endpoint) is not None
+    if guarded:
+        await asyncio.to_thread(_acquire, endpoint, breaker)
+
+    client = get_async_client()
+    started = time.perf_counter()
+    status = "exception"
+    response_bytes = 0
+    try:
+        for attempt in range(settings.HTTP_MAX_RETRIES + 1):
+            if attempt and guarded:
+                try:
+                    await asyncio.to_thread(_acquire, endpoint, breaker)
+                except UpstreamThrottledError:
+                    break
+            try:
+                response = await client.get(
+                    url,
+                    headers=headers if headers is not None else get_headers(endpoint),
+                    params=params,
+                    timeout=timeout or settings.HTTP_TIMEOUT_SECONDS,
+                )
+            except httpx.HTTPError:
+                if breaker is not None:
+                    await asyncio.to_thread(breaker.record_failure)
+                raise
+            if response.status_code not in RETRY_STATUS_CODES:
+                if breaker is not None:
+                    await asyncio.to_thread(breaker.record_success)
+                break
+            retry_after = _retry_after_seconds(response)
+            if breaker is not None:
+                await asyncio.to_thread(breaker.record_failure, retry_after)
+            if attempt == settings.HTTP_MAX_RETRIES:
+                break
+            metrics.inc("upstream_retries_total", endpoint=endpoint)
+            await asyncio.sleep(_backoff_seconds(attempt, retry_after))
+        status = str(response.status_code)
+        response_bytes = len(response.content)
+        metrics.observe("upstream_response_bytes", response_bytes, buckets=BYTE_BUCKETS, endpoint=endpoint)
+        return response
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.inc("upstream_requests_total", endpoint=endpoint, status=status)
+        metrics.observe("upstream_request_seconds", elapsed, endpoint=endpoint)
+        record_span(f"http:{endpoint}", elapsed, status=status, bytes=response_bytes)
+
+
+def decode_json(response: Union[requests.Response, httpx.Response]) -> Any:
+    """
+    Decodes a JSON response body, using orjson when it is installed.
+
+    Raises:
+        json.JSONDecodeError: if the body is not valid JSON (orjson's error is a subclass).
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+def get_pool_stats() -> dict:
+    """
+    Returns connection-pool statistics for every host the shared session has talked to.
+    """
+    if _session is None:
+        return {"hosts": []}
+
+    hosts = []
+    seen = set()
+    for adapter in _session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            # urllib3 pre-fills the queue with None placeholders for connections not yet opened
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0
+            hosts.append({
+                "scheme": pool.scheme,
+                "host": pool.host,
+                "port": pool.port,
+                "connections_opened": pool.num_connections,
+                "requests_sent": pool.num_requests,
+                "idle_connections": idle,
+                "max_connections": pool.pool.maxsize if pool.pool is not None else 0,
+            })
+    return {"hosts": hosts}
+
+
+def publish_pool_metrics():
+    """
+    Sets the connection-pool gauges of every host the shared session has talked to,
+    so they are exported with the rest of the metrics.
+    """
+    for pool in get_pool_stats()["hosts"]:
+        host = f"{pool['scheme']}://{pool['host']}:{pool['port']}"
+        metrics.set_gauge("http_pool_connections_opened", pool["connections_opened"], host=host)
+        metrics.set_gauge("http_pool_requests_sent", pool["requests_sent"], host=host)
+        metrics.set_gauge("http_pool_idle_connections", pool["idle_connections"], host=host)
+        metrics.set_gauge("http_pool_max_connections", pool["max_connections"], host=host)
@@ -0,0 +1,30 @@
+"""
+Persistent cache of parsed LinkedIn job details, keyed by job ID.
+"""
+import threading
+from typing import Optional
+
+from app.core.config import settings
+from app.utils.cache import SQLiteCache
+
+_job_detail_cache: Optional[SQLiteCache] = None
+_lock = threading.Lock()
+
+
+def get_job_detail_cache() -> Optional[SQLiteCache]:
+    """
+    Returns the shared job-detail cache, or None when caching is disabled.
+    """
+    global _job_detail_cache
+    if not settings.JOB_CACHE_ENABLED:
+        return None
+    if _job_detail_cache is None:
+        with _lock:
+            if _job_detail_cache is None:
+                _job_detail_cache = SQLiteCache(
+                    path=settings.CACHE_DB_PATH,
+                    namespace="job_details",
+                    ttl_seconds=settings.JOB_CACHE_TTL_SECONDS,
+                    max_entries=settings.JOB_CACHE_MAX_ENTRIES,
+                )
+    return _job_detail_cache
@@ -1,53 +1,51 @@
 import os
 import requests
 import json
+from typing import Optional, Tuple
 from urllib.parse import quote
 
+import httpx
 from dotenv import load_dotenv
 
+from app.core.config import settings
 from app.core.logger import get_logger
+from app.models.job import Job
+from app.services import http_client
 
 load_dotenv()
 
 logger = get_logger(__name__)
 
 
-def get_linkedin_jobs(keywords: list, count: int = 25, start: int = 0, posted_hours: int = 12):
-    """
-    Fetches job listings from LinkedIn's internal API based on a list of keywords.
+MISSING_CREDENTIALS_ERROR = {
+    "error": "Environment variables not set.",
+    "message": "Please set 'LINKEDIN_COOKIE' and 'CSRF_TOKEN' environment variables."
+}
+JOB_DETAILS_PARAMS = {
+    'decorationId': 'com.linkedin.voyager.deco.jobs.web.shared.WebLightJobPosting-23',
+}
 
-    This function requires two environment variables to be set for authentication:
-    - LINKEDIN_COOKIE: The full cookie string from your browser session.
-    - CSRF_TOKEN: The 'csrf-token' value, which is often the same as the JSESSIONID value.
-
-    Args:
-        keywords: A list of strings representing the job keywords to search for.
-        count: The number of job listings to retrieve (default is 25).
-        start: The starting index for pagination (default is 0).
-        posted_hours: The number of hours to filter job postings (default is 1).
 
-    Returns:
-        A dictionary containing the API response (job data) or an error message.
+def _load_credentials() -> Optional[Tuple[str, str]]:
+    """
+    Returns the (cookie, csrf_token) pair from the environment, or None if either is missing.
     """
-    # 1. Load authentication details from environment variables
     cookie = os.getenv("LINKEDIN_COOKIE")
     csrf_token = os.getenv("CSRF_TOKEN")
-
     if not cookie or not csrf_token:
-        return {
-            "error": "Environment variables not set.",
-            "message": "Please set 'LINKEDIN_COOKIE' and 'CSRF_TOKEN' environment variables."
-        }
+        return None
+    return cookie, csrf_token
 
-    # 2. Format and URL-encode the keywords string.
+
+def _build_search_url(keywords: list, count: int, start: int, posted_hours: int) -> str:
+    # 1. Format and URL-encode the keywords string.
     # This is the only part of the 'variables' parameter that needs encoding.
     # quote() uses %20 for spaces, which matches the original request.
     keywords_string = ", ".join(keywords)
     encoded_keywords = quote(keywords_string)
     posted_seconds = posted_hours * 60 * 60
 
-
-    # 3. Construct the 'variables' parameter value using the function arguments.
+    # 2. Construct the 'variables' parameter value using the function arguments.
     # We insert the pre-encoded keywords string here. The parentheses and colons
     # will be passed as literal characters because we will build the URL manually.
     # The order of keys inside 'query' has also been matched to the working curl command.
@@ -59,38 +57,64 @@ def get_linkedin_jobs(keywords: list, count: int = 25, start: int = 0, posted_ho
         f"keywords:{encoded_keywords}),start:{start})"
     )
 
-    # 4. Define the other parameters and the base URL
-    base_url = "https://www.linkedin.com/voyager/api/graphql"
+    # 3. Define the other parameters and the base URL
+    base_url = f"{settings.LINKEDIN_BASE_URL}/voyager/api/graphql"
     query_id_param_value = "voyagerJobsDashJobCards.909b0d446794dad30bb8a39a7f8997a4"
 
-    # 5. Manually construct the full URL.
+    # 4. Manually construct the full URL.
     # This prevents the `requests` library from automatically (and incorrectly)
     # encoding the special characters in the 'variables' parameter.
-    url = f"{base_url}?variables={variables_param_value}&queryId={query_id_param_value}"
-
-    # 6. Set up the necessary headers, mimicking the browser
-    headers = {
-        'accept': 'application/vnd.linkedin.normalized+json+2.1',
-        'accept-language': 'en-US,en;q=0.9',
-        'cookie': cookie,
-        'csrf-token': csrf_token,
-        'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
-        'x-restli-protocol-version': '2.0.0',
-        'referer': 'https://www.linkedin.com/jobs/search/',
-        'sec-ch-ua': '"Not;A=Brand";v="99", "Google Chrome";v="139", "Chromium";v="139"',
-        'sec-ch-ua-mobile': '?0',
-        'sec-ch-ua-platform': '"macOS"',
-        'sec-fetch-dest': 'empty',
-        'sec-fetch-mode': 'cors',
-        'sec-fetch-site': 'same-origin',
-    }
+    return f"{base_url}?variables={variables_param_value}&queryId={query_id_param_value}"
+
+
+def _job_details_url(job_id: str) -> str:
+    return f"{settings.LINKEDIN_BASE_URL}/voyager/api/jobs/jobPostings/{job_id}"
 
-    # 7. Make the GET request and handle the response
+
+def _http_error(response) -> dict:
+    return {"error": "HTTP Error", "message": f"{response.status_code} error for url: {response.url}",
+            "status_code": response.status_code, "response_text": response.text}
+
+
+def _json_error(response) -> dict:
+    return {"error": "JSON Decode Error", "message": "Failed to parse response from LinkedIn.",
+            "response_text": response.text}
+
+
+def get_linkedin_jobs(keywords: list, count: int = 25, start: int = 0, posted_hours: int = 12):
+    """
+    Fetches job listings from LinkedIn's internal API based on a list of keywords.
+
+    This function requires two environment variables to be set for authentication:
+    - LINKEDIN_COOKIE: The full cookie string from your browser session.
+    - CSRF_TOKEN: The 'csrf-token' value, which is often the same as the JSESSIONID value.
+
+    Args:
+        keywords: A list of strings representing the job keywords to search for.
+        count: The number of job listings to retrieve (default is 25).
+        start: The starting index for pagination (default is 0).
+        posted_hours: The number of hours to filter job postings (default is 1).
+
+    Returns:
+        A dictionary containing the API response (job data) or an error message.
+    """
+    # 1. Load authentication details from environment variables
+    credentials = _load_credentials()
+    if credentials is None:
+        return dict(MISSING_CREDENTIALS_ERROR)
+
+    # 2. Build the search URL by hand, with only the keywords encoded
+    url = _build_search_url(keywords, count, start, posted_hours)
+
+    # 3. Use the pre-built browser-like headers for the search endpoint
+    headers = http_client.get_headers("linkedin_search", *credentials)
+
+    # 4. Make the GET request and handle the response
     try:
         # We pass the fully constructed URL and no 'params' dictionary
-        response = requests.get(url, headers=headers)
+        response = http_client.get(url, "linkedin_search", headers=headers)
         response.raise_for_status()
-        return response.json()
+        return http_client.decode_json(response)
 
     except requests.exceptions.HTTPError as http_err:
         return {"error": "HTTP Error", "message": str(http_err), "status_code": response.status_code,
@@ -98,8 +122,33 @@ def get_linkedin_jobs(keywords: list, count: int = 25, start: int = 0, posted_ho
     except requests.exceptions.RequestException as req_err:
         return {"error": "Request Exception", "message": str(req_err)}
     except json.JSONDecodeError:
-        return {"error": "JSON Decode Error", "message": "Failed to parse response from LinkedIn.",
-                "response_text": response.text}
+        return _json_error(response)
+
+
+async def aget_linkedin_jobs(keywords: list, count: int = 25, start: int = 0, posted_hours: int = 12):
+    """
+    Async counterpart of get_linkedin_jobs(), using the shared async HTTP client.
+
+    Returns:
+        A dictionary containing the API response (job data) or an error message.
+    """
+    credentials = _load_credentials()
+    if credentials is None:
+        return dict(MISSING_CREDENTIALS_ERROR)
+
+    url = _build_search_url(keywords, count, start, posted_hours)
+    headers = http_client.get_headers("linkedin_search", *credentials)
+    try:
+        response = await http_client.aget(url, "linkedin_search", headers=headers)
+        if response.is_error:
+            return _http_error(response)
+        return http_client.decode_json(response)
+
+    # UpstreamThrottledError is raised by the shared limiter, before any request is sent
+    except (httpx.HTTPError, requests.exceptions.RequestException) as req_err:
+        return {"error": "Request Exception", "message": str(req_err)}
+    except json.JSONDecodeError:
+        return _json_error(response)
 
 
 def parse_job_data(response_data: dict):
@@ -118,21 +167,24 @@ def parse_job_data(response_data: dict):
         print(f"Cannot parse data due to API error: {response_data.get('message')}")
         return jobs_list
 
-    try:
-        # Navigate through the nested JSON to find the list of job elements
-        elements = response_data['data']['data']['jobsDashJobCardsBySemanticSearch']['elements']
-        for element in elements:
-            # The actual job card data is nested within the element
-            try:
-                job_url = element['jobCard']['jobPostingCardWrapper']['jobTrackingData']['navigationAction']['actionTarget']
-                jobs_list.append(job_url)
-            except (KeyError, TypeError):
-                continue
-
-
+    # Navigate through the nested JSON to find the list of job elements
+    search_results = (response_data.get('data') or {}).get('data') or {}
+    results = search_results.get('jobsDashJobCardsBySemanticSearch')
+    if not isinstance(results, dict):
+        print("Error parsing response JSON. The structure might have changed: no job cards found.")
+        return jobs_list
 
-    except (KeyError, TypeError) as e:
-        print(f"Error parsing response JSON. The structure might have changed. Details: {e}")
+    for element in results.get('elements') or ():
+        # The actual job card data is nested within the element
+        if not isinstance(element, dict):
+            continue
+        job_card = element.get('jobCard') or {}
+        wrapper = job_card.get('jobPostingCardWrapper') or {}
+        tracking_data = wrapper.get('jobTrackingData') or {}
+        navigation_action = tracking_data.get('navigationAction') or {}
+        job_url = navigation_action.get('actionTarget')
+        if job_url:
+            jobs_list.append(job_url)
 
     return jobs_list
 
@@ -145,7 +197,7 @@ def parse_job_id_from_urls(urls : list):
         job_ids.append((job_id, url))
     return job_ids
 
-def get_linkedin_job_details(job_id: str):
+def get_linkedin_job_details(job_id: str, timeout: float = None):
     """
     Fetches job details from the LinkedIn API based on a job ID.
 
@@ -155,43 +207,28 @@ def get_linkedin_job_details(job_id: str):
 
     Args:
         job_id: A string representing the unique ID of the job posting.
+        timeout: Optional request timeout in seconds (default is settings.HTTP_TIMEOUT_SECONDS).
 
     Returns:
         A dictionary containing the API response (job data) or an error message.
     """
     # 1. Load authentication details from environment variables
-    cookie = os.getenv("LINKEDIN_COOKIE")
-    csrf_token = os.getenv("CSRF_TOKEN")
+    credentials = _load_credentials()
+    if credentials is None:
+        return dict(MISSING_CREDENTIALS_ERROR)
 
-    if not cookie or not csrf_token:
-        return {
-            "error": "Environment variables not set.",
-            "message": "Please set 'LINKEDIN_COOKIE' and 'CSRF_TOKEN' environment variables."
-        }
-
-    # 2. Define the API endpoint URL and query parameters
-    base_url = "https://www.linkedin.com/voyager/api/jobs/jobPostings/"
-    url = f"{base_url}{job_id}"
-    params = {
-        'decorationId': 'com.linkedin.voyager.deco.jobs.web.shared.WebLightJobPosting-23',
-    }
+    # 2. Define the API endpoint URL; the query parameters are fixed
+    url = _job_details_url(job_id)
 
-    # 3. Set up the necessary headers to mimic a browser request
-    headers = {
-        'accept': 'application/vnd.linkedin.normalized+json+2.1',
-        'accept-language': 'en-US,en;q=0.9,hi;q=0.8',
-        'cookie': cookie,
-        'csrf-token': csrf_token,
-        'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36',
-        'x-li-lang': 'en_US',
-        'x-restli-protocol-version': '2.0.0'
-    }
+    # 3. Use the pre-built browser-like headers for the job details endpoint
+    headers = http_client.get_headers("linkedin_job_details", *credentials)
 
     # 4. Make the GET request and handle the response
     try:
-        response = requests.get(url, headers=headers, params=params)
+        response = http_client.get(url, "linkedin_job_details", headers=headers, params=JOB_DETAILS_PARAMS,
+                                   timeout=timeout)
         response.raise_for_status()
-        return response.json()
+        return http_client.decode_json(response)
 
     except requests.exceptions.HTTPError as http_err:
         return {"error": "HTTP Error", "message": str(http_err), "status_code": response.status_code,
@@ -199,71 +236,101 @@ def get_linkedin_job_details(job_id: str):
     except requests.exceptions.RequestException as req_err:
         return {"error": "Request Exception", "message": str(req_err)}
     except json.JSONDecodeError:
-        return {"error": "JSON Decode Error", "message": "Failed to parse response from LinkedIn.",
-                "response_text": response.text}
+        return _json_error(response)
 
 
-def parse_job_json_response(json_response: dict):
+async def aget_linkedin_job_details(job_id: str, timeout: float = None):
+    """
+    Async counterpart of get_linkedin_job_details(), using the shared async HTTP client.
+
+    Returns:
+        A dictionary containing the API response (job data) or an error message.
+    """
+    credentials = _load_credentials()
+    if credentials is None:
+        return dict(MISSING_CREDENTIALS_ERROR)
+
+    headers = http_client.get_headers("linkedin_job_details", *credentials)
+    try:
+        response = await http_client.aget(_job_details_url(job_id), "linkedin_job_details", headers=headers,
+                                          params=JOB_DETAILS_PARAMS, timeout=timeout)
+        if response.is_error:
+            return _http_error(response)
+        return http_client.decode_json(response)
+
+    except (httpx.HTTPError, requests.exceptions.RequestException) as req_err:
+        return {"error": "Request Exception", "message": str(req_err)}
+    except json.JSONDecodeError:
+        return _json_error(response)
+
+
+def parse_job_json_response(json_response: dict, job_id: str = None):
     """
     Parses a JSON response from the LinkedIn job details API to extract specific fields.
 
     Args:
         json_response: A dictionary containing the JSON response from the API.
+        job_id: The ID of the job posting the response belongs to, if known.
 
     Returns:
-        A dictionary with the requested job details or None if data is not found.
+        A Job record with the requested job details or None if data is not found.
     """
     if not isinstance(json_response, dict) or "data" not in json_response:
-        return {"error": "Invalid JSON response format."}
+        logger.warning("Invalid JSON response format.")
+        return None
 
     job_data = json_response['data']
 
+    # Resolve every referenced entity in a single pass over 'included'.
+    # Only the URNs this parser needs are indexed, and the scan stops as
+    # soon as all of them have been found.
+    workplace_types = job_data.get('workplaceTypes')
+    workplace_type_urn = workplace_types[0] if workplace_types else None
+    company_details = job_data.get('companyDetails')
+    company_urn = company_details.get('company') if company_details else None
+    wanted_urns = {urn for urn in (workplace_type_urn, company_urn) if urn is not None}
+
+    included_by_urn = {}
+    if wanted_urns:
+        for item in json_response.get('included') or ():
+            urn = item.get('entityUrn') if isinstance(item, dict) else None
+            if urn in wanted_urns and urn not in included_by_urn:
+                included_by_urn[urn] = item
+                if len(included_by_urn) == len(wanted_urns):
+                    break
+
     # Use .get() with a default value to avoid KeyError
     details = {
+        "job_id": job_id,
         "title": job_data.get('title'),
-        "formattedJobLocation": job_data.get('formattedLocation'),
-        "workRemoteAllowed": job_data.get('workRemoteAllowed'),
-        "listedAt": job_data.get('listedAt'),
-        "applyUrl": None,
-        "companyprofile": None,
-        "company-name": None,
-        "companyUniversalName": None,
-        "localizedName": None,
-        "jobInfo": None,
+        "formatted_job_location": job_data.get('formattedLocation'),
+        "work_remote_allowed": job_data.get('workRemoteAllowed'),
+        "listed_at": job_data.get('listedAt'),
+        "source": "linkedin",
     }
 
-    # Extract 'localizedName' from the 'included' list by matching the workplaceType urn
-    workplace_types = job_data.get('workplaceTypes', [])
-    if workplace_types and 'included' in json_response:
-        workplace_type_urn = workplace_types[0]
-        for item in json_response['included']:
-            if item.get('entityUrn') == workplace_type_urn:
-                details["localizedName"] = item.get('localizedName')
-                break
+    # Extract 'localizedName' from the entity referenced by the first workplaceType urn
+    workplace_type = included_by_urn.get(workplace_type_urn)
+    if workplace_type is not None:
+        details["localized_name"] = workplace_type.get('localizedName')
 
     # Handle nested data for company details
-    company_details = job_data.get('companyDetails', {})
-    if company_details:
-        company_urn = company_details.get('company')
-        for item in json_response.get('included', []):
-            if item.get('entityUrn') == company_urn:
-                details["companyprofile"] = item.get('url')
-                details["company-name"] = item.get('name')
-                details["companyUniversalName"] = item.get('universalName')
-                break
+    company = included_by_urn.get(company_urn)
+    if company is not None:
+        details["company_profile"] = company.get('url')
+        details["company_name"] = company.get('name')
+        details["company_universal_name"] = company.get('universalName')
 
     # Extract easyApplyUrl or companyApplyUrl
-    apply_method = job_data.get('applyMethod', {})
+    apply_method = job_data.get('applyMethod')
     if apply_method:
-        details["applyUrl"] = apply_method.get('easyApplyUrl') or apply_method.get('companyApplyUrl')
+        details["apply_url"] = apply_method.get('easyApplyUrl') or apply_method.get('companyApplyUrl')
 
     # Extract and clean job description
-    description_obj = job_data.get('description', {})
+    description_obj = job_data.get('description')
     if description_obj:
         raw_text = description_obj.get('text', '')
         cleaned_text = raw_text.replace(r'\n', '\n').replace(r'\uD83E\uDDE0', '').strip()
-        details["jobInfo"] = cleaned_text
-
-    return details
-
+        details["job_info"] = cleaned_text
 
+    return Job(**details)
@@ -1,32 +1,187 @@
+import math
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+
 import fitz
 
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Page-level timings are small; use finer buckets than the request-level defaults
+PAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _build_pdf_pool() -> ProcessPoolExecutor:
+    # Workers are started from a clean server process rather than forked from the
+    # app, which would copy its threads' locks and open connections mid-use
+    return ProcessPoolExecutor(
+        max_workers=settings.PDF_PROCESS_WORKERS,
+        mp_context=multiprocessing.get_context(settings.PDF_PROCESS_START_METHOD),
+    )
+
+
+def get_pdf_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Returns the shared PDF extraction process pool, or None when extraction runs in-process.
+    """
+    global _pool
+    if settings.PDF_PROCESS_WORKERS <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _build_pdf_pool()
+    return _pool
+
+
+def init_pdf_pool() -> Optional[ProcessPoolExecutor]:
+    """
+    Creates the process-wide PDF pool, replacing any previous one, so the first upload
+    does not pay for starting the workers.
+    """
+    global _pool
+    shutdown_pdf_pool()
+    if settings.PDF_PROCESS_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        _pool = _build_pdf_pool()
+    return _pool
+
+
+def shutdown_pdf_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+def _read_pages(pdf_document, start: int, stop: int) -> List[Tuple[str, float]]:
+    pages = []
+    for page_number in range(start, stop):
+        started = time.perf_counter()
+        text = pdf_document[page_number].get_text("text")
+        pages.append((text, time.perf_counter() - started))
+    return pages
+
+
+def _extract_short_document(file_bytes: bytes, max_pages: int, parallel_min_pages: int,
+                            workers: int) -> Tuple[int, Optional[List[Tuple[str, float]]]]:
+    """
+    Counts the pages and, for a document short enough to parse as one range, extracts it
+    in the same open, returning (page_count, [(text, seconds), ...]). The pages are None
+    when the document is over max_pages or long enough to be split. Runs inside a worker process.
+    """
+    with fitz.open(stream=file_bytes, filetype="pdf") as pdf_document:
+        page_count = pdf_document.page_count
+        if page_count > max_pages or len(_page_ranges(page_count, parallel_min_pages, workers)) > 1:
+            return page_count, None
+        return page_count, _read_pages(pdf_document, 0, page_count)
+
+
+def _extract_page_range(file_bytes: bytes, start: int, stop: int) -> List[Tuple[str, float]]:
+    """
+    Extracts the text of pages [start, stop), returning (text, seconds) for each page.
+    The range comes from the page count found by the first task, so it is not counted again.
+    Runs inside a worker process.
+    """
+    with fitz.open(stream=file_bytes, filetype="pdf") as pdf_document:
+        return _read_pages(pdf_document, start, stop)
+
+
+def _page_ranges(page_count: int, parallel_min_pages: int, workers: int) -> List[Tuple[int, int]]:
+    """
+    Splits a document into contiguous page ranges, one per worker, for long documents.
+    Takes the settings as arguments, since worker processes may not share the parent's.
+    """
+    if page_count < parallel_min_pages or workers <= 1:
+        return [(0, page_count)]
+    chunk_size = math.ceil(page_count / workers)
+    return [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+
+
 def process_pdf(file_bytes: bytes) -> str:
     """
     Parses a PDF file from bytes and extracts its text content.
 
+    Extraction runs in a process pool so that parsing never holds the request
+    thread's GIL, and long documents are split into page ranges that are parsed
+    in parallel. Oversized uploads and documents are rejected up front.
+
+    On a timeout the request fails at once, but a worker that is mid-parse
+    cannot be stopped: it runs to completion in a retired pool.
+
     Args:
         file_bytes: The content of the PDF file as bytes.
 
     Returns:
         The extracted text as a single string.
     """
-    try:
-        # Open the PDF from the byte stream
-        pdf_document = fitz.open(stream=file_bytes, filetype="pdf")
+    if len(file_bytes) > settings.MAX_UPLOAD_BYTES:
+        raise ValueError(f"The PDF exceeds the maximum upload size of {settings.MAX_UPLOAD_BYTES} bytes.")
 
-        full_text = []
-        # Iterate through each page of the document
-        for page in pdf_document:
-            full_text.append(page.get_text("text"))
+    started = time.perf_counter()
+    pool = get_pdf_pool()
+    split = (settings.MAX_PDF_PAGES, settings.PDF_PARALLEL_MIN_PAGES, settings.PDF_PROCESS_WORKERS)
+    try:
+        if pool is None:
+            page_count, pages = _extract_short_document(file_bytes, *split)
+        else:
+            deadline = started + settings.PDF_EXTRACTION_TIMEOUT_SECONDS
+            page_count, pages = pool.submit(_extract_short_document, file_bytes, *split).result(
+                timeout=settings.PDF_EXTRACTION_TIMEOUT_SECONDS
+            )
 
-        pdf_document.close()
+        if page_count > settings.MAX_PDF_PAGES:
+            raise ValueError(f"The PDF has {page_count} pages; the limit is {settings.MAX_PDF_PAGES}.")
 
-        return "\n".join(full_text)
+        ranges = _page_ranges(page_count, settings.PDF_PARALLEL_MIN_PAGES, settings.PDF_PROCESS_WORKERS)
+        if pages is not None:
+            chunks = [pages]
+        else:
+            # Only long documents get here, and only with a pool: parse their ranges in parallel
+            futures = [pool.submit(_extract_page_range, file_bytes, start, stop) for start, stop in ranges]
+            chunks = [future.result(timeout=max(0.0, deadline - time.perf_counter())) for future in futures]
+    except ValueError:
+        raise
+    except FuturesTimeoutError:
+        # A running worker cannot be interrupted and keeps parsing until it finishes; replace
+        # the pool so later uploads do not queue behind it (its workers exit once done)
+        shutdown_pdf_pool()
+        metrics.inc("pdf_extraction_failures_total", reason="timeout")
+        raise ValueError("Timed out while parsing the provided PDF file.")
+    except BrokenProcessPool as e:
+        # A worker died (e.g. on a malformed document); start a fresh pool for the next request
+        logger.error(f"PDF worker process failed: {e}")
+        shutdown_pdf_pool()
+        metrics.inc("pdf_extraction_failures_total", reason="worker_crash")
+        raise ValueError("Failed to parse the provided PDF file.")
     except Exception as e:
         # If any error occurs during parsing, we raise an exception
         # that the API layer can catch and handle.
-        print(f"An error occurred during PDF parsing: {e}")
+        logger.error(f"An error occurred during PDF parsing: {e}")
+        metrics.inc("pdf_extraction_failures_total", reason="parse_error")
         raise ValueError("Failed to parse the provided PDF file.")
 
+    full_text = []
+    for chunk in chunks:
+        for text, seconds in chunk:
+            full_text.append(text)
+            metrics.observe("pdf_page_extract_seconds", seconds, buckets=PAGE_BUCKETS)
 
+    elapsed = time.perf_counter() - started
+    metrics.observe("pdf_document_extract_seconds", elapsed)
+    metrics.observe("pdf_document_pages", page_count, buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500))
+    logger.info(f"Extracted {page_count} pages in {len(ranges)} range(s) in {elapsed * 1000:.0f} ms.")
 
+    return "\n".join(full_text)
@@ -0,0 +1,177 @@
+"""
+Background prefetching of the next results page.
+
+Prefetches run on a small dedicated pool, are dropped when the pool is busy,
+only start while every upstream's shared rate-limit bucket is above its
+reserve, and stop early whenever a foreground request is fetching, so they
+only use otherwise idle capacity. Prefetched pages live in a short-lived store and are
+handed over (and removed) on the first matching foreground request.
+"""
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Hashable, List, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from app.core.tracing import submit_with_context
+from app.services.http_client import get_rate_limiter
+
+logger = get_logger(__name__)
+
+_foreground_lock = threading.Lock()
+_foreground_count = 0
+
+
+@contextmanager
+def foreground_activity():
+    """
+    Marks a foreground fetch as in progress; running prefetches back off while it lasts.
+    """
+    global _foreground_count
+    with _foreground_lock:
+        _foreground_count += 1
+    try:
+        yield
+    finally:
+        with _foreground_lock:
+            _foreground_count -= 1
+
+
+def foreground_busy() -> bool:
+    return _foreground_count > 0
+
+
+def spare_rate_budget() -> bool:
+    """
+    Returns whether every rate-limited endpoint holds more tokens than the prefetch
+    reserve (settings.PREFETCH_RATE_LIMIT_RESERVE of its burst), so speculative
+    requests never take the tokens foreground requests are about to need.
+
+    Checked once, before a prefetch starts: the prefetch's own requests drain the
+    same buckets, and must not read as foreground pressure that cancels it halfway.
+    """
+    for endpoint in settings.RATE_LIMIT_RATES:
+        limiter = get_rate_limiter(endpoint)
+        if limiter is not None and limiter.available() < settings.PREFETCH_RATE_LIMIT_RESERVE * limiter.burst + 1:
+            return False
+    return True
+
+
+class PagePrefetcher:
+    def __init__(self, ttl_seconds: float, max_pending: int, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_pending = max_pending
+        self.max_entries = max_entries
+        self._executor = ThreadPoolExecutor(max_workers=max_pending, thread_name_prefix="prefetch")
+        self._pages: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._pending: Dict[Hashable, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, key: Hashable, loader: Callable[[Callable[[], bool]], Optional[List[Dict]]]) -> bool:
+        """
+        Starts prefetching a page in the background unless it is already stored,
+        already in flight, or the prefetch budget is used up.
+
+        Args:
+            key: The canonical search key of the page.
+            loader: Produces the page. It receives a `should_stop` callable and must
+                return early (with None) once it returns True.
+
+        Returns:
+            True if a prefetch was started.
+        """
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl_seconds:
+                return False
+            if key in self._pending or len(self._pending) >= self.max_pending:
+                return False
+            cancel_event = threading.Event()
+            self._pending[key] = cancel_event
+
+        submit_with_context(self._executor, self._run, key, loader, cancel_event)
+        metrics.inc("prefetch_total", result="scheduled")
+        return True
+
+    def _run(self, key: Hashable, loader, cancel_event: threading.Event):
+        def should_stop() -> bool:
+            return cancel_event.is_set() or foreground_busy()
+
+        try:
+            if should_stop():
+                metrics.inc("prefetch_total", result="cancelled")
+                return
+            # The page may have queued behind another prefetch; check the budget it is about to spend from
+            if not spare_rate_budget():
+                metrics.inc("prefetch_total", result="rate_limited")
+                return
+            started = time.perf_counter()
+            page = loader(should_stop)
+            if page is None or should_stop():
+                metrics.inc("prefetch_total", result="cancelled")
+                return
+            with self._lock:
+                self._pages[key] = (page, time.monotonic())
+                self._pages.move_to_end(key)
+                while len(self._pages) > self.max_entries:
+                    self._pages.popitem(last=False)
+            metrics.inc("prefetch_total", result="stored")
+            logger.info(f"Prefetched {len(page)} jobs in {(time.perf_counter() - started) * 1000:.0f} ms.")
+        except Exception as e:
+            metrics.inc("prefetch_total", result="error")
+            logger.warning(f"Prefetch failed: {e}")
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def take(self, key: Hashable) -> Optional[List[Dict]]:
+        """
+        Returns and removes a prefetched page if one is stored and still fresh.
+        """
+        with self._lock:
+            entry = self._pages.pop(key, None)
+        if entry is None or time.monotonic() - entry[1] >= self.ttl_seconds:
+            return None
+        metrics.inc("prefetch_total", result="used")
+        return entry[0]
+
+    def cancel(self, key: Hashable):
+        with self._lock:
+            cancel_event = self._pending.get(key)
+        if cancel_event is not None:
+            cancel_event.set()
+
+    def cancel_all(self):
+        with self._lock:
+            events = list(self._pending.values())
+        for cancel_event in events:
+            cancel_event.set()
+
+    def shutdown(self):
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_prefetcher: Optional[PagePrefetcher] = None
+_lock = threading.Lock()
+
+
+def get_prefetcher() -> Optional[PagePrefetcher]:
+    """
+    Returns the shared prefetcher, or None when prefetching is disabled.
+    """
+    global _prefetcher
+    if not settings.PREFETCH_ENABLED:
+        return None
+    if _prefetcher is None:
+        with _lock:
+            if _prefetcher is None:
+                _prefetcher = PagePrefetcher(
+                    ttl_seconds=settings.PREFETCH_TTL_SECONDS,
+                    max_pending=settings.PREFETCH_MAX_PENDING,
+                )
+    return _prefetcher
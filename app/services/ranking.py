@@ -0,0 +1,103 @@
+"""
+Deterministic BM25 relevance ranking of fetched jobs against the candidate's skills.
+
+Every job is scored in one batch: term frequencies for the query terms are laid
+out as a (jobs x terms) matrix and BM25 is evaluated with NumPy array operations.
+The title is weighted above the description (a simple BM25F), and skills are
+also matched through the taxonomy so "NodeJS" in a posting counts for "Node.js".
+"""
+import dataclasses
+from typing import List, Sequence
+
+import numpy as np
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services.skill_extractor import get_skill_matcher, is_experience_label, tokenize
+
+# Prefix for canonical taxonomy skills, so they never collide with raw tokens
+_CANONICAL_PREFIX = "@"
+
+
+def _with_canonical_terms(tokens: List[str], include_ambiguous: bool) -> List[str]:
+    canonical = [
+        _CANONICAL_PREFIX + skill
+        for _, _, skill, ambiguous in get_skill_matcher().find(tokens)
+        if include_ambiguous or not ambiguous
+    ]
+    return tokens + canonical
+
+
+def query_terms(skills: Sequence[str]) -> List[str]:
+    """
+    Returns the unique query terms for a skill list: raw tokens plus canonical skills.
+    """
+    terms = []
+    for skill in skills or []:
+        if is_experience_label(skill):
+            continue
+        # The skill list is explicit, so short names like "Go" are trusted here
+        terms.extend(_with_canonical_terms(tokenize(skill), include_ambiguous=True))
+    return list(dict.fromkeys(terms))
+
+
+def _term_frequencies(texts: Sequence[str], term_index: dict) -> tuple:
+    """
+    Returns the (documents x terms) frequency matrix and each document's length in tokens.
+    """
+    frequencies = np.zeros((len(texts), len(term_index)), dtype=np.float64)
+    lengths = np.zeros(len(texts), dtype=np.float64)
+    for row, text in enumerate(texts):
+        tokens = tokenize(text or "")
+        lengths[row] = len(tokens)
+        for term in _with_canonical_terms(tokens, include_ambiguous=False):
+            column = term_index.get(term)
+            if column is not None:
+                frequencies[row, column] += 1
+    return frequencies, lengths
+
+
+def bm25_scores(skills: Sequence[str], titles: Sequence[str], descriptions: Sequence[str]) -> np.ndarray:
+    """
+    Scores each document (title + description) against the skills with BM25.
+
+    Returns:
+        A float array with one score per document; all zeros if no skill is usable.
+    """
+    terms = query_terms(skills)
+    if not terms or not titles:
+        return np.zeros(len(titles))
+
+    term_index = {term: column for column, term in enumerate(terms)}
+    title_tf, title_lengths = _term_frequencies(titles, term_index)
+    body_tf, body_lengths = _term_frequencies(descriptions, term_index)
+
+    weight = settings.RANK_TITLE_WEIGHT
+    tf = body_tf + weight * title_tf
+    lengths = body_lengths + weight * title_lengths
+    average_length = lengths.mean() or 1.0
+
+    n_docs = tf.shape[0]
+    document_frequency = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    k1, b = settings.RANK_BM25_K1, settings.RANK_BM25_B
+    norm = k1 * (1.0 - b + b * lengths / average_length)
+    saturated = tf * (k1 + 1.0) / (tf + norm[:, None])
+    return saturated @ idf
+
+
+def rank_jobs(skills: Sequence[str], jobs: Sequence[Job]) -> List[Job]:
+    """
+    Returns the jobs sorted by BM25 relevance (highest first) with relevance_score set.
+    Ties keep the upstream order.
+    """
+    if not jobs:
+        return []
+    scores = bm25_scores(
+        skills,
+        [job.title or "" for job in jobs],
+        [job.job_info or "" for job in jobs],
+    )
+    order = np.argsort(-scores, kind="stable")
+    return [dataclasses.replace(jobs[i], relevance_score=round(float(scores[i]), 4)) for i in order]
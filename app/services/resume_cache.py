@@ -0,0 +1,105 @@
+"""
+Content-addressed caches for resume processing.
+
+The first level maps a hash of the uploaded PDF bytes to the extracted text, so
+a repeat upload skips PyMuPDF. The second level maps a hash of the normalized
+text, the extraction prompt version and the model name to the parsed skills, so
+the same resume skips the LLM call. Changing the prompt changes its version and
+therefore every key, which invalidates old entries; they age out through LRU.
+"""
+import hashlib
+import re
+import threading
+from typing import List, Optional
+
+from app.core.config import settings
+from app.utils.cache import SQLiteCache
+
+_text_cache: Optional[SQLiteCache] = None
+_skills_cache: Optional[SQLiteCache] = None
+_lock = threading.Lock()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def hash_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapses whitespace and case so that trivially different extractions share a key.
+    """
+    return _WHITESPACE_RE.sub(" ", text or "").strip().lower()
+
+
+def prompt_version(*parts: str) -> str:
+    """
+    Returns a short fingerprint of a prompt's template text.
+    """
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def skills_cache_key(raw_text: str, prompt_version_id: str, model_name: str) -> str:
+    digest = hash_bytes(normalize_text(raw_text).encode("utf-8"))
+    return f"{prompt_version_id}:{model_name}:{digest}"
+
+
+def _build_cache(namespace: str) -> SQLiteCache:
+    return SQLiteCache(
+        path=settings.CACHE_DB_PATH,
+        namespace=namespace,
+        ttl_seconds=settings.RESUME_CACHE_TTL_SECONDS,
+        max_entries=settings.RESUME_CACHE_MAX_ENTRIES,
+    )
+
+
+def get_resume_text_cache() -> Optional[SQLiteCache]:
+    """
+    Returns the PDF-hash to text cache, or None when caching is disabled.
+    """
+    global _text_cache
+    if not settings.RESUME_CACHE_ENABLED:
+        return None
+    if _text_cache is None:
+        with _lock:
+            if _text_cache is None:
+                _text_cache = _build_cache("resume_text")
+    return _text_cache
+
+
+def get_resume_skills_cache() -> Optional[SQLiteCache]:
+    """
+    Returns the text-hash to skills cache, or None when caching is disabled.
+    """
+    global _skills_cache
+    if not settings.RESUME_CACHE_ENABLED:
+        return None
+    if _skills_cache is None:
+        with _lock:
+            if _skills_cache is None:
+                _skills_cache = _build_cache("resume_skills")
+    return _skills_cache
+
+
+def get_cached_skills(raw_text: str, prompt_version_id: str, model_name: str) -> Optional[List[str]]:
+    cache = get_resume_skills_cache()
+    if cache is None:
+        return None
+    return cache.get(skills_cache_key(raw_text, prompt_version_id, model_name))
+
+
+def cache_skills(raw_text: str, prompt_version_id: str, model_name: str, skills: List[str]):
+    cache = get_resume_skills_cache()
+    if cache is not None and skills:
+        cache.set(skills_cache_key(raw_text, prompt_version_id, model_name), skills)
+
+
+def invalidate_resume_caches(text: bool = False, skills: bool = True):
+    """
+    Drops cached entries explicitly, e.g. after a parser fix or a model change.
+    """
+    if text and get_resume_text_cache() is not None:
+        get_resume_text_cache().clear()
+    if skills and get_resume_skills_cache() is not None:
+        get_resume_skills_cache().clear()
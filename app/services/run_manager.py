@@ -0,0 +1,206 @@
+"""
+Background execution of graph runs for the submit/poll API.
+
+Runs are queued onto a bounded worker pool and their records (status, timings
+and result) are kept for a limited time in the shared SQLite cache database, so
+an HTTP request only has to wait for the submission to be accepted, and a poll
+can land on any worker process. The queue and its counters are per process.
+"""
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from app.core.tracing import current_trace_id, submit_with_context, trace_context
+from app.state.job_state import JobState, public_state
+from app.utils.cache import SQLiteCache
+from app.utils.serialization import dumps
+
+logger = get_logger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class QueueFullError(Exception):
+    """Raised when a run is submitted while the queue is at capacity."""
+
+
+class RunManager:
+    """
+    Runs graphs on a bounded worker pool and stores their records in `store`.
+
+    The store's TTL counts from a record's last update, so a finished run's
+    result is kept for the TTL after it finishes. Every worker process that opens
+    the same database sees every run.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, store: SQLiteCache):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.store = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="graph-run")
+        # Bounds queued + running runs so a burst cannot grow memory without limit
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._wait_total = 0.0
+        self._wait_count = 0
+
+    def submit(self, workflow, initial_state: JobState, kind: str) -> str:
+        """
+        Queues a graph run and returns its run ID.
+
+        Raises:
+            QueueFullError: if the queue is already at capacity.
+        """
+        if not self._slots.acquire(blocking=False):
+            metrics.inc("runs_rejected_total", kind=kind)
+            raise QueueFullError("The run queue is full. Please retry later.")
+
+        run_id = uuid.uuid4().hex
+        record = {
+            "run_id": run_id,
+            "kind": kind,
+            "status": QUEUED,
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+            "error_status_code": None,
+            "result": None,
+        }
+        self.store.set(run_id, record)
+        with self._lock:
+            self._queued += 1
+        self._publish_depth()
+        try:
+            submit_with_context(self._executor, self._execute, record, workflow, initial_state)
+        except RuntimeError:
+            self.store.delete(run_id)
+            with self._lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+        return run_id
+
+    def _execute(self, record: dict, workflow, initial_state: JobState):
+        started = time.time()
+        wait_seconds = started - record["submitted_at"]
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_total += wait_seconds
+            self._wait_count += 1
+        record.update(status=RUNNING, started_at=started)
+        self.store.set(record["run_id"], record)
+        self._publish_depth()
+        metrics.observe("run_queue_wait_seconds", wait_seconds, kind=record["kind"])
+
+        status, result, error, error_status_code = FAILED, None, None, None
+        # The submitting request's trace has already been logged, so the run gets its own under the same ID
+        with trace_context(current_trace_id()) as trace:
+            try:
+                final_state = public_state(workflow.invoke(initial_state))
+                # Stored as plain JSON (Jobs become their API dictionaries), like the synchronous responses
+                status, result = SUCCEEDED, json.loads(dumps(final_state))
+            except ValueError as e:
+                # Validation errors such as an unreadable PDF, mirroring the synchronous routes
+                error, error_status_code = str(e), 422
+            except Exception as e:
+                logger.error(f"Run {record['run_id']} failed: {e}")
+                error, error_status_code = "An unexpected error occurred on the server.", 500
+            finally:
+                logger.info(f"Run {record['run_id']} {status} {trace.summary()}")
+                finished = time.time()
+                record.update(status=status, result=result, error=error,
+                              error_status_code=error_status_code, finished_at=finished)
+                try:
+                    self.store.set(record["run_id"], record)
+                except Exception as e:
+                    logger.error(f"Could not store the result of run {record['run_id']}: {e}")
+                with self._lock:
+                    self._running -= 1
+                self._slots.release()
+                self._publish_depth()
+                metrics.observe("run_duration_seconds", finished - started, kind=record["kind"], status=status)
+
+    def _publish_depth(self):
+        metrics.set_gauge("run_queue_depth", self._queued)
+        metrics.set_gauge("runs_in_progress", self._running)
+
+    def get(self, run_id: str) -> Optional[dict]:
+        """
+        Returns the run record, or None if it is unknown or has expired. Runs submitted
+        to any worker process are found.
+        """
+        return self.store.get(run_id)
+
+    def stats(self) -> dict:
+        """
+        Returns this process's pool and queue figures, and the number of runs stored by all processes.
+        """
+        stored_runs = self.store.stats()["size"]
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queue_depth": self._queued,
+                "running": self._running,
+                "stored_runs": stored_runs,
+                "avg_wait_seconds": round(self._wait_total / self._wait_count, 4) if self._wait_count else 0.0,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_run_manager: Optional[RunManager] = None
+_lock = threading.Lock()
+
+
+def _build_run_manager() -> RunManager:
+    store = SQLiteCache(
+        path=settings.CACHE_DB_PATH,
+        namespace="runs",
+        ttl_seconds=settings.RUN_RESULT_TTL_SECONDS,
+        max_entries=settings.RUN_STORE_MAX_ENTRIES,
+    )
+    return RunManager(max_workers=settings.RUN_WORKERS, max_queue=settings.RUN_QUEUE_SIZE, store=store)
+
+
+def init_run_manager() -> RunManager:
+    """
+    Creates the process-wide run manager, replacing any previous one.
+    """
+    global _run_manager
+    with _lock:
+        if _run_manager is not None:
+            _run_manager.shutdown()
+        _run_manager = _build_run_manager()
+    return _run_manager
+
+
+def get_run_manager() -> RunManager:
+    global _run_manager
+    if _run_manager is None:
+        with _lock:
+            if _run_manager is None:
+                _run_manager = _build_run_manager()
+    return _run_manager
+
+
+def shutdown_run_manager():
+    global _run_manager
+    with _lock:
+        if _run_manager is not None:
+            _run_manager.shutdown()
+            _run_manager = None
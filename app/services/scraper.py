@@ -1,25 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote_plus
+
 import requests
-import logging
 from bs4 import BeautifulSoup
 
 from app.core.logger import get_logger
+from app.services import http_client
 
 logger = get_logger(__name__)
 
-def scrape_jobs(skills: list[str]) -> list[dict]:
-    jobs = []
-    for skill in skills:
-        url = f"https://www.indeed.com/jobs?q={skill}&l="
-        response = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
-        logger.info(f"Scraping {response}")
-        soup = BeautifulSoup(response.text, "html.parser")
+INDEED_BASE_URL = "https://www.indeed.com"
+
+
+def get_indeed_jobs(skill: str, limit: int = 5, timeout: float = None) -> list[dict]:
+    """
+    Searches Indeed for one skill and returns the top job cards.
 
-        for div in soup.find_all("div", class_="job_seen_beacon")[:5]:  # top 5 jobs
-            title = div.find("h2").text.strip() if div.find("h2") else "No title"
-            logger.info(f"title: {title}")
-            company = div.find("span", class_="companyName").text.strip() if div.find("span", class_="companyName") else "Unknown"
-            jobs.append({"skill": skill, "title": title, "company": company})
+    Args:
+        skill: The keyword to search for.
+        limit: The maximum number of cards to return.
+        timeout: Optional request timeout in seconds.
+
+    Returns:
+        A list of dictionaries with the skill, job key, title, company, location and URL.
+        Empty if the request failed.
+    """
+    url = f"{INDEED_BASE_URL}/jobs?q={quote_plus(skill)}&l="
+    try:
+        response = http_client.get(url, "indeed", timeout=timeout)
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Indeed search for '{skill}' failed: {e}")
+        return []
+
+    soup = BeautifulSoup(response.text, "html.parser")
+    jobs = []
+    for div in soup.find_all("div", class_="job_seen_beacon")[:limit]:
+        heading = div.find("h2")
+        link = heading.find("a") if heading else None
+        job_key = link.get("data-jk") if link else None
+        company = div.find("span", class_="companyName") or div.find("span", attrs={"data-testid": "company-name"})
+        location = div.find("div", class_="companyLocation") or div.find("div", attrs={"data-testid": "text-location"})
+        jobs.append({
+            "skill": skill,
+            "job_key": job_key,
+            "title": heading.text.strip() if heading else "No title",
+            "company": company.text.strip() if company else "Unknown",
+            "location": location.text.strip() if location else None,
+            "url": f"{INDEED_BASE_URL}/viewjob?jk={job_key}" if job_key else None,
+        })
+    logger.info(f"Indeed returned {len(jobs)} jobs for '{skill}'.")
+    return jobs
 
-        logger.info(f"jobs: {jobs}")
 
-    return jobs
\ No newline at end of file
+def scrape_jobs(skills: list[str], max_workers: int = 4) -> list[dict]:
+    """
+    Searches Indeed for every skill concurrently and returns the cards in skill order.
+    """
+    if not skills:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(skills)), thread_name_prefix="indeed") as executor:
+        results = executor.map(get_indeed_jobs, skills)
+        return [job for jobs in results for job in jobs]
@@ -0,0 +1,38 @@
+"""
+Stale-while-revalidate cache of parsed LinkedIn search results.
+"""
+import threading
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.utils.cache import StaleWhileRevalidateCache
+
+_search_cache: Optional[StaleWhileRevalidateCache] = None
+_lock = threading.Lock()
+
+
+def search_cache_key(skills: List[str], posted_hours: int, start: int, count: int) -> Tuple:
+    """
+    Builds the canonical cache key for a search, ignoring skill order and case.
+    """
+    canonical_skills = tuple(sorted({skill.strip().lower() for skill in skills if skill.strip()}))
+    return canonical_skills, posted_hours, start, count
+
+
+def get_search_cache() -> Optional[StaleWhileRevalidateCache]:
+    """
+    Returns the shared search-result cache, or None when caching is disabled.
+    """
+    global _search_cache
+    if not settings.SEARCH_CACHE_ENABLED:
+        return None
+    if _search_cache is None:
+        with _lock:
+            if _search_cache is None:
+                _search_cache = StaleWhileRevalidateCache(
+                    name="search_results",
+                    fresh_seconds=settings.SEARCH_CACHE_FRESH_SECONDS,
+                    stale_seconds=settings.SEARCH_CACHE_STALE_SECONDS,
+                    max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+                )
+    return _search_cache
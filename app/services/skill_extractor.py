@@ -0,0 +1,314 @@
+"""
+Local, LLM-free skill extraction against the curated taxonomy.
+
+Resume text is tokenized and scanned once with an Aho-Corasick automaton built
+over the tokenized surface forms of every skill, so multi-word terms such as
+"Spring Boot" or "continuous integration" are found in a single linear pass.
+Matches are weighted by the resume section they appear in and ranked by total
+weight. Total years of experience come from an explicit claim ("5+ years of
+experience") when there is one, and from the merged employment date ranges
+otherwise.
+"""
+import datetime
+import json
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.services.resume_cache import prompt_version
+from app.services.skill_taxonomy import AMBIGUOUS_TERMS, SKILL_TAXONOMY
+
+# Keeps "c++", "c#", "node.js", ".net" and "spring-boot" whole; drops sentence punctuation
+_TOKEN_RE = re.compile(r"\.?[a-z0-9](?:[a-z0-9+#.\-]*[a-z0-9+#])?")
+
+# Changes whenever the taxonomy changes, invalidating cached local results
+TAXONOMY_VERSION = prompt_version(json.dumps(SKILL_TAXONOMY, sort_keys=True), *sorted(AMBIGUOUS_TERMS))
+
+SECTION_HEADINGS = {
+    "skills": "skills",
+    "technical skills": "skills",
+    "key skills": "skills",
+    "core skills": "skills",
+    "core competencies": "skills",
+    "technologies": "skills",
+    "tech stack": "skills",
+    "tools": "skills",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment history": "experience",
+    "work history": "experience",
+    "projects": "projects",
+    "key projects": "projects",
+    "personal projects": "projects",
+    "summary": "summary",
+    "professional summary": "summary",
+    "profile": "summary",
+    "objective": "summary",
+    "about me": "summary",
+    "education": "education",
+    "certifications": "education",
+    "achievements": "education",
+}
+
+# Skills used on the job count for more than skills merely listed or studied
+SECTION_WEIGHTS = {
+    "experience": 2.0,
+    "projects": 1.5,
+    "skills": 1.5,
+    "summary": 1.25,
+    "education": 0.5,
+    None: 1.0,
+}
+
+_MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sept?|oct|nov|dec)[a-z]*\.?"
+_DATE_RANGE_RE = re.compile(
+    rf"(?:(?P<start_month>{_MONTH})\s+|(?P<start_num>\d{{1,2}})/)?(?P<start_year>(?:19|20)\d{{2}})"
+    r"\s*(?:-|–|—|to|till|until)\s*"
+    rf"(?:(?:(?P<end_month>{_MONTH})\s+|(?P<end_num>\d{{1,2}})/)?(?P<end_year>(?:19|20)\d{{2}})"
+    r"|(?P<ongoing>present|current|now|till date|date))",
+    re.IGNORECASE,
+)
+_EXPERIENCE_CLAIM_RES = (
+    re.compile(
+        r"(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\.?(?:\s+of)?(?:\s+[a-z/+#.\-]+){0,3}?\s+(?:experience|exp)\b",
+        re.IGNORECASE,
+    ),
+    re.compile(r"\b(?:experience|exp)\s*(?:of|:)?\s*(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b", re.IGNORECASE),
+)
+# Entries such as "3 years exp" describe experience, not a searchable skill
+_EXPERIENCE_LABEL_RE = re.compile(r"\d+(?:\.\d+)?\s*\+?\s*(?:years?|yrs?)\b", re.IGNORECASE)
+
+
+def is_experience_label(skill: str) -> bool:
+    return bool(_EXPERIENCE_LABEL_RE.search(skill or ""))
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    An Aho-Corasick automaton over token sequences.
+
+    Working on tokens rather than characters means a pattern can only match on
+    word boundaries, so "java" never matches inside "javascript".
+    """
+
+    def __init__(self, taxonomy: Dict[str, Iterable[str]], ambiguous_terms: Iterable[str] = ()):
+        ambiguous_terms = set(ambiguous_terms)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, int, bool]]] = [[]]
+
+        for canonical, synonyms in taxonomy.items():
+            for surface in {canonical, *synonyms}:
+                tokens = tokenize(surface)
+                if tokens:
+                    self._insert(tokens, canonical, " ".join(tokens) in ambiguous_terms)
+        self._build_failure_links()
+
+    def _insert(self, tokens: List[str], canonical: str, ambiguous: bool):
+        node = 0
+        for token in tokens:
+            next_node = self._goto[node].get(token)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][token] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append((canonical, len(tokens), ambiguous))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def find(self, tokens: List[str]) -> List[Tuple[int, int, str, bool]]:
+        """
+        Returns the leftmost-longest, non-overlapping matches as (start, end, canonical, ambiguous).
+        """
+        matches = []
+        node = 0
+        for i, token in enumerate(tokens):
+            while node and token not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(token, 0)
+            for canonical, length, ambiguous in self._out[node]:
+                matches.append((i - length + 1, i + 1, canonical, ambiguous))
+
+        # Prefer "spring boot" over "spring", then drop anything overlapping a kept match
+        matches.sort(key=lambda match: (match[0], match[0] - match[1]))
+        resolved = []
+        last_end = 0
+        for match in matches:
+            if match[0] >= last_end:
+                resolved.append(match)
+                last_end = match[1]
+        return resolved
+
+
+@lru_cache(maxsize=1)
+def get_skill_matcher() -> SkillMatcher:
+    return SkillMatcher(SKILL_TAXONOMY, AMBIGUOUS_TERMS)
+
+
+@dataclass(frozen=True)
+class SkillExtraction:
+    """
+    The ranked skills, estimated experience and supporting lines found in a resume.
+    """
+    skills: List[str]
+    years_of_experience: Optional[float] = None
+    scores: Dict[str, float] = field(default_factory=dict)
+    evidence: List[str] = field(default_factory=list)
+
+    def experience_label(self) -> Optional[str]:
+        if self.years_of_experience is None:
+            return None
+        return f"{self.years_of_experience:g} years exp"
+
+    def to_skill_list(self) -> List[str]:
+        """
+        Returns the skills in the same shape the LLM prompt asks for, experience last.
+        """
+        label = self.experience_label()
+        return self.skills + [label] if label else list(self.skills)
+
+
+def _section_heading(line: str) -> Tuple[Optional[str], str]:
+    """
+    Returns the section a line opens (if any) and the text that follows an inline "Heading:" prefix.
+    """
+    head, sep, rest = line.partition(":")
+    normalized = re.sub(r"[^a-z ]+", "", head.lower()).strip()
+    section = SECTION_HEADINGS.get(normalized)
+    if section is None and len(normalized.split()) <= 3:
+        last_word = normalized.rsplit(" ", 1)[-1] if normalized else ""
+        section = SECTION_HEADINGS.get(last_word)
+    if section is None:
+        return None, line
+    return section, rest if sep else ""
+
+
+def _month_index(year: str, month_name: Optional[str], month_number: Optional[str]) -> int:
+    month = 1
+    if month_name:
+        month = _MONTHS.get(month_name[:3].lower(), 1)
+    elif month_number and 1 <= int(month_number) <= 12:
+        month = int(month_number)
+    return int(year) * 12 + month - 1
+
+
+def _years_from_date_ranges(lines: Iterable[str], today: datetime.date) -> Optional[float]:
+    intervals = []
+    current = today.year * 12 + today.month - 1
+    for line in lines:
+        for match in _DATE_RANGE_RE.finditer(line):
+            start = _month_index(match["start_year"], match["start_month"], match["start_num"])
+            if match["ongoing"]:
+                end = current
+            else:
+                end = _month_index(match["end_year"], match["end_month"], match["end_num"])
+            if start < end <= current:
+                intervals.append((start, end))
+    if not intervals:
+        return None
+
+    # Merge overlapping roles so concurrent positions are not double-counted
+    intervals.sort()
+    total = 0
+    merged_start, merged_end = intervals[0]
+    for start, end in intervals[1:]:
+        if start <= merged_end:
+            merged_end = max(merged_end, end)
+        else:
+            total += merged_end - merged_start
+            merged_start, merged_end = start, end
+    total += merged_end - merged_start
+    return round(total / 12, 1)
+
+
+def extract_years_of_experience(text: str, experience_lines: Optional[List[str]] = None,
+                                today: Optional[datetime.date] = None) -> Optional[float]:
+    """
+    Estimates total professional experience in years.
+
+    Args:
+        text: The full resume text, searched for explicit claims.
+        experience_lines: Lines from the experience section, whose date ranges are
+            merged when there is no explicit claim. Defaults to every line.
+        today: The date that "Present" resolves to. Defaults to today.
+    """
+    claims = [float(match.group(1)) for regex in _EXPERIENCE_CLAIM_RES for match in regex.finditer(text)]
+    claims = [claim for claim in claims if 0 < claim <= 50]
+    if claims:
+        return max(claims)
+    lines = experience_lines if experience_lines else text.splitlines()
+    return _years_from_date_ranges(lines, today or datetime.date.today())
+
+
+def extract_skills_locally(text: str, top_k: int = 5) -> SkillExtraction:
+    """
+    Finds taxonomy skills in resume text and ranks them by section-weighted frequency.
+
+    Args:
+        text: The raw resume text.
+        top_k: The number of skills to return.
+
+    Returns:
+        A SkillExtraction with the top skills (most prominent first), the
+        estimated years of experience and the lines that mentioned a skill.
+    """
+    matcher = get_skill_matcher()
+    scores: Dict[str, float] = {}
+    first_seen: Dict[str, int] = {}
+    evidence: List[str] = []
+    experience_lines: List[str] = []
+    section = None
+
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        heading, line_text = _section_heading(line)
+        if heading is not None:
+            section = heading
+        if section == "experience":
+            experience_lines.append(line)
+
+        weight = SECTION_WEIGHTS.get(section, 1.0)
+        matched = False
+        for _, _, canonical, ambiguous in matcher.find(tokenize(line_text)):
+            if ambiguous and section != "skills":
+                continue
+            scores[canonical] = scores.get(canonical, 0.0) + weight
+            first_seen.setdefault(canonical, len(first_seen))
+            matched = True
+        if matched:
+            evidence.append(line)
+
+    ranked = sorted(scores, key=lambda skill: (-scores[skill], first_seen[skill]))
+    return SkillExtraction(
+        skills=ranked[:top_k],
+        years_of_experience=extract_years_of_experience(text or "", experience_lines),
+        scores={skill: scores[skill] for skill in ranked},
+        evidence=list(dict.fromkeys(evidence)),
+    )
@@ -0,0 +1,158 @@
+"""
+Curated skills taxonomy used by the local skill extractor.
+
+Each canonical skill name maps to the surface forms it appears under in resumes.
+The canonical name itself is always matched, so it does not need repeating.
+Surface forms are tokenized the same way as resume text, so punctuation such as
+"CI/CD" or "Node.js" only needs one spelling per distinct token sequence.
+"""
+
+SKILL_TAXONOMY = {
+    # Languages
+    "Python": ["python3"],
+    "Java": ["java8", "java 8", "java 11", "java 17", "core java"],
+    "JavaScript": ["js", "ecmascript", "es6", "vanilla js"],
+    "TypeScript": [],
+    "C": ["ansi c"],
+    "C++": ["cpp", "cplusplus"],
+    "C#": ["csharp", "c sharp"],
+    "Go": ["golang"],
+    "Rust": [],
+    "Kotlin": [],
+    "Swift": [],
+    "Objective-C": ["objective c", "objc"],
+    "Ruby": [],
+    "PHP": [],
+    "Scala": [],
+    "R": ["r programming", "rstudio"],
+    "MATLAB": [],
+    "Perl": [],
+    "Dart": [],
+    "Elixir": [],
+    "Haskell": [],
+    "Bash": ["shell scripting", "shell script", "bash scripting", "zsh"],
+    "PowerShell": [],
+    "SQL": ["t-sql", "tsql", "pl/sql", "plsql", "ansi sql"],
+
+    # Frontend
+    "React": ["react.js", "reactjs", "react js"],
+    "React Native": ["react-native"],
+    "Angular": ["angular.js", "angularjs", "angular js"],
+    "Vue.js": ["vue", "vuejs", "vue js"],
+    "Next.js": ["nextjs", "next js"],
+    "Svelte": [],
+    "Redux": [],
+    "HTML": ["html5"],
+    "CSS": ["css3", "scss", "sass", "less"],
+    "Tailwind CSS": ["tailwind", "tailwindcss"],
+    "Bootstrap": [],
+    "jQuery": [],
+    "Webpack": [],
+    "Flutter": [],
+
+    # Backend frameworks
+    "Node.js": ["node", "nodejs", "node js"],
+    "Express.js": ["express", "expressjs", "express js"],
+    "NestJS": ["nest.js", "nest js"],
+    "Django": ["django rest framework", "drf"],
+    "Flask": [],
+    "FastAPI": ["fast api"],
+    "Spring Boot": ["springboot", "spring-boot"],
+    "Spring": ["spring framework", "spring mvc", "spring security", "spring cloud"],
+    "Hibernate": ["jpa"],
+    "Ruby on Rails": ["rails", "ror"],
+    "Laravel": [],
+    ".NET": ["dotnet", "dot net", ".net core", "asp.net", "asp.net core"],
+    "GraphQL": [],
+    "REST APIs": ["rest", "restful", "rest api", "restful apis", "restful api", "rest apis"],
+    "gRPC": [],
+    "Microservices": ["microservice", "micro services", "micro-services", "microservices architecture"],
+
+    # Data stores
+    "PostgreSQL": ["postgres", "postgresql", "psql"],
+    "MySQL": [],
+    "SQLite": [],
+    "Oracle": ["oracle db", "oracle database"],
+    "SQL Server": ["mssql", "ms sql", "microsoft sql server"],
+    "MongoDB": ["mongo", "mongo db"],
+    "Redis": [],
+    "Cassandra": ["apache cassandra"],
+    "DynamoDB": ["dynamo db"],
+    "Elasticsearch": ["elastic search", "elk", "opensearch"],
+    "Neo4j": [],
+    "Snowflake": [],
+    "BigQuery": ["big query"],
+
+    # Data and ML
+    "Pandas": [],
+    "NumPy": [],
+    "SciPy": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "TensorFlow": ["tensor flow"],
+    "Keras": [],
+    "PyTorch": ["torch"],
+    "Machine Learning": ["ml"],
+    "Deep Learning": ["dl"],
+    "NLP": ["natural language processing"],
+    "Computer Vision": ["opencv"],
+    "LLMs": ["llm", "large language models", "large language model", "genai", "generative ai"],
+    "LangChain": ["langgraph"],
+    "Data Analysis": ["data analytics"],
+    "Apache Spark": ["spark", "pyspark"],
+    "Hadoop": ["hdfs", "mapreduce"],
+    "Apache Kafka": ["kafka"],
+    "Airflow": ["apache airflow"],
+    "dbt": [],
+    "ETL": ["elt", "data pipelines", "data pipeline"],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    "Excel": ["ms excel", "microsoft excel"],
+
+    # Cloud and DevOps
+    "AWS": ["amazon web services", "ec2", "s3", "lambda", "aws lambda"],
+    "Azure": ["microsoft azure"],
+    "GCP": ["google cloud", "google cloud platform"],
+    "Docker": ["dockerfile", "containers", "containerization"],
+    "Kubernetes": ["k8s", "eks", "aks", "gke", "helm"],
+    "Terraform": [],
+    "Ansible": [],
+    "Jenkins": [],
+    "GitHub Actions": [],
+    "GitLab CI": ["gitlab ci/cd"],
+    "CI/CD": ["ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Linux": ["unix", "ubuntu", "centos", "rhel"],
+    "Nginx": [],
+    "Prometheus": [],
+    "Grafana": [],
+    "Git": ["github", "gitlab", "bitbucket"],
+
+    # Messaging and architecture
+    "RabbitMQ": ["rabbit mq"],
+    "System Design": ["distributed systems"],
+    "Event-Driven Architecture": ["event driven architecture", "event-driven", "event driven"],
+
+    # Testing
+    "JUnit": ["junit5"],
+    "pytest": [],
+    "Selenium": [],
+    "Jest": [],
+    "Cypress": [],
+    "Unit Testing": ["unit tests", "tdd", "test driven development"],
+
+    # Mobile
+    "Android": ["android sdk"],
+    "iOS": ["ios development"],
+
+    # Practices
+    "Agile": ["scrum", "kanban"],
+    "Data Structures": ["data structures and algorithms", "dsa"],
+    "OOP": ["object oriented programming", "object-oriented programming", "object oriented design"],
+}
+
+# Surface forms that are also ordinary English words or initials. They only
+# count when they appear in a skills section, where prose is unlikely.
+AMBIGUOUS_TERMS = frozenset({
+    "c", "r", "go", "rust", "swift", "dart", "ruby", "spring", "express", "node", "rest", "less",
+    "spark", "lambda", "torch", "ml", "dl", "elt", "oracle", "excel", "containers", "git",
+    "jest", "rails", "agile", "scrum", "kanban", "dsa", "helm",
+})
@@ -0,0 +1,173 @@
+"""
+Cache of job summaries, keyed by the skills and the set of summarized jobs.
+
+A key combines the summary prompt's version, the model name, and a hash of the
+canonical skills and the sorted job IDs, so a page refresh or a repeated query
+reuses the summary and thought process instead of calling the LLM again.
+
+Near matches are opt-in (settings.SUMMARY_CACHE_MIN_JACCARD below 1.0). For
+each skill set, an index entry lists the job sets of its newest summaries; on
+an exact miss, the summary whose job set has the largest Jaccard overlap with
+the requested one is served if the overlap reaches the threshold. Such a
+summary may mention a job that is not in the current list, or miss one that is.
+
+Map-reduce summarization also caches each branch's fit assessment, keyed the
+same way by the skills and the IDs of the chunk's jobs, in its own namespace.
+"""
+import hashlib
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.utils.cache import SQLiteCache
+
+_summary_cache: Optional[SQLiteCache] = None
+_assessment_cache: Optional[SQLiteCache] = None
+_lock = threading.Lock()
+# Serializes the read-modify-write of index entries within this process
+_index_lock = threading.Lock()
+
+
+def canonical_skills(skills: Sequence[str]) -> List[str]:
+    """
+    Returns the skills trimmed, lower-cased, de-duplicated and sorted, so order and case do not change the key.
+    """
+    return sorted({skill.strip().lower() for skill in skills or () if skill and skill.strip()})
+
+
+def _digest(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def _index_key(skills: Sequence[str], prompt_version_id: str, model_name: str) -> str:
+    return f"index:{prompt_version_id}:{model_name}:{_digest(*canonical_skills(skills))}"
+
+
+def summary_cache_key(skills: Sequence[str], job_ids: Sequence[str], prompt_version_id: str, model_name: str) -> str:
+    digest = _digest(*canonical_skills(skills), "\x1e", *sorted(set(job_ids)))
+    return f"{prompt_version_id}:{model_name}:{digest}"
+
+
+def jaccard(a: Sequence[str], b: Sequence[str]) -> float:
+    a, b = set(a), set(b)
+    return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def _build_cache(namespace: str) -> SQLiteCache:
+    return SQLiteCache(
+        path=settings.CACHE_DB_PATH,
+        namespace=namespace,
+        ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS,
+        max_entries=settings.SUMMARY_CACHE_MAX_ENTRIES,
+    )
+
+
+def get_summary_cache() -> Optional[SQLiteCache]:
+    """
+    Returns the summary cache, or None when caching is disabled.
+    """
+    global _summary_cache
+    if not settings.SUMMARY_CACHE_ENABLED:
+        return None
+    if _summary_cache is None:
+        with _lock:
+            if _summary_cache is None:
+                _summary_cache = _build_cache("summaries")
+    return _summary_cache
+
+
+def get_assessment_cache() -> Optional[SQLiteCache]:
+    """
+    Returns the cache of map-reduce fit assessments, or None when caching is disabled.
+    """
+    global _assessment_cache
+    if not settings.SUMMARY_CACHE_ENABLED:
+        return None
+    if _assessment_cache is None:
+        with _lock:
+            if _assessment_cache is None:
+                _assessment_cache = _build_cache("fit_assessments")
+    return _assessment_cache
+
+
+def get_cached_summary(skills: Sequence[str], job_ids: Sequence[str], prompt_version_id: str,
+                       model_name: str) -> Optional[Dict[str, str]]:
+    """
+    Returns {"summary", "thought_process"} for the skills and job set, or None on a miss.
+
+    An exact match on the job set is tried first; a near match only when
+    settings.SUMMARY_CACHE_MIN_JACCARD is below 1.0.
+    """
+    cache = get_summary_cache()
+    if cache is None:
+        return None
+
+    cached = cache.get(summary_cache_key(skills, job_ids, prompt_version_id, model_name))
+    if cached is not None:
+        metrics.inc("summary_cache_total", result="exact")
+        return cached
+
+    threshold = settings.SUMMARY_CACHE_MIN_JACCARD
+    if threshold < 1.0:
+        candidates = cache.get(_index_key(skills, prompt_version_id, model_name)) or []
+        scored = [(jaccard(job_ids, candidate["job_ids"]), candidate["key"]) for candidate in candidates]
+        # Try the closest job sets first; an indexed summary may have expired or been evicted
+        for overlap, key in sorted(scored, reverse=True):
+            if overlap < threshold:
+                break
+            cached = cache.get(key)
+            if cached is not None:
+                metrics.inc("summary_cache_total", result="near")
+                return cached
+
+    metrics.inc("summary_cache_total", result="miss")
+    return None
+
+
+def cache_summary(skills: Sequence[str], job_ids: Sequence[str], prompt_version_id: str, model_name: str,
+                  summary: str, thought_process: Optional[str]):
+    """
+    Stores a summary, and, when near matches are on, records its job set in the skill set's index.
+    """
+    cache = get_summary_cache()
+    if cache is None or not summary:
+        return
+
+    key = summary_cache_key(skills, job_ids, prompt_version_id, model_name)
+    items = {key: {"summary": summary, "thought_process": thought_process or ""}}
+    if settings.SUMMARY_CACHE_MIN_JACCARD < 1.0:
+        index_key = _index_key(skills, prompt_version_id, model_name)
+        with _index_lock:
+            candidates = [candidate for candidate in cache.get(index_key) or [] if candidate["key"] != key]
+            candidates.insert(0, {"key": key, "job_ids": sorted(set(job_ids))})
+            items[index_key] = candidates[:max(1, settings.SUMMARY_CACHE_NEAR_CANDIDATES)]
+            cache.set_many(items)
+        return
+    cache.set_many(items)
+
+
+def get_cached_assessment(skills: Sequence[str], job_ids: Sequence[str], prompt_version_id: str,
+                          model_name: str) -> Optional[str]:
+    cache = get_assessment_cache()
+    if cache is None:
+        return None
+    return cache.get(summary_cache_key(skills, job_ids, prompt_version_id, model_name))
+
+
+def cache_assessment(skills: Sequence[str], job_ids: Sequence[str], prompt_version_id: str, model_name: str,
+                     assessment: str):
+    cache = get_assessment_cache()
+    if cache is not None and assessment:
+        cache.set(summary_cache_key(skills, job_ids, prompt_version_id, model_name), assessment)
+
+
+def invalidate_summary_cache(assessments: bool = True):
+    """
+    Drops every cached summary, e.g. after a model change that keeps the same name.
+    """
+    cache = get_summary_cache()
+    if cache is not None:
+        cache.clear()
+    if assessments and get_assessment_cache() is not None:
+        get_assessment_cache().clear()
@@ -1,7 +1,10 @@
-from typing import Optional, List
+import operator
+from typing import Annotated, Optional, List
 
 from pydantic import BaseModel, Field
 
+from app.models.job import Job
+
 
 # Define the state schema
 class JobState(BaseModel):
@@ -11,10 +14,32 @@ class JobState(BaseModel):
     skills: Optional[List[str]] = None
     raw_jobs: Optional[dict] = None
     job_ids: Optional[List[str]] = None
-    jobs: List[dict] = Field(default_factory=list)
+    jobs: List[Job] = Field(default_factory=list)
     response: str = ""
     summary: Optional[str] = None
     thought_process: Optional[str] = None
+    # Map-reduce summarization: one entry per assessed chunk, appended by the parallel branches
+    fit_assessments: Annotated[List[dict], operator.add] = Field(default_factory=list)
     start: int = 0
     posted_hours: int = 24
     job_count: int = 10
+
+
+# Fields that only carry data between nodes; they are never returned to clients
+INTERNAL_FIELDS = ("file_bytes", "fit_assessments")
+
+
+def public_state(state: dict) -> dict:
+    """
+    Returns a copy of a graph state dict without its INTERNAL_FIELDS, ready to send to a client.
+    """
+    return {key: value for key, value in state.items() if key not in INTERNAL_FIELDS}
+
+
+class JobChunk(BaseModel):
+    """
+    The input of one map-reduce summarization branch: a slice of the jobs to assess against the skills.
+    """
+    chunk: int
+    skills: List[str]
+    jobs: List[Job]
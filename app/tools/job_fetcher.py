@@ -2,30 +2,44 @@
 This module contains high-level tools for orchestrating complex actions,
 like fetching and processing job data from multiple sources.
 """
-from typing import List, Dict
+from typing import Callable, List, Optional
+
 from langchain_core.tools import tool
 
-from app.services.linkdin_scraper import (
-    get_linkedin_jobs,
-    parse_job_data,
-    parse_job_id_from_urls,
-    get_linkedin_job_details,
-    parse_job_json_response,
-)
+from app.core.config import settings
 from app.core.logger import get_logger
+from app.core.metrics import metrics
+from app.models.job import Job
+from app.providers import asearch_providers, search_providers
+# The LinkedIn pipeline lives in app.providers.linkedin; re-exported for existing imports
+from app.providers.linkedin import (  # noqa: F401
+    afetch_job_details,
+    afind_job_ids,
+    fetch_job_details,
+    find_job_ids,
+    merge_search_results,
+    order_jobs,
+    search_job_ids,
+    search_job_ids_fanout,
+    skill_groups,
+)
+from app.services.prefetch import foreground_activity, get_prefetcher, spare_rate_budget
+from app.services.search_cache import search_cache_key
+from app.utils.stream import emit_event
 
 logger = get_logger(__name__)
 
+
 @tool
-def fetch_and_process_jobs(skills: List[str], job_count: int = 10, start: int = 0, posted_hours: int = 12) -> List[Dict]:
+def fetch_and_process_jobs(skills: List[str], job_count: int = 10, start: int = 0, posted_hours: int = 12) -> List[Job]:
     """
-    Fetches, parses, and retrieves details for LinkedIn jobs based on a list of skills.
+    Fetches jobs matching a list of skills from every configured provider.
 
     This function orchestrates the entire job fetching process:
-    1. Searches for jobs using the provided skills.
-    2. Parses the initial response to extract job IDs.
-    3. Fetches detailed information for each job ID.
-    4. Cleans and formats the final job details.
+    1. Serves the page from the prefetcher if it was loaded in the background.
+    2. Otherwise queries all providers in settings.JOB_PROVIDERS concurrently,
+       each bounded by its own timeout and the overall provider deadline.
+    3. Merges the providers' jobs, deduplicated by source and job ID.
 
     Args:
         skills: A list of skill keywords to search for.
@@ -34,36 +48,92 @@ def fetch_and_process_jobs(skills: List[str], job_count: int = 10, start: int =
         posted_hours: The time window in hours for job postings. Defaults to 12.
 
     Returns:
-        A list of dictionaries, where each dictionary contains the
-        detailed information for a matched job.
+        A list of Job records with the detailed information for each matched job.
     """
     logger.info(f"--- Tool: Starting job fetching process for skills: {skills} ---")
 
-    # Step 1: Fetch raw job listings
-    raw_jobs = get_linkedin_jobs(skills, count=job_count, start=start, posted_hours=posted_hours)
-    if not raw_jobs or "error" in raw_jobs:
-        logger.error("Failed to fetch initial job listings from LinkedIn.")
-        return []
-
-    # Step 2: Parse job IDs
-    job_urls = parse_job_data(raw_jobs)
-    job_ids_and_linkedin_url = parse_job_id_from_urls(job_urls)
-    if not job_ids_and_linkedin_url:
-        logger.warning("No job IDs could be extracted from the search results.")
-        return []
-    logger.info(f"Successfully extracted {len(job_ids_and_linkedin_url)} job IDs.")
-
-    # Step 3: Fetch details for each job ID
-    detailed_jobs = []
-    for i, (job_id, linkedin_url) in enumerate(job_ids_and_linkedin_url, 1):
-        logger.info(f"Fetching details for job {i}/{len(job_ids_and_linkedin_url)}: {job_id}")
-        job_details_raw = get_linkedin_job_details(job_id)
-        if job_details_raw and "error" not in job_details_raw:
-            extracted_details = parse_job_json_response(job_details_raw)
-            extracted_details["linkedin_url"] = linkedin_url
-            detailed_jobs.append(extracted_details)
-        else:
-            logger.warning(f"Could not fetch details for job ID: {job_id}")
+    # Step 1: A page prefetched after the previous page was served needs no upstream calls
+    prefetched_jobs = _take_prefetched(skills, job_count, start, posted_hours)
+    if prefetched_jobs is not None:
+        return prefetched_jobs
+
+    with foreground_activity():
+        # Steps 2 & 3: Query every provider in parallel and merge what arrives before the deadline
+        detailed_jobs = search_providers(skills, count=job_count, start=start, posted_hours=posted_hours)
 
     logger.info(f"Successfully fetched and processed details for {len(detailed_jobs)} jobs.")
     return detailed_jobs
+
+
+async def _afetch_and_process_jobs(skills: List[str], job_count: int = 10, start: int = 0,
+                                   posted_hours: int = 12) -> List[Job]:
+    logger.info(f"--- Tool: Starting job fetching process for skills: {skills} ---")
+
+    prefetched_jobs = _take_prefetched(skills, job_count, start, posted_hours)
+    if prefetched_jobs is not None:
+        return prefetched_jobs
+
+    with foreground_activity():
+        detailed_jobs = await asearch_providers(skills, count=job_count, start=start, posted_hours=posted_hours)
+
+    logger.info(f"Successfully fetched and processed details for {len(detailed_jobs)} jobs.")
+    return detailed_jobs
+
+
+# Gives the tool a native async path, so fetch_and_process_jobs.ainvoke() runs on the event loop
+fetch_and_process_jobs.coroutine = _afetch_and_process_jobs
+
+
+def _take_prefetched(skills: List[str], job_count: int, start: int, posted_hours: int) -> Optional[List[Job]]:
+    prefetcher = get_prefetcher()
+    if prefetcher is None:
+        return None
+    prefetched_jobs = prefetcher.take(search_cache_key(skills, posted_hours, start, job_count))
+    if prefetched_jobs is not None:
+        logger.info(f"Serving {len(prefetched_jobs)} prefetched jobs.")
+        for i, job in enumerate(prefetched_jobs):
+            emit_event("job", index=i, job=job.to_dict())
+    return prefetched_jobs
+
+
+def prefetch_next_page(skills: List[str], job_count: int, start: int, posted_hours: int) -> bool:
+    """
+    Schedules a background fetch of the page after the one starting at `start`.
+
+    The prefetch uses a reduced worker budget, skips oversized pages, is not started
+    while the upstream rate-limit buckets are down to their reserve, and backs off
+    as soon as a foreground fetch starts.
+
+    Returns:
+        True if a prefetch was scheduled.
+    """
+    prefetcher = get_prefetcher()
+    if prefetcher is None or not skills or job_count > settings.PREFETCH_MAX_JOBS:
+        return False
+    if not spare_rate_budget():
+        metrics.inc("prefetch_total", result="rate_limited")
+        return False
+
+    next_start = start + job_count
+
+    def load_page(should_stop: Callable[[], bool]) -> Optional[List[Job]]:
+        stopped = []
+
+        def stop_requested() -> bool:
+            if should_stop():
+                stopped.append(True)
+                return True
+            return False
+
+        jobs = search_providers(
+            skills,
+            count=job_count,
+            start=next_start,
+            posted_hours=posted_hours,
+            should_stop=stop_requested,
+            background=True,
+        )
+        # A partially fetched page must not be served as if it were complete
+        return None if stopped or not jobs else jobs
+
+    return prefetcher.schedule(search_cache_key(skills, posted_hours, next_start, job_count), load_page)
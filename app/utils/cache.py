@@ -0,0 +1,276 @@
+"""
+Caching primitives shared by the services layer.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class SQLiteCache:
+    """
+    A disk-backed key/value cache with a TTL and LRU eviction, stored in SQLite.
+
+    Values must be JSON-serializable. Each namespace gets its own table, so
+    several caches can share one database file. The database runs in WAL mode,
+    which lets several worker processes read and write the same file.
+    """
+
+    def __init__(self, path: str, namespace: str, ttl_seconds: float, max_entries: int):
+        self.path = path
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {namespace} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {namespace}_accessed_at ON {namespace} (accessed_at)")
+
+    def _record(self, hits: int, misses: int):
+        self.hits += hits
+        self.misses += misses
+        if hits:
+            metrics.inc("cache_requests_total", hits, cache=self.namespace, result="hit")
+        if misses:
+            metrics.inc("cache_requests_total", misses, cache=self.namespace, result="miss")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Returns the cached value for a key, or None if it is missing or expired.
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Returns a dictionary of the keys that are present and fresh.
+        """
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+
+        now = time.time()
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value FROM {self.namespace} WHERE key IN ({placeholders}) AND created_at > ?",
+                (*keys, now - self.ttl_seconds),
+            ).fetchall()
+            if rows:
+                found_keys = [row[0] for row in rows]
+                self._conn.execute(
+                    f"UPDATE {self.namespace} SET accessed_at = ? WHERE key IN ({','.join('?' * len(found_keys))})",
+                    (now, *found_keys),
+                )
+            self._record(len(rows), len(keys) - len(rows))
+
+        found = {}
+        for key, value in rows:
+            found[key] = json.loads(value)
+        return found
+
+    def set(self, key: str, value: Any):
+        self.set_many({key: value})
+
+    def set_many(self, items: Dict[str, Any]):
+        """
+        Stores several values, then evicts expired and least recently used entries.
+        """
+        if not items:
+            return
+
+        now = time.time()
+        rows = [(key, json.dumps(value), now, now) for key, value in items.items()]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {self.namespace} (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._evict(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, now: float):
+        expired = self._conn.execute(
+            f"DELETE FROM {self.namespace} WHERE created_at <= ?", (now - self.ttl_seconds,)
+        ).rowcount
+        size = self._conn.execute(f"SELECT COUNT(*) FROM {self.namespace}").fetchone()[0]
+        overflow = size - self.max_entries
+        evicted = 0
+        if overflow > 0:
+            evicted = self._conn.execute(
+                f"DELETE FROM {self.namespace} WHERE key IN "
+                f"(SELECT key FROM {self.namespace} ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            ).rowcount
+        if expired or evicted:
+            self.evictions += expired + evicted
+            metrics.inc("cache_evictions_total", expired + evicted, cache=self.namespace)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.namespace} WHERE key = ?", (key,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.namespace}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = self._conn.execute(f"SELECT COUNT(*) FROM {self.namespace}").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "size": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class StaleWhileRevalidateCache:
+    """
+    An in-memory LRU cache that keeps serving entries for a while after they go stale.
+
+    Entries younger than `fresh_seconds` are served as-is. Entries that are older
+    but still within `fresh_seconds + stale_seconds` are served immediately while a
+    single background refresh replaces them. Anything older is loaded in the
+    foreground.
+    """
+
+    def __init__(self, name: str, fresh_seconds: float, stale_seconds: float, max_entries: int,
+                 refresh_workers: int = 2):
+        self.name = name
+        self.fresh_seconds = fresh_seconds
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=refresh_workers, thread_name_prefix=f"{name}-refresh")
+
+    def _store(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Optional[Any]]):
+        try:
+            value = loader()
+            if value is not None:
+                self._store(key, value)
+                self.refreshes += 1
+        except Exception as e:
+            logger.warning(f"Background refresh failed for {self.name} cache: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _lookup(self, key: Hashable, loader: Callable[[], Optional[Any]]) -> Tuple[bool, Optional[Any]]:
+        """
+        Returns (True, value) for a fresh or stale entry, scheduling a refresh of a stale
+        one with `loader`, or (False, None) on a miss.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+                if age < self.fresh_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    metrics.inc("cache_requests_total", cache=self.name, result="hit")
+                    return True, value
+                if age < self.fresh_seconds + self.stale_seconds:
+                    self._entries.move_to_end(key)
+                    self.stale_hits += 1
+                    metrics.inc("cache_requests_total", cache=self.name, result="stale")
+                    if key not in self._refreshing:
+                        self._refreshing.add(key)
+                        self._executor.submit(self._refresh, key, loader)
+                    return True, value
+                del self._entries[key]
+            self.misses += 1
+            metrics.inc("cache_requests_total", cache=self.name, result="miss")
+        return False, None
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        Returns the cached value for a key, loading or refreshing it as needed.
+
+        Args:
+            key: A hashable cache key.
+            loader: Called with no arguments to produce the value. A None result is
+                returned to the caller but never cached.
+        """
+        found, value = self._lookup(key, loader)
+        if found:
+            return value
+        value = loader()
+        if value is not None:
+            self._store(key, value)
+        return value
+
+    async def aget_or_load(self, key: Hashable, aloader: Callable[[], Awaitable[Optional[Any]]],
+                           loader: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        Async variant of get_or_load(): a miss awaits `aloader()` on the event loop,
+        while stale entries are still refreshed by the background threads with `loader`.
+        """
+        found, value = self._lookup(key, loader)
+        if found:
+            return value
+        value = await aloader()
+        if value is not None:
+            self._store(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "name": self.name,
+            "size": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "background_refreshes": self.refreshes,
+        }
@@ -0,0 +1,203 @@
+"""
+Token budgeting for LLM prompts.
+
+Counts tokens locally (tiktoken when installed, a characters-per-token estimate
+otherwise), strips whitespace and boilerplate that carry no signal, removes
+duplicate jobs and shares a fixed budget between job descriptions in proportion
+to their relevance. The cl100k encoding is not the served model's tokenizer, so
+counts are an estimate; they are consistent, which is what the budget needs.
+"""
+import math
+import re
+from functools import lru_cache
+from typing import List, Sequence
+
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+from app.models.job import Job
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken is optional; fall back to a length-based estimate
+    tiktoken = None
+
+logger = get_logger(__name__)
+
+# Typical English prose averages about four characters per BPE token
+CHARS_PER_TOKEN = 4
+
+_WHITESPACE_RE = re.compile(r"[ \t\f\v ]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Sentences that appear in most postings and say nothing about the role
+_JOB_BOILERPLATE_RE = re.compile(
+    r"equal (?:employment )?opportunity|without regard to|reasonable accommodation|e-verify|"
+    r"protected (?:veteran|characteristic)|background check|show more|show less|"
+    r"click (?:here|apply)|apply now|privacy (?:policy|notice)",
+    re.IGNORECASE,
+)
+# Resume lines that carry no skills or experience
+_RESUME_BOILERPLATE_RE = re.compile(
+    r"^(?:page \d+(?: of \d+)?|references (?:available )?(?:up)?on request|curriculum vitae|resume|\d+)$",
+    re.IGNORECASE,
+)
+
+
+@lru_cache(maxsize=1)
+def _get_encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:  # e.g. the encoding file cannot be downloaded
+        logger.warning(f"tiktoken encoding unavailable, estimating token counts: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Cuts text to at most max_tokens, preferring to end on a word boundary.
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = _get_encoding()
+    if encoding is not None:
+        cut = encoding.decode(encoding.encode(text, disallowed_special=())[:max_tokens])
+    else:
+        cut = text[:max_tokens * CHARS_PER_TOKEN]
+    boundary = cut.rfind(" ")
+    if boundary > len(cut) // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + "..."
+
+
+def clean_resume_text(text: str) -> str:
+    """
+    Collapses whitespace and drops page markers and header/footer lines repeated on every page.
+    """
+    seen_counts = {}
+    lines = []
+    for line in (text or "").splitlines():
+        line = _WHITESPACE_RE.sub(" ", line).strip()
+        if not line or _RESUME_BOILERPLATE_RE.match(line):
+            continue
+        seen_counts[line] = seen_counts.get(line, 0) + 1
+        # Headers and footers repeat on each page; a second copy is already noise
+        if seen_counts[line] > 1 and len(line) < 80:
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def clean_job_text(text: str) -> str:
+    """
+    Collapses whitespace and drops legal and call-to-action boilerplate sentences.
+    """
+    text = _BLANK_LINES_RE.sub("\n", _WHITESPACE_RE.sub(" ", text or "")).strip()
+    sentences = [s for s in _SENTENCE_SPLIT_RE.split(text) if s and not _JOB_BOILERPLATE_RE.search(s)]
+    return " ".join(sentences)
+
+
+def dedupe_jobs(jobs: Sequence[Job]) -> List[Job]:
+    """
+    Drops repeated job IDs and reposts of the same title at the same company, keeping the first.
+    """
+    seen_ids = set()
+    seen_postings = set()
+    unique = []
+    for job in jobs:
+        posting = ((job.title or "").strip().lower(), (job.company_name or "").strip().lower())
+        if job.job_id in seen_ids or (any(posting) and posting in seen_postings):
+            continue
+        if job.job_id is not None:
+            seen_ids.add(job.job_id)
+        seen_postings.add(posting)
+        unique.append(job)
+    return unique
+
+
+def allocate_budget(lengths: Sequence[int], weights: Sequence[float], budget: int, floor: int) -> List[int]:
+    """
+    Splits a token budget across items in proportion to their weights.
+
+    Every item gets at least `floor` tokens (or its full length if shorter), and
+    no item gets more than its length; budget freed by short items is handed to
+    the rest, so the whole budget is used while any item still needs more.
+    """
+    allocation = [min(length, floor) for length in lengths]
+    remaining = budget - sum(allocation)
+    open_items = [i for i, length in enumerate(lengths) if allocation[i] < length]
+    while remaining > 0 and open_items:
+        total_weight = sum(weights[i] for i in open_items) or float(len(open_items))
+        granted = 0
+        for i in open_items:
+            share = weights[i] / total_weight if total_weight else 1 / len(open_items)
+            grant = min(lengths[i] - allocation[i], max(1, int(remaining * share)))
+            grant = min(grant, remaining - granted)
+            allocation[i] += grant
+            granted += grant
+            if granted >= remaining:
+                break
+        remaining -= granted
+        open_items = [i for i in open_items if allocation[i] < lengths[i]]
+        if not granted:
+            break
+    return allocation
+
+
+def record_savings(prompt: str, before_tokens: int, after_tokens: int):
+    saved = max(0, before_tokens - after_tokens)
+    metrics.observe("prompt_tokens", after_tokens, buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000),
+                    prompt=prompt)
+    if saved:
+        metrics.inc("prompt_tokens_saved_total", saved, prompt=prompt)
+    logger.info(f"Prompt budget ({prompt}): {before_tokens} -> {after_tokens} tokens, saved {saved}.")
+
+
+def fit_resume(raw_text: str, max_tokens: int) -> str:
+    """
+    Returns the cleaned resume text, truncated to max_tokens.
+    """
+    cleaned = clean_resume_text(raw_text)
+    fitted = truncate_to_tokens(cleaned, max_tokens)
+    record_savings("extract_skills", count_tokens(raw_text), count_tokens(fitted))
+    return fitted
+
+
+def fit_job_descriptions(jobs: Sequence[Job], max_tokens: int, min_tokens: int) -> List[str]:
+    """
+    Cleans and trims each job's description so that together they fit in max_tokens.
+
+    Args:
+        jobs: The jobs to include, already deduplicated.
+        max_tokens: The budget for all descriptions together.
+        min_tokens: The smallest description any job is given.
+
+    Returns:
+        One description per job, in the input order. Jobs with a higher
+        relevance_score are given a larger share of the budget.
+    """
+    descriptions = [clean_job_text(job.job_info) for job in jobs]
+    lengths = [count_tokens(description) for description in descriptions]
+
+    scores = [job.relevance_score for job in jobs]
+    if any(score is not None for score in scores):
+        # Keep a little weight on zero-score jobs so they are not reduced to nothing
+        weights = [(score or 0.0) + 0.1 for score in scores]
+    else:
+        weights = [1.0] * len(jobs)
+
+    allocation = allocate_budget(lengths, weights, max(0, max_tokens), min_tokens)
+    return [truncate_to_tokens(description, tokens) for description, tokens in zip(descriptions, allocation)]
@@ -0,0 +1,229 @@
+"""
+Cross-process rate limiting and circuit breaking, backed by SQLite.
+
+Every worker process opens the same database file, so the token bucket and the
+breaker state for an upstream endpoint are shared by all of them. Each decision
+runs in a short IMMEDIATE transaction, which serializes concurrent writers.
+"""
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from app.core.logger import get_logger
+from app.core.metrics import metrics
+
+logger = get_logger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Numeric encoding for the circuit_breaker_state gauge
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a token could not be acquired within the allowed wait."""
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected because the endpoint's circuit is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuit for '{name}' is open; retry in {retry_in:.1f}s.")
+        self.name = name
+        self.retry_in = retry_in
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class _Transaction:
+    """
+    Runs a block in a BEGIN IMMEDIATE transaction on a shared connection.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock):
+        self._conn = conn
+        self._lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self._lock.acquire()
+        try:
+            self._conn.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self._lock.release()
+            raise
+        return self._conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self._conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self._lock.release()
+
+
+class TokenBucket:
+    """
+    A token bucket shared between processes through a SQLite row.
+
+    The bucket holds up to `burst` tokens and refills at `rate` tokens per second.
+    """
+
+    def __init__(self, path: str, name: str, rate: float, burst: int):
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS token_buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def _try_take(self) -> float:
+        """
+        Takes a token if one is available. Returns 0, or the seconds until one will be.
+        """
+        with _Transaction(self._conn, self._lock) as conn:
+            now = time.time()
+            row = conn.execute("SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (self.name,)).fetchone()
+            tokens = float(self.burst) if row is None else min(self.burst, row[0] + (now - row[1]) * self.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / self.rate
+            conn.execute(
+                "INSERT OR REPLACE INTO token_buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                (self.name, tokens, now),
+            )
+        return wait
+
+    def available(self) -> float:
+        """
+        Returns the tokens in the bucket right now, without taking one.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT tokens, updated_at FROM token_buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+        if row is None:
+            return float(self.burst)
+        return min(self.burst, row[0] + (time.time() - row[1]) * self.rate)
+
+    def acquire(self, max_wait: Optional[float] = None) -> float:
+        """
+        Blocks until a token is available and takes it.
+
+        Args:
+            max_wait: The longest to wait in seconds; None waits indefinitely.
+
+        Returns:
+            The seconds spent waiting.
+
+        Raises:
+            RateLimitTimeout: if no token became available within max_wait.
+        """
+        started = time.perf_counter()
+        while True:
+            wait = self._try_take()
+            waited = time.perf_counter() - started
+            if wait <= 0:
+                return waited
+            if max_wait is not None and waited + wait > max_wait:
+                raise RateLimitTimeout(f"Rate limit for '{self.name}' would need a {waited + wait:.1f}s wait.")
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker whose state is shared between processes through a SQLite row.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast for `reset_seconds` (or longer, if the upstream sent Retry-After).
+    Then one caller is let through as a probe: success closes the circuit,
+    failure opens it again.
+    """
+
+    def __init__(self, path: str, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS circuit_breakers "
+            "(name TEXT PRIMARY KEY, state TEXT NOT NULL, failures INTEGER NOT NULL, open_until REAL NOT NULL)"
+        )
+        # Successes are the common case; before_call notes whether a success has anything to reset
+        self._maybe_failing = True
+
+    def _read(self, conn: sqlite3.Connection):
+        row = conn.execute(
+            "SELECT state, failures, open_until FROM circuit_breakers WHERE name = ?", (self.name,)
+        ).fetchone()
+        return row if row is not None else (CLOSED, 0, 0.0)
+
+    def _write(self, conn: sqlite3.Connection, state: str, failures: int, open_until: float, previous: str):
+        conn.execute(
+            "INSERT OR REPLACE INTO circuit_breakers (name, state, failures, open_until) VALUES (?, ?, ?, ?)",
+            (self.name, state, failures, open_until),
+        )
+        if state != previous:
+            metrics.inc("circuit_breaker_transitions_total", endpoint=self.name, state=state)
+            logger.warning(f"Circuit for '{self.name}' is now {state}.")
+        metrics.set_gauge("circuit_breaker_state", STATE_VALUES[state], endpoint=self.name)
+
+    def before_call(self):
+        """
+        Raises CircuitOpenError if the call must fail fast.
+        """
+        with _Transaction(self._conn, self._lock) as conn:
+            state, failures, open_until = self._read(conn)
+            now = time.time()
+            # Another process may have changed the state; keep this process's gauge current
+            metrics.set_gauge("circuit_breaker_state", STATE_VALUES[state], endpoint=self.name)
+            self._maybe_failing = state != CLOSED or failures > 0
+            if state == CLOSED:
+                return
+            if now < open_until:
+                metrics.inc("circuit_breaker_rejections_total", endpoint=self.name)
+                raise CircuitOpenError(self.name, open_until - now)
+            # The open period is over: this caller probes, everyone else keeps failing fast
+            self._write(conn, HALF_OPEN, failures, now + self.reset_seconds, state)
+
+    def record_success(self):
+        if not self._maybe_failing:
+            return
+        with _Transaction(self._conn, self._lock) as conn:
+            state, failures, _ = self._read(conn)
+            if state != CLOSED or failures:
+                self._write(conn, CLOSED, 0, 0.0, state)
+        self._maybe_failing = False
+
+    def record_failure(self, retry_after: Optional[float] = None):
+        with _Transaction(self._conn, self._lock) as conn:
+            state, failures, open_until = self._read(conn)
+            failures += 1
+            if state == HALF_OPEN or failures >= self.failure_threshold:
+                open_for = max(self.reset_seconds, retry_after or 0.0)
+                self._write(conn, OPEN, failures, time.time() + open_for, state)
+            else:
+                self._write(conn, state, failures, open_until, state)
+        self._maybe_failing = True
+
+    def state(self) -> str:
+        with _Transaction(self._conn, self._lock) as conn:
+            state, _, open_until = self._read(conn)
+        if state == OPEN and time.time() >= open_until:
+            return HALF_OPEN
+        return state
@@ -0,0 +1,36 @@
+"""
+Fast JSON serialization for API responses and streamed events.
+"""
+import json
+from typing import Any
+
+from app.models.job import Job
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library encoder
+    orjson = None
+
+
+def json_default(obj: Any) -> Any:
+    """
+    Converts objects the JSON encoders do not handle natively.
+    """
+    if isinstance(obj, Job):
+        return obj.to_dict()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return None
+    return str(obj)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serializes an object to JSON bytes, using orjson when it is installed.
+    """
+    if orjson is not None:
+        # Jobs are dataclasses; passing them through keeps the legacy API keys
+        return orjson.dumps(obj, default=json_default,
+                            option=orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, default=json_default).encode("utf-8")
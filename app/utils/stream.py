@@ -0,0 +1,19 @@
+"""
+Helpers for publishing progress events from inside a graph run.
+"""
+from langgraph.config import get_stream_writer
+
+
+def emit_event(event: str, **payload):
+    """
+    Sends a custom progress event to any client streaming the current graph run.
+
+    Outside a graph run (or when nobody is streaming) this is a no-op, so the
+    services layer can call it unconditionally.
+    """
+    try:
+        writer = get_stream_writer()
+    except (RuntimeError, KeyError):
+        # KeyError: a runnable context (e.g. a bare tool call) without a graph runtime
+        return
+    writer({"event": event, **payload})
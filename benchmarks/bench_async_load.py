@@ -0,0 +1,131 @@
+"""
+Concurrent throughput of one uvicorn worker, with the graphs run on the event
+loop (GRAPH_EXECUTION=async) and in the threadpool (GRAPH_EXECUTION=thread).
+
+The app runs fully offline against benchmarks.fake_voyager and the fake chat
+model, with caches, prefetching and the upstream guards turned off as in
+bench_end_to_end. An asyncio client keeps `concurrency` requests in flight
+against /search/ (or /upload-resume/) and reports latency percentiles,
+throughput, and the speedup over the same mode at concurrency 1. With one
+worker, throughput should grow with concurrency until the upstream, the model
+or the CPU saturates, instead of staying flat.
+
+Usage:
+    GROQ_API_KEY=dummy python -m benchmarks.bench_async_load [--modes async,thread]
+        [--endpoints search,upload] [--concurrency 1,2,4,8,16,32] [--requests-per-level 4]
+        [--job-count 10] [--upstream-latency 0.05] [--llm-first-token 0.2] [--llm-per-token 0.005]
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.bench_end_to_end import SKILLS, LocalServer, configure_environment, make_resume_pdf, percentile
+from benchmarks.fake_voyager import FakeVoyagerServer
+
+MODES = ("async", "thread")
+ENDPOINTS = ("search", "upload")
+
+
+async def run_level(send, concurrency: int, request_count: int) -> dict:
+    """
+    Sends request_count requests with at most `concurrency` in flight.
+    """
+    latencies = []
+    errors = 0
+    remaining = iter(range(request_count))
+
+    async def client():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                await send()
+                latencies.append((time.perf_counter() - started) * 1000)
+            except Exception:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "errors": errors,
+    }
+
+
+async def run_benchmark(args, base_url: str):
+    import httpx
+
+    from app.core.config import settings
+
+    pdf_bytes = make_resume_pdf()
+    concurrency_levels = [int(value) for value in args.concurrency.split(",")]
+    limits = httpx.Limits(max_connections=max(concurrency_levels), max_keepalive_connections=max(concurrency_levels))
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as http:
+        async def search():
+            response = await http.post("/search/", json={"skills": SKILLS, "size": args.job_count, "posted_hours": 24})
+            response.raise_for_status()
+
+        async def upload():
+            response = await http.post("/upload-resume/",
+                                       files={"file": ("resume.pdf", pdf_bytes, "application/pdf")})
+            response.raise_for_status()
+
+        senders = {"search": search, "upload": upload}
+        print(f"{'mode':<7} {'endpoint':<9} {'conc':>5} {'reqs':>5} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'req/s':>7} {'speedup':>8} {'errors':>7}")
+        for endpoint in [name for name in args.endpoints.split(",") if name in ENDPOINTS]:
+            for mode in [name for name in args.modes.split(",") if name in MODES]:
+                # The routes read the setting on every request, so the mode can change between levels
+                settings.GRAPH_EXECUTION = mode
+                send = senders[endpoint]
+                await send()  # warm-up: pools, connections, PDF worker processes
+                baseline = None
+                for concurrency in concurrency_levels:
+                    request_count = concurrency * args.requests_per_level
+                    result = await run_level(send, concurrency, request_count)
+                    baseline = baseline or result["throughput"]
+                    speedup = result["throughput"] / baseline if baseline else 0.0
+                    print(f"{mode:<7} {endpoint:<9} {concurrency:>5} {request_count:>5} {result['p50']:>9.1f} "
+                          f"{result['p95']:>9.1f} {result['throughput']:>7.2f} {speedup:>7.1f}x {result['errors']:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--endpoints", default="search")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32")
+    parser.add_argument("--requests-per-level", type=int, default=4)
+    parser.add_argument("--job-count", type=int, default=10)
+    parser.add_argument("--upstream-latency", type=float, default=0.05)
+    parser.add_argument("--llm-first-token", type=float, default=0.2)
+    parser.add_argument("--llm-per-token", type=float, default=0.005)
+    args = parser.parse_args()
+
+    upstream = FakeVoyagerServer(latency_seconds=args.upstream_latency).start()
+    configure_environment(args, upstream.base_url)
+
+    import logging
+
+    from app.main import app
+
+    # The per-step INFO logs would dominate the output and the timings
+    logging.disable(logging.INFO)
+    print(f"upstream latency={args.upstream_latency * 1000:.0f} ms  "
+          f"LLM first token={args.llm_first_token * 1000:.0f} ms  per token={args.llm_per_token * 1000:.1f} ms  "
+          f"jobs per search={args.job_count}")
+    try:
+        with LocalServer(app) as base_url:
+            asyncio.run(run_benchmark(args, base_url))
+    finally:
+        upstream.stop()
+    print(f"upstream requests served: {upstream.requests_served}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+End-to-end latency and throughput of both compiled graphs and both HTTP
+endpoints, run fully offline against benchmarks.fake_voyager and the fake chat
+model (LLM_PROVIDER=fake).
+
+Every scenario runs at each job count and concurrency level and reports
+p50/p95/p99 latency and throughput. The job, search and resume caches and
+prefetching are turned off so every request does the full work, and the
+upstream rate limiter and circuit breaker are off because the upstream is local.
+/upload-resume/ always fetches the default page size, so it runs once per
+concurrency level.
+
+Usage:
+    GROQ_API_KEY=dummy python -m benchmarks.bench_end_to_end [--job-counts 5,10,25]
+        [--concurrency 1,4,8] [--requests 16] [--upstream-latency 0.05]
+        [--error-rate 0.0] [--llm-first-token 0.2] [--llm-per-token 0.005]
+        [--scenarios job_finder_graph,direct_search_graph,upload_http,search_http]
+"""
+import argparse
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List
+
+from benchmarks.fake_voyager import FakeVoyagerServer
+
+SCENARIOS = ("job_finder_graph", "direct_search_graph", "upload_http", "search_http")
+SKILLS = ["Python", "SQL", "Docker"]
+RESUME_TEXT = """Jane Doe - Backend Engineer
+
+Experience
+Senior Software Engineer, Acme (2019 - present)
+Built Python and Django services on AWS, deployed with Docker and Kubernetes.
+Designed PostgreSQL schemas and tuned SQL queries; added Redis caching.
+
+Skills
+Python, Django, FastAPI, PostgreSQL, SQL, Docker, Kubernetes, AWS, Redis, Git
+"""
+
+
+def configure_environment(args, upstream_url: str):
+    # Settings are read once at import time, so this runs before any app module is imported
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "FAKE_LLM_FIRST_TOKEN_SECONDS": str(args.llm_first_token),
+        "FAKE_LLM_SECONDS_PER_TOKEN": str(args.llm_per_token),
+        "LINKEDIN_BASE_URL": upstream_url,
+        "LINKEDIN_COOKIE": os.environ.get("LINKEDIN_COOKIE", "offline"),
+        "CSRF_TOKEN": os.environ.get("CSRF_TOKEN", "offline"),
+        "JOB_PROVIDERS": '["linkedin"]',
+        "JOB_CACHE_ENABLED": "false",
+        "SEARCH_CACHE_ENABLED": "false",
+        "RESUME_CACHE_ENABLED": "false",
+        "PREFETCH_ENABLED": "false",
+        "RATE_LIMIT_ENABLED": "false",
+        "CIRCUIT_BREAKER_ENABLED": "false",
+    })
+
+
+def make_resume_pdf() -> bytes:
+    import fitz
+
+    document = fitz.open()
+    page = document.new_page()
+    page.insert_text((72, 72), RESUME_TEXT, fontsize=10)
+    pdf_bytes = document.tobytes()
+    document.close()
+    return pdf_bytes
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    # Nearest-rank percentile
+    if not sorted_values:
+        return float("nan")
+    rank = max(1, min(len(sorted_values), int(round(fraction * len(sorted_values) + 0.5))))
+    return sorted_values[rank - 1]
+
+
+def run_load(call: Callable[[], None], concurrency: int, request_count: int) -> dict:
+    """
+    Runs `call` request_count times from `concurrency` threads.
+    """
+    def timed():
+        started = time.perf_counter()
+        try:
+            call()
+            return time.perf_counter() - started, None
+        except Exception as e:
+            return time.perf_counter() - started, e
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(lambda _: timed(), range(request_count)))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(latency * 1000 for latency, error in outcomes if error is None)
+    return {
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "errors": sum(1 for _, error in outcomes if error is not None),
+    }
+
+
+class LocalServer:
+    """
+    Runs the FastAPI app under uvicorn on a free local port.
+    """
+
+    def __init__(self, app):
+        import uvicorn
+
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self.thread = threading.Thread(target=self.server.run, name="bench-uvicorn", daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.05)
+        return f"http://127.0.0.1:{self.port}"
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--job-counts", default="5,10,25")
+    parser.add_argument("--concurrency", default="1,4,8")
+    parser.add_argument("--requests", type=int, default=16)
+    parser.add_argument("--upstream-latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--llm-first-token", type=float, default=0.2)
+    parser.add_argument("--llm-per-token", type=float, default=0.005)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    args = parser.parse_args()
+
+    job_counts = [int(value) for value in args.job_counts.split(",")]
+    concurrency_levels = [int(value) for value in args.concurrency.split(",")]
+    scenarios = [name for name in args.scenarios.split(",") if name in SCENARIOS]
+
+    upstream = FakeVoyagerServer(latency_seconds=args.upstream_latency, error_rate=args.error_rate).start()
+    configure_environment(args, upstream.base_url)
+
+    import logging
+
+    import requests
+
+    from app.graph.registry import get_graph_registry
+    from app.main import app
+    from app.state.job_state import JobState
+
+    # The per-step INFO logs would dominate the output and the timings
+    logging.disable(logging.INFO)
+    pdf_bytes = make_resume_pdf()
+    default_job_count = JobState.model_fields["job_count"].default
+    local = threading.local()
+
+    def session() -> requests.Session:
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        return local.session
+
+    def calls(base_url: str, job_count: int) -> dict:
+        registry = get_graph_registry()
+
+        def upload_http():
+            response = session().post(f"{base_url}/upload-resume/",
+                                      files={"file": ("resume.pdf", pdf_bytes, "application/pdf")})
+            response.raise_for_status()
+
+        def search_http():
+            response = session().post(f"{base_url}/search/",
+                                      json={"skills": SKILLS, "size": job_count, "posted_hours": 24})
+            response.raise_for_status()
+
+        return {
+            "job_finder_graph": lambda: registry.job_finder_graph.invoke(
+                JobState(file_bytes=pdf_bytes, job_count=job_count)),
+            "direct_search_graph": lambda: registry.direct_search_graph.invoke(
+                JobState(skills=SKILLS, job_count=job_count)),
+            "upload_http": upload_http,
+            "search_http": search_http,
+        }
+
+    print(f"upstream latency={args.upstream_latency * 1000:.0f} ms  error rate={args.error_rate:.0%}  "
+          f"LLM first token={args.llm_first_token * 1000:.0f} ms  per token={args.llm_per_token * 1000:.1f} ms")
+    print(f"{'scenario':<20} {'jobs':>5} {'conc':>5} {'reqs':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'req/s':>7} {'errors':>7}")
+    try:
+        with LocalServer(app) as base_url:
+            for scenario in scenarios:
+                counts = [default_job_count] if scenario == "upload_http" else job_counts
+                for job_count in counts:
+                    call = calls(base_url, job_count)[scenario]
+                    call()  # warm-up: pools, graph registry, PDF worker processes
+                    for concurrency in concurrency_levels:
+                        result = run_load(call, concurrency, max(args.requests, concurrency))
+                        print(f"{scenario:<20} {job_count:>5} {concurrency:>5} {max(args.requests, concurrency):>5} "
+                              f"{result['p50']:>9.1f} {result['p95']:>9.1f} {result['p99']:>9.1f} "
+                              f"{result['throughput']:>7.2f} {result['errors']:>7}")
+    finally:
+        upstream.stop()
+    print(f"upstream requests served: {upstream.requests_served}")
+
+
+if __name__ == "__main__":
+    main()
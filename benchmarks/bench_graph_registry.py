@@ -0,0 +1,58 @@
+"""
+Compares the per-request cost of building the graphs (the old behaviour)
+with looking them up in the process-level registry.
+
+Usage:
+    GROQ_API_KEY=dummy python -m benchmarks.bench_graph_registry [iterations]
+"""
+import statistics
+import sys
+import time
+
+from app.core.llm import get_llm
+from app.graph.registry import get_graph_registry
+from app.graph.workflow import GraphBuilder
+
+
+def per_request_build():
+    # Old behaviour: a fresh ChatGroq client and a fresh compile on every request
+    builder = GraphBuilder(get_llm.__wrapped__())
+    builder.build_job_finder_graph()
+    builder.build_direct_search_graph()
+
+
+def registry_lookup():
+    registry = get_graph_registry()
+    return registry.job_finder_graph, registry.direct_search_graph
+
+
+def measure(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{name:<20} mean={statistics.mean(timings):9.3f} ms  p50={statistics.median(timings):9.3f} ms  p95={p95:9.3f} ms")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    get_graph_registry()  # warm-up, as the lifespan hook does at startup
+
+    build = measure(per_request_build, iterations)
+    lookup = measure(registry_lookup, iterations)
+
+    print(f"Per-request graph setup over {iterations} iterations")
+    report("build per request", build)
+    report("registry lookup", lookup)
+    print(f"Overhead removed per request: {statistics.mean(build) - statistics.mean(lookup):.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
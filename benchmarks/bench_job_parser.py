@@ -0,0 +1,115 @@
+"""
+Micro-benchmark for parsing LinkedIn job detail responses.
+
+Compares the original two-scan parser with the single-pass URN lookup and the
+standard-library JSON decoder with orjson, on synthetic payloads with a growing
+number of `included` entities.
+
+Usage:
+    GROQ_API_KEY=dummy python -m benchmarks.bench_job_parser
+"""
+import json
+import timeit
+
+from app.services.linkdin_scraper import parse_job_json_response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def legacy_parse_job_json_response(json_response: dict):
+    # The parser as it was before the single-pass lookup, kept for comparison
+    if not isinstance(json_response, dict) or "data" not in json_response:
+        return {"error": "Invalid JSON response format."}
+    job_data = json_response['data']
+    details = {
+        "title": job_data.get('title'),
+        "formattedJobLocation": job_data.get('formattedLocation'),
+        "workRemoteAllowed": job_data.get('workRemoteAllowed'),
+        "listedAt": job_data.get('listedAt'),
+        "applyUrl": None,
+        "companyprofile": None,
+        "company-name": None,
+        "companyUniversalName": None,
+        "localizedName": None,
+        "jobInfo": None,
+    }
+    workplace_types = job_data.get('workplaceTypes', [])
+    if workplace_types and 'included' in json_response:
+        for item in json_response['included']:
+            if item.get('entityUrn') == workplace_types[0]:
+                details["localizedName"] = item.get('localizedName')
+                break
+    company_details = job_data.get('companyDetails', {})
+    if company_details:
+        company_urn = company_details.get('company')
+        for item in json_response.get('included', []):
+            if item.get('entityUrn') == company_urn:
+                details["companyprofile"] = item.get('url')
+                details["company-name"] = item.get('name')
+                details["companyUniversalName"] = item.get('universalName')
+                break
+    apply_method = job_data.get('applyMethod', {})
+    if apply_method:
+        details["applyUrl"] = apply_method.get('easyApplyUrl') or apply_method.get('companyApplyUrl')
+    description_obj = job_data.get('description', {})
+    if description_obj:
+        details["jobInfo"] = description_obj.get('text', '').replace(r'\n', '\n').strip()
+    return details
+
+
+def make_payload(included_count: int) -> dict:
+    """
+    Builds a job detail response whose referenced entities sit at the end of `included`.
+    """
+    included = [
+        {"entityUrn": f"urn:li:fs_skill:{i}", "name": f"Skill {i}", "description": "x" * 200}
+        for i in range(included_count)
+    ]
+    included.append({"entityUrn": "urn:li:fs_workplaceType:2", "localizedName": "Remote"})
+    included.append({
+        "entityUrn": "urn:li:fs_normalized_company:1",
+        "name": "Acme",
+        "url": "https://www.linkedin.com/company/acme",
+        "universalName": "acme",
+    })
+    return {
+        "data": {
+            "title": "Senior Python Engineer",
+            "formattedLocation": "Bengaluru, India",
+            "workRemoteAllowed": True,
+            "listedAt": 1760000000000,
+            "workplaceTypes": ["urn:li:fs_workplaceType:2"],
+            "companyDetails": {"company": "urn:li:fs_normalized_company:1"},
+            "applyMethod": {"companyApplyUrl": "https://acme.example/jobs/1"},
+            "description": {"text": "Build services in Python. " * 200},
+        },
+        "included": included,
+    }
+
+
+def bench(fn, number: int) -> float:
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    print(f"{'included':>9} {'legacy us':>11} {'1-pass us':>11} {'json us':>9} {'orjson us':>10}")
+    for included_count in (10, 100, 1000, 5000):
+        payload = make_payload(included_count)
+        raw = json.dumps(payload).encode()
+        number = max(10, 20000 // (included_count + 10))
+
+        expected = legacy_parse_job_json_response(payload)
+        parsed = parse_job_json_response(payload).to_dict()
+        assert {key: parsed[key] for key in expected} == expected
+        legacy = bench(lambda: legacy_parse_job_json_response(payload), number)
+        indexed = bench(lambda: parse_job_json_response(payload), number)
+        std_decode = bench(lambda: json.loads(raw), number)
+        fast_decode = bench(lambda: orjson.loads(raw), number) if orjson else float("nan")
+        print(f"{included_count:>9} {legacy:>11.1f} {indexed:>11.1f} {std_decode:>9.1f} {fast_decode:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
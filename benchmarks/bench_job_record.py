@@ -0,0 +1,77 @@
+"""
+Compares loose job dictionaries with the slotted Job record: resident memory
+for a large result set and time to serialize it into a JSON response body.
+
+Usage:
+    GROQ_API_KEY=dummy python -m benchmarks.bench_job_record [job_count]
+"""
+import json
+import sys
+import timeit
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.job import Job
+from app.utils.serialization import dumps
+
+LOCATIONS = ["Bengaluru, Karnataka, India", "Pune, Maharashtra, India", "Hyderabad, Telangana, India"]
+WORKPLACES = ["Remote", "Hybrid", "On-site"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella"]
+
+
+def raw_job(i: int) -> dict:
+    # Build each string fresh, as decoding a response body does
+    return {
+        "jobId": str(4200000000 + i),
+        "title": f"Senior Engineer {i}",
+        "formattedJobLocation": "".join(LOCATIONS[i % 3]),
+        "workRemoteAllowed": i % 2 == 0,
+        "listedAt": 1760000000000 + i,
+        "applyUrl": f"https://jobs.example.com/{i}",
+        "companyprofile": "".join(f"https://www.linkedin.com/company/{COMPANIES[i % 4].lower()}"),
+        "company-name": "".join(COMPANIES[i % 4]),
+        "companyUniversalName": "".join(COMPANIES[i % 4].lower()),
+        "localizedName": "".join(WORKPLACES[i % 3]),
+        "jobInfo": f"Job {i}: build and operate Python services. " * 20,
+        "linkedin_url": f"https://www.linkedin.com/jobs/view/{4200000000 + i}",
+    }
+
+
+def measure_memory(build) -> int:
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+
+def main():
+    job_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+
+    dict_bytes = measure_memory(lambda: [raw_job(i) for i in range(job_count)])
+    job_bytes = measure_memory(lambda: [Job.from_dict(raw_job(i)) for i in range(job_count)])
+
+    dict_jobs = [raw_job(i) for i in range(job_count)]
+    record_jobs = [Job.from_dict(job) for job in dict_jobs]
+    dict_state = {"skills": ["Python"], "jobs": dict_jobs}
+    record_state = {"skills": ["Python"], "jobs": record_jobs}
+    assert json.loads(dumps(record_state)) == json.loads(json.dumps(dict_state))
+
+    def bench(fn):
+        return min(timeit.repeat(fn, number=1, repeat=5)) * 1000
+
+    default_encoder = bench(lambda: json.dumps(jsonable_encoder(dict_state)).encode())
+    stdlib_json = bench(lambda: json.dumps(dict_state).encode())
+    fast_records = bench(lambda: dumps(record_state))
+
+    print(f"{job_count} jobs")
+    print(f"memory   dicts={dict_bytes / 1e6:8.2f} MB  records={job_bytes / 1e6:8.2f} MB  "
+          f"saved={(1 - job_bytes / dict_bytes) * 100:5.1f}%")
+    print(f"encode   FastAPI default={default_encoder:8.2f} ms  json.dumps(dicts)={stdlib_json:8.2f} ms  "
+          f"orjson(records)={fast_records:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
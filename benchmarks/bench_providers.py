@@ -0,0 +1,52 @@
+"""
+Compares querying job providers one after another with the concurrent fan-out,
+and shows a provider that misses the deadline being dropped.
+
+Usage:
+    GROQ_API_KEY=dummy python -m benchmarks.bench_providers [provider_count]
+"""
+import sys
+import time
+
+from app.providers import FakeJobProvider, search_providers
+
+SKILLS = ["Python", "SQL", "Docker"]
+
+
+def make_providers(count: int):
+    # Latencies of 0.1 s, 0.2 s, ... stand in for sources of different speeds
+    return [
+        FakeJobProvider(timeout_seconds=10, max_concurrency=4, latency_seconds=0.1 * (i + 1), name=f"fake{i}")
+        for i in range(count)
+    ]
+
+
+def main():
+    provider_count = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    providers = make_providers(provider_count)
+
+    started = time.perf_counter()
+    sequential = []
+    for provider in providers:
+        sequential.extend(provider.search(SKILLS, 10, 0, 24))
+    sequential_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    parallel = search_providers(SKILLS, 10, 0, 24, providers=providers, deadline_seconds=10)
+    parallel_ms = (time.perf_counter() - started) * 1000
+    assert len(parallel) == len(sequential)
+
+    slow = FakeJobProvider(timeout_seconds=10, max_concurrency=4, latency_seconds=5, name="slow")
+    started = time.perf_counter()
+    bounded = search_providers(SKILLS, 10, 0, 24, providers=providers + [slow], deadline_seconds=1)
+    bounded_ms = (time.perf_counter() - started) * 1000
+
+    print(f"{provider_count} providers, {len(parallel)} jobs")
+    print(f"sequential={sequential_ms:8.1f} ms  parallel={parallel_ms:8.1f} ms  "
+          f"speedup={sequential_ms / parallel_ms:5.2f}x")
+    print(f"with a 5 s provider and a 1 s deadline: {len(bounded)} jobs in {bounded_ms:8.1f} ms "
+          f"(sources: {sorted({job.source for job in bounded})})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""
+A local stand-in for LinkedIn's Voyager API: the job-card GraphQL search and
+the jobPostings detail endpoint.
+
+Responses are synthetic by default and mirror the shapes the scraper parses.
+Recorded responses can be served instead from a fixture directory holding
+`search.json` and `job_postings/<job_id>.json` (or `job_postings/default.json`).
+Each request is delayed by a configurable latency, and a fraction of them fail
+with 429 or 503 so retries and the circuit breaker are exercised.
+
+Point the app at it with:
+    LINKEDIN_BASE_URL=http://127.0.0.1:8089 LINKEDIN_COOKIE=x CSRF_TOKEN=x
+
+Usage:
+    python -m benchmarks.fake_voyager [--port 8089] [--latency 0.1] [--jitter 0.05]
+                                      [--error-rate 0.0] [--fixtures DIR]
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+_COUNT_RE = re.compile(r"count:(\d+)")
+_START_RE = re.compile(r"start:(\d+)\)?$")
+_KEYWORDS_RE = re.compile(r"keywords:([^)]*)\)")
+_JOB_POSTING_PATH_RE = re.compile(r"^/voyager/api/jobs/jobPostings/(\d+)$")
+
+_COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Pied Piper")
+_LOCATIONS = ("Bengaluru, Karnataka, India", "Pune, Maharashtra, India", "Remote", "London, UK")
+_WORKPLACES = ("On-site", "Hybrid", "Remote")
+
+
+def _job_id(keywords: str, position: int) -> str:
+    digest = hashlib.sha256(f"{keywords}:{position}".encode()).hexdigest()
+    return str(4000000000 + int(digest[:8], 16) % 999999999)
+
+
+def search_response(keywords: str, count: int, start: int) -> dict:
+    """
+    Builds a job-card search response with `count` stable job IDs for the keywords.
+    """
+    elements = []
+    for position in range(start, start + count):
+        job_id = _job_id(keywords, position)
+        action_target = f"https://www.linkedin.com/jobs/search-results/?currentJobId={job_id}&origin=JOBS_HOME"
+        elements.append({
+            "jobCard": {"jobPostingCardWrapper": {"jobTrackingData": {"navigationAction": {
+                "actionTarget": action_target,
+            }}}},
+        })
+    return {"data": {"data": {"jobsDashJobCardsBySemanticSearch": {"elements": elements}}}}
+
+
+def job_posting_response(job_id: str, description_words: int = 300) -> dict:
+    """
+    Builds a jobPostings detail response, with the company and workplace type in 'included'.
+    """
+    digest = hashlib.sha256(job_id.encode()).hexdigest()
+    company = _COMPANIES[int(digest[:2], 16) % len(_COMPANIES)]
+    workplace = _WORKPLACES[int(digest[2:4], 16) % len(_WORKPLACES)]
+    company_urn = f"urn:li:fs_normalized_company:{int(digest[4:10], 16)}"
+    workplace_urn = f"urn:li:fs_workplaceType:{workplace.upper()}"
+    sentence = "Build and operate Python, SQL and Docker services on AWS with a small team. "
+    description = " ".join((sentence * (description_words // 12 + 1)).split()[:description_words])
+    return {
+        "data": {
+            "title": f"Software Engineer {job_id[-4:]}",
+            "formattedLocation": _LOCATIONS[int(digest[10:12], 16) % len(_LOCATIONS)],
+            "workRemoteAllowed": workplace == "Remote",
+            "listedAt": int(time.time() * 1000) - int(digest[12:18], 16) % (12 * 60 * 60 * 1000),
+            "workplaceTypes": [workplace_urn],
+            "companyDetails": {"company": company_urn},
+            "applyMethod": {"companyApplyUrl": f"https://careers.example.com/{job_id}"},
+            "description": {"text": description},
+        },
+        "included": [
+            {"entityUrn": workplace_urn, "localizedName": workplace},
+            {
+                "entityUrn": company_urn,
+                "name": company,
+                "universalName": company.lower().replace(" ", "-"),
+                "url": f"https://www.linkedin.com/company/{company.lower().replace(' ', '-')}",
+            },
+        ],
+    }
+
+
+class FakeVoyagerServer:
+    """
+    Serves the fake Voyager endpoints from a background thread.
+
+    Args:
+        port: The port to listen on; 0 picks a free one.
+        latency_seconds: The base delay added to every response.
+        jitter_seconds: Extra random delay, up to this much, per response.
+        error_rate: The fraction of requests answered with 429 or 503.
+        fixture_dir: Optional directory of recorded responses to serve instead of synthetic ones.
+    """
+
+    def __init__(self, port: int = 0, latency_seconds: float = 0.1, jitter_seconds: float = 0.0,
+                 error_rate: float = 0.0, fixture_dir: Optional[str] = None):
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.error_rate = error_rate
+        self.fixture_dir = Path(fixture_dir) if fixture_dir else None
+        self.requests_served = 0
+        self._count_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _fixture(self, *parts: str) -> Optional[dict]:
+        if self.fixture_dir is None:
+            return None
+        path = self.fixture_dir.joinpath(*parts)
+        if not path.is_file():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def respond(self, path: str, query: str) -> tuple:
+        """
+        Returns (status, body) for a request path and raw query string.
+        """
+        with self._count_lock:
+            self.requests_served += 1
+        time.sleep(self.latency_seconds + random.uniform(0, self.jitter_seconds))
+        if self.error_rate and random.random() < self.error_rate:
+            return random.choice((429, 503)), {"status": "throttled"}
+
+        if path == "/voyager/api/graphql":
+            # The variables parameter is sent unencoded apart from the keywords
+            variables = unquote(parse_qs(query).get("variables", [""])[0])
+            count, start, keywords = (_COUNT_RE.search(variables), _START_RE.search(variables),
+                                      _KEYWORDS_RE.search(variables))
+            return 200, self._fixture("search.json") or search_response(
+                keywords.group(1) if keywords else "",
+                int(count.group(1)) if count else 25,
+                int(start.group(1)) if start else 0,
+            )
+
+        match = _JOB_POSTING_PATH_RE.match(path)
+        if match:
+            job_id = match.group(1)
+            body = self._fixture("job_postings", f"{job_id}.json") or self._fixture("job_postings", "default.json")
+            return 200, body or job_posting_response(job_id)
+
+        return 404, {"status": "not found"}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                status, body = server.respond(url.path, url.query)
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "FakeVoyagerServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-voyager", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._httpd.serve_forever()
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=0.1)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--fixtures", default=None)
+    args = parser.parse_args()
+
+    server = FakeVoyagerServer(args.port, args.latency, args.jitter, args.error_rate, args.fixtures)
+    print(f"Fake Voyager API listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""
+Shared test setup.
+
+The settings require a Groq key even though no test calls the API, and every
+SQLite-backed cache, limiter and breaker is pointed at a throwaway directory so
+tests never touch the working tree's .cache.
+"""
+import os
+import tempfile
+
+_scratch = tempfile.mkdtemp(prefix="job-finder-tests-")
+os.environ.setdefault("GROQ_API_KEY", "test")
+os.environ.setdefault("CACHE_DB_PATH", os.path.join(_scratch, "cache.sqlite3"))
+os.environ.setdefault("RATE_LIMIT_DB_PATH", os.path.join(_scratch, "rate_limits.sqlite3"))
@@ -0,0 +1,154 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.utils import cache as cache_module
+from app.utils.cache import SQLiteCache, StaleWhileRevalidateCache
+
+
+class FakeClock:
+    """
+    Stands in for the time module inside app.utils.cache, so tests control both clocks.
+    """
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self) -> float:
+        return self.now
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path, clock):
+    return SQLiteCache(str(tmp_path / "cache.sqlite3"), "items", ttl_seconds=60, max_entries=3)
+
+
+def test_sqlite_cache_round_trips_json_values(sqlite_cache):
+    sqlite_cache.set("job", {"title": "Engineer", "skills": ["Python"]})
+
+    assert sqlite_cache.get("job") == {"title": "Engineer", "skills": ["Python"]}
+    assert sqlite_cache.get("missing") is None
+    assert sqlite_cache.get_many(["job", "missing"]) == {"job": {"title": "Engineer", "skills": ["Python"]}}
+    assert (sqlite_cache.hits, sqlite_cache.misses) == (2, 2)
+
+
+def test_sqlite_cache_expires_entries_after_the_ttl(sqlite_cache, clock):
+    sqlite_cache.set("a", 1)
+    clock.advance(59)
+    assert sqlite_cache.get("a") == 1
+
+    clock.advance(2)
+    assert sqlite_cache.get("a") is None
+    # Expired rows are deleted on the next write
+    sqlite_cache.set("b", 2)
+    assert sqlite_cache.stats()["size"] == 1
+
+
+def test_sqlite_cache_evicts_the_least_recently_used(sqlite_cache, clock):
+    for key in ("a", "b", "c"):
+        sqlite_cache.set(key, key)
+        clock.advance(1)
+    # Reading "a" makes "b" the least recently used entry
+    assert sqlite_cache.get("a") == "a"
+    clock.advance(1)
+    sqlite_cache.set("d", "d")
+
+    assert sqlite_cache.get_many(["a", "b", "c", "d"]) == {"a": "a", "c": "c", "d": "d"}
+    assert sqlite_cache.evictions == 1
+
+
+def test_sqlite_cache_namespaces_share_a_file(tmp_path, clock):
+    path = str(tmp_path / "shared.sqlite3")
+    first = SQLiteCache(path, "first", ttl_seconds=60, max_entries=10)
+    second = SQLiteCache(path, "second", ttl_seconds=60, max_entries=10)
+    first.set("key", "first")
+    second.set("key", "second")
+
+    assert first.get("key") == "first"
+    assert second.get("key") == "second"
+
+
+@pytest.fixture
+def swr_cache(clock):
+    return StaleWhileRevalidateCache("test_search", fresh_seconds=10, stale_seconds=20, max_entries=2)
+
+
+def test_swr_cache_serves_fresh_entries_without_loading(swr_cache):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return "value"
+
+    assert swr_cache.get_or_load("k", loader) == "value"
+    assert swr_cache.get_or_load("k", loader) == "value"
+    assert len(calls) == 1
+    assert (swr_cache.hits, swr_cache.misses) == (1, 1)
+
+
+def test_swr_cache_serves_stale_entries_and_refreshes_once(swr_cache, clock):
+    swr_cache.get_or_load("k", lambda: "old")
+    clock.advance(15)
+
+    release = threading.Event()
+    calls = []
+
+    def slow_loader():
+        calls.append(1)
+        release.wait(5)
+        return "new"
+
+    # Both callers get the stale value at once; only one refresh is scheduled
+    assert swr_cache.get_or_load("k", slow_loader) == "old"
+    assert swr_cache.get_or_load("k", slow_loader) == "old"
+    release.set()
+    deadline = time.monotonic() + 5
+    while swr_cache.refreshes == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(calls) == 1
+    assert swr_cache.get_or_load("k", slow_loader) == "new"
+    assert swr_cache.stale_hits == 2
+
+
+def test_swr_cache_reloads_expired_entries_in_the_foreground(swr_cache, clock):
+    swr_cache.get_or_load("k", lambda: "old")
+    clock.advance(31)
+
+    assert swr_cache.get_or_load("k", lambda: "new") == "new"
+    assert swr_cache.misses == 2
+
+
+def test_swr_cache_does_not_cache_none_and_bounds_its_size(swr_cache):
+    assert swr_cache.get_or_load("none", lambda: None) is None
+    for key in ("a", "b", "c"):
+        swr_cache.get_or_load(key, lambda key=key: key)
+
+    assert swr_cache.stats()["size"] == 2
+    assert swr_cache.get_or_load("a", lambda: "reloaded") == "reloaded"
+
+
+def test_swr_cache_async_miss_awaits_the_async_loader(swr_cache):
+    async def aloader():
+        return "async"
+
+    def loader():
+        raise AssertionError("the sync loader is only used for background refreshes")
+
+    assert asyncio.run(swr_cache.aget_or_load("k", aloader, loader)) == "async"
+    assert swr_cache.get_or_load("k", loader) == "async"
@@ -0,0 +1,182 @@
+"""
+Tests for the shared HTTP client's retries, backoff limits, per-attempt guards and pool metrics.
+"""
+import asyncio
+
+import httpx
+import pytest
+import requests
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.services import http_client
+from app.utils.rate_limit import CircuitBreaker, TokenBucket
+
+
+@pytest.fixture
+def unguarded(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_ENABLED", False)
+
+
+def _mock_async_client(monkeypatch, responses):
+    """
+    Serves the given responses in order from a mocked async client; returns the sent requests.
+    """
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return responses[len(sent) - 1]
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_client, "get_async_client", lambda: client)
+    return sent
+
+
+def _response(status, retry_after=None):
+    response = requests.Response()
+    response.status_code = status
+    response._content = b"{}"
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+class FakeSession:
+    """
+    Serves the given responses in order, counting the requests sent.
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.sent = 0
+
+    def get(self, url, **kwargs):
+        self.sent += 1
+        return self.responses[self.sent - 1]
+
+
+@pytest.fixture
+def guards(tmp_path, monkeypatch):
+    """
+    Gives the "indeed" endpoint a 2-token bucket that barely refills and a breaker that opens
+    after 3 failures, both in a scratch database.
+    """
+    path = str(tmp_path / "guards.db")
+    limiter = TokenBucket(path, "indeed", rate=0.001, burst=2)
+    breaker = CircuitBreaker(path, "indeed", failure_threshold=3, reset_seconds=60)
+    monkeypatch.setattr(http_client, "get_rate_limiter", lambda endpoint: limiter)
+    monkeypatch.setattr(http_client, "get_circuit_breaker", lambda endpoint: breaker)
+    monkeypatch.setattr(settings, "HTTP_MAX_RETRIES", 3)
+    monkeypatch.setattr(settings, "RATE_LIMIT_MAX_WAIT_SECONDS", 0.0)
+    monkeypatch.setattr(http_client.time, "sleep", lambda seconds: None)
+    return limiter, breaker
+
+
+def _record_sleeps(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(http_client.asyncio, "sleep", fake_sleep)
+    return sleeps
+
+
+def test_session_adapter_leaves_status_retries_to_get(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_BACKOFF_MAX_SECONDS", 2.0)
+    retry = http_client._build_session().get_adapter("https://example.com").max_retries
+
+    assert not retry.is_retry("GET", 429, has_retry_after=True)
+    assert not retry.is_retry("GET", 503)
+    assert retry.backoff_max == 2.0
+
+
+def test_every_retry_takes_a_rate_limit_token(monkeypatch, guards):
+    limiter, _ = guards
+    session = FakeSession([_response(429), _response(429), _response(200)])
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+
+    response = http_client.get("https://example.com/jobs", "indeed")
+
+    # The bucket held two tokens, so the third attempt was refused and the last 429 returned
+    assert session.sent == 2
+    assert response.status_code == 429
+    assert limiter.available() < 1
+
+
+def test_retries_stop_once_the_circuit_opens(monkeypatch, tmp_path, guards):
+    _, breaker = guards
+    breaker.failure_threshold = 2
+    # Enough tokens for every attempt, so only the breaker can stop the retries
+    limiter = TokenBucket(str(tmp_path / "guards.db"), "indeed_roomy", rate=0.001, burst=10)
+    monkeypatch.setattr(http_client, "get_rate_limiter", lambda endpoint: limiter)
+    session = FakeSession([_response(503)] * 4)
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+
+    response = http_client.get("https://example.com/jobs", "indeed")
+
+    assert session.sent == 2
+    assert response.status_code == 503
+    assert breaker.state() == "open"
+    with pytest.raises(http_client.UpstreamThrottledError):
+        http_client.get("https://example.com/jobs", "indeed")
+
+
+def test_success_after_a_retry_resets_the_breaker(monkeypatch, guards):
+    _, breaker = guards
+    session = FakeSession([_response(500), _response(200)])
+    monkeypatch.setattr(http_client, "get_session", lambda: session)
+
+    assert http_client.get("https://example.com/jobs", "indeed").status_code == 200
+    assert session.sent == 2
+    assert breaker.state() == "closed"
+
+
+def test_async_retries_take_tokens(monkeypatch, guards):
+    limiter, _ = guards
+    sent = _mock_async_client(monkeypatch, [httpx.Response(429)] * 4)
+    _record_sleeps(monkeypatch)
+
+    response = asyncio.run(http_client.aget("https://example.com/jobs", "indeed"))
+
+    assert len(sent) == 2
+    assert response.status_code == 429
+
+
+def test_backoff_is_capped(monkeypatch):
+    monkeypatch.setattr(settings, "HTTP_BACKOFF_MAX_SECONDS", 2.0)
+    monkeypatch.setattr(settings, "HTTP_BACKOFF_JITTER", 0.0)
+    assert http_client._backoff_seconds(0, 3600.0) == 2.0
+    assert http_client._backoff_seconds(0, 1.5) == 1.5
+    assert http_client._backoff_seconds(10, None) == 2.0
+    assert http_client._backoff_seconds(0, None) == 0.0
+
+
+def test_async_retry_after_is_capped(monkeypatch, unguarded):
+    monkeypatch.setattr(settings, "HTTP_BACKOFF_MAX_SECONDS", 2.0)
+    sent = _mock_async_client(monkeypatch, [
+        httpx.Response(429, headers={"Retry-After": "3600"}),
+        httpx.Response(200, json={"ok": True}),
+    ])
+    sleeps = _record_sleeps(monkeypatch)
+
+    response = asyncio.run(http_client.aget("https://example.com/jobs", "indeed"))
+
+    assert response.status_code == 200
+    assert len(sent) == 2
+    assert sleeps == [2.0]
+
+
+def test_pool_stats_are_published_on_the_metrics_route(monkeypatch):
+    session = http_client._build_session()
+    session.get_adapter("https://example.com").poolmanager.connection_from_url("https://example.com")
+    monkeypatch.setattr(http_client, "_session", session)
+
+    body = TestClient(app).get("/metrics").text
+
+    host = 'host="https://example.com:443"'
+    assert f"http_pool_max_connections{{{host}}} {settings.HTTP_POOL_MAXSIZE}" in body
+    assert f"http_pool_connections_opened{{{host}}} 0" in body
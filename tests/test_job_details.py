@@ -0,0 +1,73 @@
+import threading
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.models.job import Job
+from app.providers import linkedin
+
+JOBS = [(str(i), f"https://www.linkedin.com/jobs/view/{i}") for i in range(6)]
+
+
+@pytest.fixture(autouse=True)
+def no_job_cache(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_CACHE_ENABLED", False)
+
+
+def test_details_keep_search_order_and_run_concurrently(monkeypatch):
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def fake_fetch(job_id, timeout, should_stop=None):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        # Later jobs finish first, so the results must be put back in search order
+        time.sleep(0.05 * (len(JOBS) - int(job_id)))
+        with lock:
+            in_flight -= 1
+        return Job(job_id=job_id, title=f"Job {job_id}"), 0.01
+
+    monkeypatch.setattr(linkedin, "_fetch_single_job", fake_fetch)
+    jobs = linkedin.fetch_job_details(JOBS, max_workers=3, timeout=5)
+
+    assert [job.job_id for job in jobs] == [job_id for job_id, _ in JOBS]
+    assert all(job.linkedin_url == url and job.source == "linkedin" for job, (_, url) in zip(jobs, JOBS))
+    assert peak == 3
+
+
+def test_failed_and_slow_jobs_are_dropped(monkeypatch):
+    release = threading.Event()
+
+    def fake_fetch(job_id, timeout, should_stop=None):
+        if job_id == "1":
+            return None, 0.01
+        if job_id == "2":
+            release.wait(5)
+        return Job(job_id=job_id), 0.01
+
+    monkeypatch.setattr(linkedin, "_fetch_single_job", fake_fetch)
+    started = time.perf_counter()
+    # Six jobs on six workers: the overall wait is one per-job timeout
+    jobs = linkedin.fetch_job_details(JOBS, max_workers=6, timeout=0.2)
+    release.set()
+
+    assert [job.job_id for job in jobs] == ["0", "3", "4", "5"]
+    assert time.perf_counter() - started < 2
+
+
+def test_single_worker_fetches_sequentially(monkeypatch):
+    calls = []
+
+    def fake_fetch(job_id, timeout, should_stop=None):
+        calls.append(job_id)
+        return Job(job_id=job_id), 0.0
+
+    monkeypatch.setattr(linkedin, "_fetch_single_job", fake_fetch)
+    jobs = linkedin.fetch_job_details(JOBS, max_workers=1)
+
+    assert calls == [job_id for job_id, _ in JOBS]
+    assert len(jobs) == len(JOBS)
@@ -0,0 +1,87 @@
+"""
+Tests for map-reduce summarization: chunk routing, ordered reduction and the assembled graph.
+"""
+from typing import List
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+from app.core.config import settings
+from app.core.fake_llm import FakeChatModel
+from app.graph.workflow import GraphBuilder
+from app.models.job import Job
+from app.nodes.summarize_results import MapReduceSummarizationNode
+from app.state.job_state import JobState, public_state
+
+
+class RecordingChatModel(FakeChatModel):
+    """
+    A fake model that answers at once and records each prompt's system message.
+    """
+    first_token_seconds: float = 0.0
+    seconds_per_token: float = 0.0
+    summary_words: int = 10
+    prompts: List[str] = []
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        self.prompts.append(str(messages[0].content))
+        return super()._generate(messages, stop, run_manager, **kwargs)
+
+
+def _jobs(count):
+    return [Job(job_id=str(i), title=f"Engineer {i}", company_name=f"Company {i}", job_info="Python services")
+            for i in range(count)]
+
+
+@pytest.fixture(autouse=True)
+def chunking(monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_MAP_CHUNK_SIZE", 2)
+    monkeypatch.setattr(settings, "SUMMARY_CACHE_ENABLED", False)
+
+
+def _graph(llm):
+    workflow = StateGraph(JobState)
+    workflow.set_entry_point(GraphBuilder(llm=llm, summary_mode="map_reduce")._add_summarize(workflow))
+    return workflow.compile()
+
+
+def test_route_chunks_sends_one_branch_per_chunk():
+    node = MapReduceSummarizationNode(RecordingChatModel())
+    sends = node.route_chunks(JobState(skills=["Python"], jobs=_jobs(5)))
+    assert [send.arg.chunk for send in sends] == [0, 1, 2]
+    assert [[job.job_id for job in send.arg.jobs] for send in sends] == [["0", "1"], ["2", "3"], ["4"]]
+    assert {send.node for send in sends} == {"assess_jobs"}
+
+
+def test_route_chunks_ends_when_the_summary_is_set():
+    node = MapReduceSummarizationNode(RecordingChatModel())
+    assert node.route_chunks(JobState(skills=["Python"], jobs=_jobs(3), summary="cached")) == END
+
+
+def test_reduce_keeps_chunk_order_whatever_the_finish_order():
+    state = JobState(skills=["Python", "SQL"], fit_assessments=[
+        {"chunk": 1, "job_ids": ["2"], "assessment": "second"},
+        {"chunk": 0, "job_ids": ["0", "1"], "assessment": "first"},
+    ])
+    inputs = MapReduceSummarizationNode._reduce_inputs(state)
+    assert inputs == {"skills": "Python, SQL", "job_count": 3, "assessments": "first\n\nsecond"}
+
+
+def test_graph_assesses_every_chunk_then_reduces():
+    llm = RecordingChatModel(prompts=[])
+    final_state = _graph(llm).invoke(JobState(skills=["Python"], jobs=_jobs(5)))
+
+    assert sorted(item["chunk"] for item in final_state["fit_assessments"]) == [0, 1, 2]
+    assert final_state["summary"].startswith("The best match is")
+    assert final_state["thought_process"]
+    # Three map calls and one reduce call
+    assert sum("Assess how well" in prompt for prompt in llm.prompts) == 3
+    assert sum("given fit assessments" in prompt for prompt in llm.prompts) == 1
+    assert "fit_assessments" not in public_state(final_state)
+
+
+def test_graph_without_jobs_skips_the_llm():
+    llm = RecordingChatModel(prompts=[])
+    final_state = _graph(llm).invoke(JobState(skills=["Python"]))
+    assert final_state["summary"] == "No jobs were found matching your skills."
+    assert llm.prompts == []
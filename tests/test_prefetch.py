@@ -0,0 +1,98 @@
+"""
+Tests for the rate-limit reserve that keeps speculative prefetches off the foreground budget.
+"""
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.services import prefetch
+from app.tools import job_fetcher
+from app.utils.rate_limit import TokenBucket
+
+
+@pytest.fixture
+def bucket(tmp_path, monkeypatch):
+    bucket = TokenBucket(str(tmp_path / "limits.db"), "linkedin_search", rate=0.001, burst=4)
+    monkeypatch.setattr(settings, "RATE_LIMIT_RATES", {"linkedin_search": 0.001})
+    monkeypatch.setattr(settings, "PREFETCH_RATE_LIMIT_RESERVE", 0.5)
+    monkeypatch.setattr(prefetch, "get_rate_limiter", lambda endpoint: bucket)
+    return bucket
+
+
+def test_available_does_not_take_tokens(bucket):
+    assert bucket.available() == pytest.approx(4)
+    assert bucket.available() == pytest.approx(4)
+    bucket.acquire(max_wait=0)
+    assert bucket.available() == pytest.approx(3, abs=0.01)
+
+
+def test_prefetch_stops_at_reserve(bucket):
+    # Reserve is half the burst (2 tokens) plus the one a prefetch request would take
+    assert prefetch.spare_rate_budget()
+    bucket.acquire(max_wait=0)
+    assert prefetch.spare_rate_budget()
+    bucket.acquire(max_wait=0)
+    assert not prefetch.spare_rate_budget()
+
+
+def test_unlimited_endpoints_never_block_prefetch(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_RATES", {"linkedin_search": 1.0})
+    monkeypatch.setattr(prefetch, "get_rate_limiter", lambda endpoint: None)
+    assert prefetch.spare_rate_budget()
+
+
+def _counter(name, **labels):
+    for series in metrics.snapshot()["counters"].get(name, []):
+        if series["labels"] == labels:
+            return series["value"]
+    return 0
+
+
+class RecordingPrefetcher:
+    def __init__(self):
+        self.scheduled = []
+
+    def schedule(self, key, loader):
+        self.scheduled.append(key)
+        return True
+
+
+def test_prefetch_next_page_is_skipped_when_buckets_are_drained(bucket, monkeypatch):
+    prefetcher = RecordingPrefetcher()
+    monkeypatch.setattr(job_fetcher, "get_prefetcher", lambda: prefetcher)
+    bucket.acquire(max_wait=0)
+    bucket.acquire(max_wait=0)
+    skipped = _counter("prefetch_total", result="rate_limited")
+
+    assert job_fetcher.prefetch_next_page(["Python"], 10, 0, 24) is False
+    assert prefetcher.scheduled == []
+    assert _counter("prefetch_total", result="rate_limited") == skipped + 1
+
+
+def test_prefetch_spending_its_own_tokens_is_not_cancelled(bucket):
+    prefetcher = prefetch.PagePrefetcher(ttl_seconds=60, max_pending=1)
+
+    def load_page(should_stop):
+        # Drains the bucket below the reserve, as a page of detail fetches would
+        pages = []
+        for _ in range(3):
+            if should_stop():
+                return None
+            bucket.acquire(max_wait=0)
+            pages.append({"job_id": str(len(pages))})
+        return pages
+
+    try:
+        assert prefetcher.schedule("page-2", load_page)
+        deadline = time.monotonic() + 5
+        page = None
+        while page is None and time.monotonic() < deadline:
+            page = prefetcher.take("page-2")
+            time.sleep(0.01)
+    finally:
+        prefetcher.shutdown()
+
+    assert page is not None and len(page) == 3
+    assert not prefetch.spare_rate_budget()
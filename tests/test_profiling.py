@@ -0,0 +1,64 @@
+"""
+Tests that profiled requests keep their graph work on sampled worker threads.
+"""
+import asyncio
+import time
+
+from app.api import routes
+from app.core import profiling
+from app.core.config import settings
+from app.core.tracing import span, trace_context
+
+
+def test_profiled_requests_take_the_thread_path(monkeypatch):
+    monkeypatch.setattr(settings, "GRAPH_EXECUTION", "async")
+    with trace_context() as trace:
+        assert not routes._use_thread_path()
+        trace.profiled = True
+        assert profiling.is_profiled()
+        assert routes._use_thread_path()
+    assert not profiling.is_profiled()
+
+
+def test_middleware_marks_the_trace_and_samples_the_graph_thread(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "GRAPH_EXECUTION", "async")
+    monkeypatch.setattr(settings, "PROFILING_ADMIN_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILING_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILING_INTERVAL_SECONDS", 0.001)
+    monkeypatch.setattr(settings, "PROFILING_TRACEMALLOC", False)
+
+    class SlowGraph:
+        def invoke(self, state):
+            # Stands in for a graph node: its span marks the thread as working for the trace
+            with span("node:slow"):
+                busy_until = time.perf_counter() + 0.05
+                while time.perf_counter() < busy_until:
+                    pass
+            return {"state": state}
+
+        async def ainvoke(self, state):
+            raise AssertionError("a profiled request must not run on the event loop")
+
+    async def app(scope, receive, send):
+        result = await routes._run_graph(SlowGraph(), None)
+        assert result == {"state": None}
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "POST", "path": "/search/", "query_string": b"",
+             "headers": [(b"x-profile", b"1"), (b"x-admin-token", b"secret")]}
+
+    async def request():
+        with trace_context():
+            await profiling.ProfilingMiddleware(app)(scope, receive, send)
+
+    asyncio.run(request())
+
+    collapsed = next(tmp_path.glob("*.collapsed")).read_text()
+    assert "invoke (" in collapsed
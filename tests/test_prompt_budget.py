@@ -0,0 +1,78 @@
+"""
+Tests for prompt token budgeting: counting, cleaning, de-duplication and budget allocation.
+"""
+import pytest
+
+from app.models.job import Job
+from app.utils import prompt_budget
+from app.utils.prompt_budget import (
+    allocate_budget,
+    clean_job_text,
+    clean_resume_text,
+    count_tokens,
+    dedupe_jobs,
+    fit_job_descriptions,
+    truncate_to_tokens,
+)
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # Use the characters-per-token estimate so counts do not depend on tiktoken being installed
+    monkeypatch.setattr(prompt_budget, "_get_encoding", lambda: None)
+
+
+def test_count_and_truncate():
+    assert count_tokens("") == 0
+    assert count_tokens("a" * 9) == 3
+    assert truncate_to_tokens("short", 10) == "short"
+    assert truncate_to_tokens("anything", 0) == ""
+    cut = truncate_to_tokens("alpha beta gamma delta epsilon", 4)
+    assert cut == "alpha beta..."
+
+
+def test_clean_resume_text_drops_page_markers_and_repeated_headers():
+    text = "Jane Doe\nPage 1 of 2\nPython   developer\n\nJane Doe\nPage 2 of 2\nReferences available on request"
+    assert clean_resume_text(text) == "Jane Doe\nPython developer"
+
+
+def test_clean_job_text_drops_boilerplate_sentences():
+    text = "Build APIs in Go.  We are an equal opportunity employer. Apply now!\n\n\nShip weekly."
+    assert clean_job_text(text) == "Build APIs in Go. Ship weekly."
+
+
+def test_dedupe_jobs_by_id_and_by_title_and_company():
+    jobs = [
+        Job(job_id="1", title="Engineer", company_name="Acme"),
+        Job(job_id="1", title="Other", company_name="Other"),
+        Job(job_id="2", title=" engineer ", company_name="ACME"),
+        Job(job_id="3", title="Engineer", company_name="Globex"),
+        Job(job_id="4"),
+        Job(job_id="5"),
+    ]
+    assert [job.job_id for job in dedupe_jobs(jobs)] == ["1", "3", "4", "5"]
+
+
+def test_allocate_budget_is_proportional_and_capped():
+    # Item 0 is short, so what it cannot use goes to the others in proportion to their weights
+    allocation = allocate_budget([10, 100, 100], [1.0, 3.0, 1.0], budget=110, floor=5)
+    assert allocation[0] == 10
+    assert sum(allocation) == 110
+    assert allocation[1] > allocation[2] >= 5
+    assert allocate_budget([10, 20], [1.0, 1.0], budget=1000, floor=5) == [10, 20]
+
+
+def test_allocate_budget_keeps_the_floor_when_over_budget():
+    assert allocate_budget([50, 50, 50], [1.0, 1.0, 1.0], budget=10, floor=20) == [20, 20, 20]
+
+
+def test_fit_job_descriptions_favours_relevant_jobs():
+    description = " ".join(["word"] * 200)
+    jobs = [
+        Job(job_id="1", job_info=description, relevance_score=0.0),
+        Job(job_id="2", job_info=description, relevance_score=5.0),
+    ]
+    fitted = fit_job_descriptions(jobs, max_tokens=100, min_tokens=10)
+    assert len(fitted) == 2
+    assert count_tokens(fitted[1]) > count_tokens(fitted[0])
+    assert sum(count_tokens(text) for text in fitted) <= 100 + 2  # each cut may add "..."
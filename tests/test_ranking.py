@@ -0,0 +1,57 @@
+"""
+Tests for the BM25 ranking of fetched jobs against the candidate's skills.
+"""
+import math
+
+import pytest
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services.ranking import bm25_scores, query_terms, rank_jobs
+
+
+def _bm25(tf, length, average_length, n_docs, document_frequency):
+    k1, b = settings.RANK_BM25_K1, settings.RANK_BM25_B
+    idf = math.log1p((n_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+    return idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / average_length))
+
+
+def test_query_terms_drop_experience_and_add_canonical_skills():
+    terms = query_terms(["Python", "NodeJS", "5 years exp"])
+    assert "python" in terms and "nodejs" in terms
+    assert "@Node.js" in terms
+    assert not any("years" in term for term in terms)
+
+
+def test_scores_match_the_bm25_formula(monkeypatch):
+    monkeypatch.setattr(settings, "RANK_TITLE_WEIGHT", 1.0)
+    # "rust" is an ambiguous term: postings only count the raw token, never the canonical skill
+    scores = bm25_scores(["rust"], ["", ""], ["rust rust tooling", "plain text here words"])
+    average_length = (3 + 4) / 2
+    assert scores[0] == pytest.approx(_bm25(2, 3, average_length, 2, 1))
+    assert scores[1] == 0
+
+
+def test_title_matches_outweigh_description_matches():
+    scores = bm25_scores(["rust"], ["Rust Engineer", "Engineer"], ["systems work", "rust systems"])
+    assert scores[0] > scores[1] > 0
+
+
+def test_no_usable_skills_scores_zero():
+    assert list(bm25_scores(["3 years exp"], ["a", "b"], ["x", "y"])) == [0, 0]
+    assert len(bm25_scores(["python"], [], [])) == 0
+
+
+def test_rank_jobs_sorts_by_score_and_keeps_ties_in_order():
+    jobs = [
+        Job(job_id="1", title="Accountant", job_info="ledgers"),
+        Job(job_id="2", title="Python Developer", job_info="python and django"),
+        Job(job_id="3", title="Clerk", job_info="filing"),
+        Job(job_id="4", title="Data Engineer", job_info="python pipelines"),
+    ]
+    ranked = rank_jobs(["Python"], jobs)
+    assert [job.job_id for job in ranked] == ["2", "4", "1", "3"]
+    assert ranked[0].relevance_score > ranked[1].relevance_score > 0
+    assert ranked[2].relevance_score == ranked[3].relevance_score == 0
+    assert jobs[0].relevance_score is None
+    assert rank_jobs(["Python"], []) == []
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from app.models.job import Job
+from app.services.run_manager import FAILED, SUCCEEDED, RunManager
+from app.state.job_state import JobState
+from app.utils.cache import SQLiteCache
+
+
+class FakeWorkflow:
+    def __init__(self, error: Exception = None):
+        self.error = error
+
+    def invoke(self, state: JobState) -> dict:
+        if self.error is not None:
+            raise self.error
+        return {"skills": state.skills, "jobs": [Job(job_id="1", title="Engineer")], "file_bytes": b"pdf",
+                "fit_assessments": [{"chunk": 0, "assessment": "Strong fit"}]}
+
+
+def _manager(path: str) -> RunManager:
+    return RunManager(max_workers=1, max_queue=2, store=SQLiteCache(path, "runs", ttl_seconds=60, max_entries=10))
+
+
+def _wait_for(manager: RunManager, run_id: str) -> dict:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        record = manager.get(run_id)
+        if record["status"] in (SUCCEEDED, FAILED):
+            return record
+        time.sleep(0.01)
+    raise AssertionError(f"run {run_id} did not finish")
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    return str(tmp_path / "runs.sqlite3")
+
+
+def test_runs_are_visible_to_other_worker_processes(store_path):
+    submitter, poller = _manager(store_path), _manager(store_path)
+    try:
+        run_id = submitter.submit(FakeWorkflow(), JobState(skills=["Python"]), "search")
+        record = _wait_for(poller, run_id)
+    finally:
+        submitter.shutdown()
+        poller.shutdown()
+
+    assert record["status"] == SUCCEEDED
+    assert record["result"] == {
+        "skills": ["Python"],
+        "jobs": [Job(job_id="1", title="Engineer").to_dict()],
+    }
+    assert poller.stats()["stored_runs"] == 1
+
+
+def test_failed_runs_keep_their_error(store_path):
+    manager = _manager(store_path)
+    try:
+        run_id = manager.submit(FakeWorkflow(ValueError("Unreadable PDF")), JobState(), "upload-resume")
+        record = _wait_for(manager, run_id)
+    finally:
+        manager.shutdown()
+
+    assert (record["status"], record["error"], record["error_status_code"]) == (FAILED, "Unreadable PDF", 422)
+    assert record["result"] is None
+
+
+def test_unknown_runs_are_not_found(store_path):
+    manager = _manager(store_path)
+    manager.shutdown()
+    assert manager.get("missing") is None
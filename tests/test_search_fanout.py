@@ -0,0 +1,70 @@
+"""
+Tests for the reciprocal-rank fusion of per-skill-group searches and its pagination.
+"""
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.providers import linkedin
+from app.providers.linkedin import merge_search_results
+
+# Each group's full ranking; the fake search serves [start, start + count) of it
+RANKINGS = {
+    ("python",): [f"p{i}" for i in range(10)],
+    ("sql",): [f"s{i}" for i in range(10)],
+    ("go",): ["g0", "p0", "g2", "g3"],
+}
+
+
+def _results(*job_ids):
+    return [(job_id, f"https://www.linkedin.com/jobs/view/{job_id}") for job_id in job_ids]
+
+
+def _fake_search(skills, count, start, posted_hours):
+    return _results(*RANKINGS[tuple(skills)][start:start + count])
+
+
+async def _afake_search(skills, count, start, posted_hours):
+    return _fake_search(skills, count, start, posted_hours)
+
+
+@pytest.fixture
+def fanout(monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_FANOUT_GROUP_SIZE", 1)
+    monkeypatch.setattr(settings, "SEARCH_FANOUT_RRF_K", 60)
+    monkeypatch.setattr(linkedin, "search_job_ids", _fake_search)
+    monkeypatch.setattr(linkedin, "asearch_job_ids", _afake_search)
+
+
+def test_rrf_puts_jobs_found_by_several_searches_first():
+    merged = merge_search_results([_results("a", "b", "c"), _results("c", "d")], limit=10)
+    # b and d tie at second place in their lists; b was seen first
+    assert [job_id for job_id, _ in merged] == ["c", "a", "b", "d"]
+
+
+def test_rrf_ties_keep_first_seen_order_and_respect_the_limit():
+    merged = merge_search_results([_results("a", "b"), _results("x", "y")], limit=3)
+    assert [job_id for job_id, _ in merged] == ["a", "x", "b"]
+    assert merged[0] == ("a", "https://www.linkedin.com/jobs/view/a")
+
+
+def test_fanout_pages_tile_the_merged_ranking(fanout):
+    full = [job_id for job_id, _ in linkedin.search_job_ids_fanout(["python", "sql"], 12, 0, 24)]
+    assert full[:4] == ["p0", "s0", "p1", "s1"]
+    pages = [linkedin.search_job_ids_fanout(["python", "sql"], 4, start, 24) for start in (0, 4, 8)]
+    # The second page continues the merged ranking instead of merging each group's second page
+    assert [job_id for job_id, _ in pages[1]] == ["p2", "s2", "p3", "s3"]
+    assert [job_id for page in pages for job_id, _ in page] == full
+
+
+def test_fanout_page_is_a_slice_of_the_deeper_merge(fanout):
+    page = linkedin.search_job_ids_fanout(["python", "go"], 2, 1, 24)
+    # p0 is found by both groups and takes first place, so the second page starts at g0
+    assert [job_id for job_id, _ in page] == ["g0", "p1"]
+
+
+def test_async_fanout_pages_match_sync(fanout):
+    for start in (0, 4):
+        sync = linkedin.search_job_ids_fanout(["python", "sql"], 4, start, 24)
+        assert asyncio.run(linkedin.asearch_job_ids_fanout(["python", "sql"], 4, start, 24)) == sync
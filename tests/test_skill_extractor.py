@@ -0,0 +1,55 @@
+"""
+Tests for the token-level Aho-Corasick skill matcher and the local extractor built on it.
+"""
+from app.services.skill_extractor import SkillMatcher, extract_skills_locally, tokenize
+
+TAXONOMY = {
+    "Java": ["java"],
+    "JavaScript": ["javascript", "js"],
+    "Spring": ["spring"],
+    "Spring Boot": ["spring boot"],
+    "Machine Learning": ["machine learning", "ml"],
+    "Go": ["golang", "go"],
+}
+
+
+def _canonical(matcher, text):
+    return [canonical for _, _, canonical, _ in matcher.find(tokenize(text))]
+
+
+def test_matches_on_token_boundaries_only():
+    matcher = SkillMatcher(TAXONOMY)
+    assert _canonical(matcher, "JavaScript and Java") == ["JavaScript", "Java"]
+    assert _canonical(matcher, "javadoc, mljs") == []
+
+
+def test_prefers_the_longest_overlapping_match():
+    matcher = SkillMatcher(TAXONOMY)
+    assert _canonical(matcher, "Built services with Spring Boot") == ["Spring Boot"]
+    assert _canonical(matcher, "spring and spring boot") == ["Spring", "Spring Boot"]
+
+
+def test_reports_spans_and_synonyms():
+    matcher = SkillMatcher(TAXONOMY)
+    tokens = tokenize("applied machine learning in golang")
+    assert matcher.find(tokens) == [(1, 3, "Machine Learning", False), (4, 5, "Go", False)]
+
+
+def test_failure_links_recover_after_a_partial_match():
+    matcher = SkillMatcher({"Spring Boot Admin": ["spring boot admin"], "Boot": ["boot"]})
+    # "spring boot" is a dead end for the long pattern; the automaton must still find "boot"
+    assert _canonical(matcher, "spring boot camp") == ["Boot"]
+
+
+def test_marks_ambiguous_terms():
+    matcher = SkillMatcher(TAXONOMY, ambiguous_terms={"go"})
+    assert matcher.find(tokenize("go")) == [(0, 1, "Go", True)]
+    assert matcher.find(tokenize("golang")) == [(0, 1, "Go", False)]
+
+
+def test_local_extraction_ranks_and_skips_ambiguous_terms_outside_skills():
+    text = "Experience\nLet's go build Python services\nSkills\nPython, Go, Docker"
+    extraction = extract_skills_locally(text, top_k=5)
+    assert extraction.skills[0] == "Python"
+    assert extraction.scores["Go"] == extraction.scores["Docker"]
+    assert "Let's go build Python services" in extraction.evidence
@@ -0,0 +1,77 @@
+"""
+Tests for the summary cache's exact and Jaccard near-match lookups.
+"""
+import pytest
+
+from app.core.config import settings
+from app.services import summary_cache
+from app.services.summary_cache import (
+    cache_summary,
+    canonical_skills,
+    get_cached_summary,
+    jaccard,
+    summary_cache_key,
+)
+from app.utils.cache import SQLiteCache
+
+IDENTITY = ("v1", "test-model")
+
+
+@pytest.fixture(autouse=True)
+def cache(tmp_path, monkeypatch):
+    cache = SQLiteCache(str(tmp_path / "summaries.db"), "summaries", ttl_seconds=60, max_entries=100)
+    monkeypatch.setattr(settings, "SUMMARY_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "SUMMARY_CACHE_MIN_JACCARD", 1.0)
+    monkeypatch.setattr(settings, "SUMMARY_CACHE_NEAR_CANDIDATES", 2)
+    monkeypatch.setattr(summary_cache, "_summary_cache", cache)
+    return cache
+
+
+def test_key_ignores_skill_case_and_order_and_job_order():
+    assert canonical_skills([" Python", "sql", "python", ""]) == ["python", "sql"]
+    assert summary_cache_key(["SQL", "Python"], ["2", "1"], *IDENTITY) == \
+        summary_cache_key(["python", "sql"], ["1", "2", "1"], *IDENTITY)
+    assert summary_cache_key(["python"], ["1"], *IDENTITY) != summary_cache_key(["python"], ["1"], "v2", "test-model")
+
+
+def test_jaccard():
+    assert jaccard(["1", "2", "3"], ["2", "3", "4"]) == 0.5
+    assert jaccard([], []) == 1.0
+
+
+def test_exact_hit_and_miss():
+    cache_summary(["Python"], ["1", "2"], *IDENTITY, summary="Two jobs", thought_process="because")
+    assert get_cached_summary(["python"], ["2", "1"], *IDENTITY) == {"summary": "Two jobs", "thought_process": "because"}
+    assert get_cached_summary(["python"], ["1", "3"], *IDENTITY) is None
+    assert get_cached_summary(["go"], ["1", "2"], *IDENTITY) is None
+
+
+def test_near_matches_are_off_by_default(cache):
+    cache_summary(["python"], ["1", "2", "3", "4"], *IDENTITY, summary="Four jobs", thought_process=None)
+    assert get_cached_summary(["python"], ["1", "2", "3", "5"], *IDENTITY) is None
+    assert cache.get(summary_cache._index_key(["python"], *IDENTITY)) is None
+
+
+def test_near_match_serves_the_closest_job_set(monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_CACHE_MIN_JACCARD", 0.5)
+    cache_summary(["python"], ["1", "2", "3", "4"], *IDENTITY, summary="close", thought_process=None)
+    cache_summary(["python"], ["1", "2", "7", "8"], *IDENTITY, summary="far", thought_process=None)
+
+    # Overlap 3/5 with "close" and 2/6 with "far"
+    assert get_cached_summary(["python"], ["1", "2", "3", "5"], *IDENTITY)["summary"] == "close"
+    # Below the threshold for every candidate
+    assert get_cached_summary(["python"], ["1", "9", "10", "11"], *IDENTITY) is None
+
+
+def test_near_match_skips_evicted_summaries_and_bounds_the_index(cache, monkeypatch):
+    monkeypatch.setattr(settings, "SUMMARY_CACHE_MIN_JACCARD", 0.5)
+    cache_summary(["python"], ["1", "2", "3"], *IDENTITY, summary="oldest", thought_process=None)
+    cache_summary(["python"], ["1", "2", "4"], *IDENTITY, summary="older", thought_process=None)
+    cache_summary(["python"], ["5", "6", "7"], *IDENTITY, summary="newest", thought_process=None)
+
+    index = cache.get(summary_cache._index_key(["python"], *IDENTITY))
+    assert [candidate["job_ids"] for candidate in index] == [["5", "6", "7"], ["1", "2", "4"]]
+
+    # The oldest set fell out of the index and the closer indexed one has expired
+    cache.delete(summary_cache_key(["python"], ["1", "2", "4"], *IDENTITY))
+    assert get_cached_summary(["python"], ["1", "2", "3", "4"], *IDENTITY) is None